@@ -1,33 +1,75 @@
 from datetime import datetime, timedelta
+import hashlib
+import time
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 from dotenv import load_dotenv
 
-from .database import get_database
+from .executor import password_executor
+from .prediction_cache import PredictionCache
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Verified tokens and doctor lookups reused across requests (size 0 disables a cache)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+DOCTOR_CACHE_SIZE = int(os.getenv("DOCTOR_CACHE_SIZE", "1000"))
+DOCTOR_CACHE_TTL = float(os.getenv("DOCTOR_CACHE_TTL", "60"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose (with cryptography) and passlib cost tens of milliseconds to import,
+# so they are loaded by the first login or authenticated request
+_pwd_context = None
 security = HTTPBearer()
 
+# Digest of a token -> (email, role claim, doctor generation when it was verified); an
+# entry never outlives the token's exp claim
+token_cache = PredictionCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+# Email -> principal built from the doctor record
+doctor_cache = PredictionCache(DOCTOR_CACHE_SIZE, DOCTOR_CACHE_TTL)
+# Email -> number of invalidations; bumped whenever a doctor record changes, so
+# token entries and lookups that started before the change are not trusted
+_doctor_generations = {}
+# Storage collection doctors are read from, set by use_doctor_store()
+doctor_store = None
+
+def get_pwd_context():
+    """The bcrypt CryptContext, created on first use"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password on the password pool, keeping the event loop free
+    
+    Raises:
+        ExecutorSaturated: if the pool's queue is full (the API answers 503)
+    """
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password pool; raises ExecutorSaturated when it is full"""
+    return await password_executor.run(get_password_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
+    from jose import jwt
+    
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -38,11 +80,104 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def token_key(token):
+    """Cache key for a bearer token; the token itself is never kept"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+def invalidate_doctor(email):
+    """Forget cached lookups and verified tokens of a deactivated or changed doctor"""
+    _doctor_generations[email] = _doctor_generations.get(email, 0) + 1
+    doctor_cache.discard(email)
+
+class DoctorCacheInvalidator:
+    """Collection observer that invalidates a doctor's cache entries on every change"""
+    
+    def added(self, record):
+        if record.get("email") is not None:
+            invalidate_doctor(record["email"])
+    
+    def removed(self, record):
+        self.added(record)
+
+def use_doctor_store(collection):
+    """
+    Read doctors from a storage collection and invalidate cached entries on its changes
+    
+    Every insert, update and delete made through the collection in this
+    process reaches the caches. Changes made elsewhere (init_db.py, another
+    worker) are seen once DOCTOR_CACHE_TTL and TOKEN_CACHE_TTL have passed.
+    """
+    global doctor_store
+    collection.observe(DoctorCacheInvalidator())
+    doctor_store = collection
+
+async def get_doctor_store():
+    """The doctors collection get_current_user reads from"""
+    if doctor_store is None:
+        raise HTTPException(status_code=503, detail="Doctor store not available")
+    return doctor_store
+
+def verify_token(token):
+    """
+    Email in a valid token, decoding it only on a token cache miss
+    
+    Returns:
+        tuple: (email, role claim, doctor generation the result is valid for)
+    
+    Raises:
+        JWTError: if the token is invalid or expired
+    """
+    key = token_key(token)
+    cached = token_cache.get(key)
+    if cached is not None:
+        email, role, generation = cached
+        if generation == _doctor_generations.get(email, 0):
+            return cached
+        token_cache.discard(key)
+    
+    from jose import JWTError, jwt
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    email = payload.get("sub")
+    if email is None:
+        raise JWTError("Token has no subject")
+    verified = (email, payload.get("role"), _doctor_generations.get(email, 0))
+    # jwt.decode has checked exp, so the remaining lifetime is positive
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    token_cache.put(key, verified, expires_in)
+    return verified
+
+async def get_doctor(doctors, email, role=None):
+    """
+    Principal of an active doctor, from the doctor cache or one indexed lookup
+    
+    Args:
+        doctors: storage collection of doctor records (see use_doctor_store)
+    
+    Returns:
+        dict: {"email", "role", "doctor_id"}, or None if there is no active doctor
+    """
+    principal = doctor_cache.get(email)
+    if principal is not None:
+        return principal
+    
+    generation = _doctor_generations.get(email, 0)
+    matches = await doctors.find_by("email", email)
+    doctor = matches[0] if matches else None
+    if doctor is None or not doctor.get("is_active", True):
+        return None
+    principal = {"email": email, "role": doctor.get("role", role), "doctor_id": doctor["id"]}
+    # A change while the query was in flight may not be reflected in its result
+    if generation == _doctor_generations.get(email, 0):
+        doctor_cache.put(email, principal)
+    return principal
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_database)
+    doctors = Depends(get_doctor_store)
 ):
     """Get current authenticated user"""
+    from jose import JWTError
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,16 +185,26 @@ async def get_current_user(
     )
     
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        role: str = payload.get("role")
-        if email is None:
-            raise credentials_exception
+        email, role, _ = verify_token(credentials.credentials)
     except JWTError:
         raise credentials_exception
     
-    doctor = await db.doctors.find_one({"email": email})
-    if doctor is None:
+    principal = await get_doctor(doctors, email, role)
+    if principal is None:
         raise credentials_exception
     
-    return {"email": email, "role": role, "doctor_id": str(doctor["_id"])}
\ No newline at end of file
+    return dict(principal)
+
+def require_role(*roles):
+    """
+    Dependency admitting only authenticated principals whose role is one of roles
+    
+    Raises:
+        HTTPException: 401 without valid credentials, 403 for any other role
+    """
+    async def check_role(user: dict = Depends(get_current_user)):
+        if user.get("role") not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not permitted for this role")
+        return user
+    
+    return check_role
@@ -0,0 +1,180 @@
+"""
+Asyncio micro-batching for concurrent single-row inference
+
+Concurrent callers submit one item each; a background task gathers up to
+max_batch_size items or waits at most max_wait_ms after the first one, runs
+the handler once on the whole batch and resolves every caller's future.
+Up to max_concurrency batches run at once; while all of them are busy new
+items keep queueing and go out as one larger batch.
+"""
+
+import asyncio
+import os
+import time
+
+MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "2"))
+
+class MicroBatcher:
+    def __init__(self, handler, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, max_concurrency=1):
+        """
+        Args:
+            handler: callable taking a list of items and returning a list of
+                results in the same order
+            max_batch_size: flush as soon as this many items are waiting
+            max_wait_ms: flush at most this long after the first item arrived
+            max_concurrency: handler calls allowed in flight at once
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+        self._queue = None
+        self._wakeup = None
+        self._task = None
+        self._loop = None
+        # Items the collector has already taken off the queue, None between batches
+        self._collecting = None
+        # Handler calls in flight
+        self._dispatches = set()
+        self.reset_metrics()
+    
+    def reset_metrics(self):
+        """Zero the throughput counters"""
+        self.total_items = 0
+        self.total_batches = 0
+        self.max_observed_batch = 0
+        self.total_queue_wait = 0.0
+        # Batch size histogram keyed by power-of-two upper bound
+        self.batch_size_histogram = {}
+    
+    def _ensure_started(self):
+        """Start the batching task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+    
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        if self._collecting is not None and len(self._collecting) + self._queue.qsize() >= self.max_batch_size:
+            self._wakeup.set()
+        return await future
+    
+    async def stop(self):
+        """Cancel the batching task and any batches in flight"""
+        tasks = [task for task in (self._task, *self._dispatches) if task is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._dispatches.clear()
+    
+    async def _collect(self):
+        """Wait for the first item, then gather more until the batch is full or the deadline passes"""
+        batch = [await self._queue.get()]
+        self._drain(batch)
+        
+        if len(batch) < self.max_batch_size and self.max_wait > 0:
+            # A timer callback instead of wait_for avoids creating a task per batch;
+            # submit() sets the event early once a full batch is waiting
+            self._collecting = batch
+            self._wakeup.clear()
+            timer = self._loop.call_later(self.max_wait, self._wakeup.set)
+            try:
+                await self._wakeup.wait()
+            finally:
+                timer.cancel()
+                self._collecting = None
+            self._drain(batch)
+        
+        return batch
+    
+    def _drain(self, batch):
+        """Move already-queued items into the batch without waiting"""
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+    
+    async def _run(self):
+        """Batching loop"""
+        slots = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            # Collect only once a handler slot is free, so the queue meanwhile grows into a larger batch
+            await slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                slots.release()
+                raise
+            self._record(batch)
+            
+            task = self._loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+            task.add_done_callback(lambda _: slots.release())
+    
+    async def _dispatch(self, batch):
+        """Run the handler on one batch and resolve its callers' futures"""
+        items = [item for item, _, _ in batch]
+        try:
+            results = await self._call_handler(items)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _call_handler(self, items):
+        """Run the handler, awaiting it if it is a coroutine function"""
+        results = self.handler(items)
+        if asyncio.iscoroutine(results):
+            results = await results
+        return results
+    
+    def _record(self, batch):
+        """Update metrics for a batch about to be scored"""
+        now = time.perf_counter()
+        size = len(batch)
+        self.total_items += size
+        self.total_batches += 1
+        self.max_observed_batch = max(self.max_observed_batch, size)
+        self.total_queue_wait += sum(now - queued_at for _, _, queued_at in batch)
+        
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self.batch_size_histogram[bucket] = self.batch_size_histogram.get(bucket, 0) + 1
+    
+    def metrics(self):
+        """Queue depth and batch size statistics for tuning throughput vs latency"""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_concurrency": self.max_concurrency,
+            "batches_in_flight": len(self._dispatches),
+            "total_items": self.total_items,
+            "total_batches": self.total_batches,
+            "avg_batch_size": self.total_items / self.total_batches if self.total_batches else 0.0,
+            "max_observed_batch": self.max_observed_batch,
+            "avg_queue_wait_ms": self.total_queue_wait / self.total_items * 1000 if self.total_items else 0.0,
+            "batch_size_histogram": {f"<={size}": count for size, count in sorted(self.batch_size_histogram.items())}
+        }
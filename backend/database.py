@@ -1,4 +1,3 @@
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
 from fastapi import HTTPException
@@ -15,6 +14,8 @@ async def connect_to_mongo():
     """Create database connection"""
     global client, database
     try:
+        # Imported here so the API (and auth) can run on the memory/SQLite engines without the driver
+        from motor.motor_asyncio import AsyncIOMotorClient
         client = AsyncIOMotorClient(MONGODB_URL)
         database = client[DATABASE_NAME]
         
@@ -31,7 +32,7 @@ async def connect_to_mongo():
             print("✅ Database indexes created")
         except Exception as e:
             print(f"⚠️ Index creation warning: {e}")
-            
+    
     except Exception as e:
         print(f"❌ MongoDB connection failed: {e}")
         # For development, we'll continue without MongoDB
@@ -0,0 +1,257 @@
+"""
+Training dataset access
+
+heart_disease_data.csv starts with a UTF-8 byte order mark and has one
+integer or decimal column per clinical parameter plus the 0/1 target. Reading
+it with explicit compact dtypes skips per-chunk type inference and keeps
+large extracts small in memory.
+
+Parsing text is still the slowest part of every cold load, so the CSV is
+converted once into a columnar cache next to it:
+    heart_disease_data.csv.columns/
+        age.npy, sex.npy, ..., target.npy   one typed array per column
+        manifest.json                       row count and the CSV's size/mtime
+The cache is memory-mapped for reading and rebuilt whenever the CSV changes.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .ml_model import FEATURE_NAMES
+
+DATA_PATH = "heart_disease_data.csv"
+TARGET = "target"
+
+# Narrowest dtype that holds every clinical range (see PredictionCreate);
+# oldpeak stays float64 so 2.3 reads back as exactly 2.3
+COLUMN_DTYPES = {
+    "age": np.int16,
+    "sex": np.int8,
+    "cp": np.int8,
+    "trestbps": np.int16,
+    "chol": np.int16,
+    "fbs": np.int8,
+    "restecg": np.int8,
+    "thalach": np.int16,
+    "exang": np.int8,
+    "oldpeak": np.float64,
+    "slope": np.int8,
+    "ca": np.int8,
+    "thal": np.int8,
+    TARGET: np.int8
+}
+
+COLUMNS = FEATURE_NAMES + [TARGET]
+CACHE_SUFFIX = ".columns"
+CACHE_FORMAT = 1
+
+def cache_path(path=DATA_PATH):
+    """Directory holding the columnar cache of a CSV"""
+    return f"{path}{CACHE_SUFFIX}"
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def _read_manifest(path):
+    try:
+        with open(os.path.join(cache_path(path), "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def cache_is_fresh(path=DATA_PATH):
+    """
+    Whether the columnar cache matches the CSV
+    
+    The cache records the CSV's size and modification time when it was built;
+    any change to the CSV makes it stale. A cache without its CSV is still
+    usable, e.g. when only the cache is shipped to a training host.
+    """
+    manifest = _read_manifest(path)
+    if manifest is None or manifest.get("format") != CACHE_FORMAT:
+        return False
+    if not os.path.exists(path):
+        return True
+    return manifest.get("source") == _source_signature(path)
+
+def _count_rows(path):
+    """Data rows in a CSV (lines after the header), counted in binary blocks"""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+def build_cache(path=DATA_PATH, chunksize=1_000_000):
+    """
+    Convert a CSV into the columnar cache
+    
+    Chunks are parsed with explicit dtypes and written straight into
+    memory-mapped .npy files, so memory use is bounded by chunksize. The
+    cache is assembled in a temporary directory and renamed into place.
+    
+    Returns:
+        str: cache directory
+    """
+    import pandas as pd
+    
+    signature = _source_signature(path)
+    rows = _count_rows(path)
+    target_dir = cache_path(path)
+    tmp_dir = f"{target_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    
+    try:
+        columns = {
+            name: np.lib.format.open_memmap(
+                os.path.join(tmp_dir, f"{name}.npy"), mode="w+", dtype=COLUMN_DTYPES[name], shape=(rows,)
+            )
+            for name in COLUMNS
+        }
+        offset = 0
+        reader = pd.read_csv(path, encoding="utf-8-sig", usecols=COLUMNS, dtype=COLUMN_DTYPES, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                count = len(chunk)
+                for name, column in columns.items():
+                    column[offset:offset + count] = chunk[name].to_numpy()
+                offset += count
+        for column in columns.values():
+            column.flush()
+        if offset != rows:
+            # Blank lines are counted but skipped by the parser: trim the unused tail
+            trimmed = {name: np.array(column[:offset]) for name, column in columns.items()}
+            del columns
+            for name, values in trimmed.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+            rows = offset
+        else:
+            del columns
+        
+        with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "rows": rows, "columns": COLUMNS, "source": signature}, f)
+        
+        shutil.rmtree(target_dir, ignore_errors=True)
+        os.replace(tmp_dir, target_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    return target_dir
+
+def load_columns(path=DATA_PATH, build=True):
+    """
+    Memory-mapped typed columns of the dataset
+    
+    Args:
+        path: source CSV
+        build: (re)build the cache if it is missing or older than the CSV
+    
+    Returns:
+        dict: column name -> read-only np.memmap
+    
+    Raises:
+        FileNotFoundError: if neither the CSV nor a usable cache exists
+    """
+    if not cache_is_fresh(path):
+        if not build:
+            raise FileNotFoundError(f"No fresh columnar cache for {path}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        build_cache(path)
+    
+    directory = cache_path(path)
+    return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+
+def load_arrays(path=DATA_PATH):
+    """
+    The dataset as (X, y) arrays with columns in FEATURE_NAMES order
+    
+    Reads from the columnar cache, building it on first use.
+    
+    Returns:
+        tuple: (X float64 array of shape (n, 13), y int64 array)
+    """
+    columns = load_columns(path)
+    # Column-major, so each cached column is copied with one contiguous write
+    X = np.empty((len(columns[TARGET]), len(FEATURE_NAMES)), dtype=np.float64, order="F")
+    for index, name in enumerate(FEATURE_NAMES):
+        X[:, index] = columns[name]
+    return X, columns[TARGET].astype(np.int64)
+
+def summarize(path=DATA_PATH):
+    """
+    Per-feature statistics of the dataset, split by outcome
+    
+    Returns:
+        dict: rows, prevalence and mean/min/max per feature for the whole
+            dataset and for each target class
+    """
+    columns = load_columns(path)
+    target = np.asarray(columns[TARGET])
+    positive = target == 1
+    rows = len(target)
+    
+    features = []
+    for name in FEATURE_NAMES:
+        values = columns[name]
+        features.append({
+            "feature": name,
+            "mean": float(values.mean(dtype=np.float64)) if rows else None,
+            "min": float(values.min()) if rows else None,
+            "max": float(values.max()) if rows else None,
+            "mean_with_disease": float(values[positive].mean(dtype=np.float64)) if positive.any() else None,
+            "mean_without_disease": float(values[~positive].mean(dtype=np.float64)) if (~positive).any() else None
+        })
+    
+    return {
+        "rows": rows,
+        "prevalence": float(positive.mean()) if rows else None,
+        "features": features
+    }
+
+def iter_chunks(path=DATA_PATH, chunksize=100_000):
+    """
+    Stream the dataset as fixed-size (X, y) chunks
+    
+    Slices the columnar cache when it is fresh; otherwise parses the CSV
+    chunk by chunk (without building the cache, which needs a full pass).
+    
+    Args:
+        path: CSV with a header row containing FEATURE_NAMES and target
+        chunksize: rows per chunk; memory use is bounded by this, not the file size
+    
+    Yields:
+        tuple: (X float64 array in FEATURE_NAMES order, y int8 array)
+    """
+    if cache_is_fresh(path):
+        columns = load_columns(path, build=False)
+        rows = len(columns[TARGET])
+        for start in range(0, rows, chunksize):
+            stop = min(start + chunksize, rows)
+            X = np.empty((stop - start, len(FEATURE_NAMES)), dtype=np.float64, order="F")
+            for index, name in enumerate(FEATURE_NAMES):
+                X[:, index] = columns[name][start:stop]
+            yield X, np.array(columns[TARGET][start:stop])
+        return
+    
+    import pandas as pd
+    
+    reader = pd.read_csv(
+        path,
+        encoding="utf-8-sig",
+        usecols=FEATURE_NAMES + [TARGET],
+        dtype=COLUMN_DTYPES,
+        chunksize=chunksize
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk[FEATURE_NAMES].to_numpy(dtype=np.float64), chunk[TARGET].to_numpy()
@@ -0,0 +1,102 @@
+"""
+Bounded executor pools for CPU-bound work
+
+Inference, training and password hashing run off the event loop so health
+checks and other requests keep responding. Each pool admits at most max_workers running jobs plus
+max_queue waiting ones; anything beyond that fails fast with
+ExecutorSaturated, which the API turns into a 503.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+TRAINING_WORKERS = int(os.getenv("TRAINING_WORKERS", "1"))
+TRAINING_QUEUE_SIZE = int(os.getenv("TRAINING_QUEUE_SIZE", "0"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+class ExecutorSaturated(Exception):
+    """Raised when a pool already has max_workers + max_queue jobs in flight"""
+
+class BoundedExecutor:
+    def __init__(self, name, kind="thread", max_workers=1, max_queue=0):
+        """
+        Args:
+            name: label used in metrics and error messages
+            kind: "thread" (NumPy and bcrypt release the GIL) or "process" (pure Python work)
+            max_workers: concurrently running jobs
+            max_queue: jobs allowed to wait for a free worker
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.capacity = max_workers + max_queue
+        self._pool = None
+        # Only touched from the event loop thread, so no lock is needed
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    def _get_pool(self):
+        """Create the pool on first use"""
+        if self._pool is None:
+            if self.kind == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            else:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._pool
+    
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in the pool, or raise ExecutorSaturated if it is full"""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.name} pool is saturated")
+        
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(func, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+    
+    def metrics(self):
+        """Pool occupancy counters"""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self):
+        """Stop the worker threads or processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+inference_executor = BoundedExecutor(
+    "inference", kind=INFERENCE_EXECUTOR, max_workers=INFERENCE_WORKERS, max_queue=INFERENCE_QUEUE_SIZE
+)
+training_executor = BoundedExecutor(
+    "training", kind="process", max_workers=TRAINING_WORKERS, max_queue=TRAINING_QUEUE_SIZE
+)
+# bcrypt costs hundreds of milliseconds of CPU per call; a login burst queues here
+password_executor = BoundedExecutor(
+    "password", kind="thread", max_workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_QUEUE_SIZE
+)
@@ -1,22 +1,38 @@
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Request, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
 from typing import List, Optional
 import json
 import asyncio
+import base64
+import math
 
-# Simple in-memory storage for development
+from .auth import create_access_token, require_role, use_doctor_store, verify_password_async
+from .batching import MicroBatcher
+from . import dataset
+from .executor import ExecutorSaturated, inference_executor, password_executor, training_executor
+from .ml_model import FEATURE_NAMES, clinical_row, to_feature_matrix
+from .model_artifact import ArtifactError
+from .model_registry import ModelRegistry, train_and_register
+from .online import OnlineLearner
+from .prediction_cache import PredictionCache, make_key
+from .rate_limit import RateLimited, client_address, open_login_limiter
+from .storage import open_storage
+from .stats import PredictionStats, parse_timestamp
+
+# Simple in-memory storage for development; bcrypt hashes of the demo passwords
+# (admin123, doctor123) are precomputed so importing the app hashes nothing
 users_db = {
     "admin@heartpredict.com": {
         "id": "1",
         "name": "System Administrator",
         "email": "admin@heartpredict.com",
-        "password": "admin123",  # In production, this would be hashed
+        "password_hash": "$2b$12$XpaXeJKUsGyBR/Vni9lZpuq6MTfMene08no.ajabjbDlxQU5WIWEq",
         "role": "admin",
         "specialization": "System Administration"
     },
@@ -24,14 +40,146 @@ users_db = {
         "id": "2", 
         "name": "Dr. John Smith",
         "email": "dr.smith@heartpredict.com",
-        "password": "doctor123",
+        "password_hash": "$2b$12$pK6XTg2r2Iz1Gxfyz2zmZuJLfCEtyb34/DNH2KLqkj9otqucgJS7C",
         "role": "doctor",
         "specialization": "Cardiology"
     }
 }
 
-patients_db = []
-predictions_db = []
+# bcrypt hash (same cost as the accounts') of a random password nobody knows; unknown
+# emails are checked against it so a failed login takes as long whether or not the account exists
+DUMMY_PASSWORD_HASH = "$2b$12$k.rYHsjV1fTM3XeLO.QEXuFU1nPBeD4WZTJsp3/5493A4USFAY7nO"
+
+# Engine chosen by STORAGE_BACKEND (memory, sqlite or mongo)
+storage = open_storage()
+patients_db = storage.patients
+# Indexed by patient so a patient's predictions are fetched without a full scan
+predictions_db = storage.predictions
+# Dashboard counters, updated on every prediction insert/delete
+prediction_stats = PredictionStats()
+predictions_db.observe(prediction_stats)
+# Per-IP and per-account login attempts, counted before any password is hashed
+login_limiter = open_login_limiter()
+# get_current_user reads doctors from this collection, and its writes drop cached
+# token and doctor lookups when a doctor is deactivated or changes role
+use_doctor_store(storage.doctors)
+
+# Versioned model artifacts; the served version follows the registry's CURRENT pointer
+model_registry = ModelRegistry()
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "5"))
+# Synthetic cohort loaded into the in-memory stores at startup, for load testing
+SYNTHETIC_PATIENTS = int(os.getenv("SYNTHETIC_PATIENTS", "0"))
+SYNTHETIC_PREDICTIONS_PER_PATIENT = int(os.getenv("SYNTHETIC_PREDICTIONS_PER_PATIENT", "3"))
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "42"))
+# GET /api/patients page sizes
+PATIENTS_PAGE_SIZE = int(os.getenv("PATIENTS_PAGE_SIZE", "100"))
+PATIENTS_MAX_PAGE_SIZE = int(os.getenv("PATIENTS_MAX_PAGE_SIZE", "1000"))
+# "model" scores with the trained model; "heuristic" is an explicit fallback for running without it
+PREDICTION_MODE = os.getenv("PREDICTION_MODE", "model")
+
+# Shared model instance, created on first use so importing the app stays cheap.
+# Hot reloads replace this reference in a single assignment; requests read it
+# once via get_predictor() and keep scoring with that instance even if a new
+# version is promoted mid-request.
+predictor = None
+model_watch_task = None
+
+def get_predictor():
+    """Get the shared heart disease predictor"""
+    global predictor
+    if predictor is None:
+        predictor = model_registry.load_current()
+    return predictor
+
+def swap_predictor(version):
+    """Load a registered model version and make it the served predictor"""
+    global predictor
+    new_predictor = model_registry.load_version(version)
+    predictor = new_predictor
+    # Keys include the version, so this only frees memory held by the old model's scores
+    prediction_cache.clear()
+    print(f"✅ Serving model version {version}")
+    return new_predictor
+
+def score_rows(model, rows):
+    """Score a micro-batch of feature rows with the given model"""
+    probabilities, risk_levels = model.predict_batch(rows)
+    return [
+        (probability, risk_level, model.version)
+        for probability, risk_level in zip(probabilities.tolist(), risk_levels)
+    ]
+
+async def score_rows_off_loop(rows):
+    """Run a micro-batch on the inference pool so the event loop stays responsive"""
+    # The model is passed explicitly so process pool workers always use the served version
+    return await inference_executor.run(score_rows, get_predictor(), rows)
+
+# Gathers concurrent single-row requests into one vectorized model call, with
+# as many batches in flight as the inference pool has workers
+inference_batcher = MicroBatcher(score_rows_off_loop, max_concurrency=inference_executor.max_workers)
+
+# Confirmed outcomes update the model in mini-batches and are checkpointed into the registry
+online_learner = OnlineLearner(model_registry)
+
+# Repeated feature vectors (re-opened patients, re-submitted forms) skip the model entirely
+prediction_cache = PredictionCache()
+
+async def score_prediction(record):
+    """
+    Score one clinical record through the micro-batcher
+    
+    Returns:
+        tuple: (probability, risk_level, model_version)
+    
+    Raises:
+        ValueError: if a clinical parameter is missing, not numeric or not finite
+    """
+    # Validated here, not in the batch: one bad row would fail every caller sharing it
+    row = clinical_row(record)
+    
+    cached = prediction_cache.get(make_key(row, get_predictor().version))
+    if cached is not None:
+        return cached
+    
+    result = await inference_batcher.submit(row)
+    prediction_cache.put(make_key(row, result[2]), result)
+    return result
+
+def format_explanation(model, rows, contributions):
+    """
+    Per-feature explanations for scored rows
+    
+    Args:
+        model: predictor that produced the contributions
+        rows: feature rows in FEATURE_NAMES order
+        contributions: model.explain_batch(rows)
+    
+    Returns:
+        list[dict]: base_score plus features sorted by absolute contribution, one per row
+    """
+    explanations = []
+    for values, row_contributions in zip(rows, contributions.tolist()):
+        features = sorted(
+            (
+                {"feature": name, "value": value, "contribution": contribution}
+                for name, value, contribution in zip(FEATURE_NAMES, values, row_contributions)
+            ),
+            key=lambda item: abs(item["contribution"]),
+            reverse=True
+        )
+        explanations.append({"base_score": model.base_score, "features": features})
+    return explanations
+
+async def watch_model_registry(interval):
+    """Hot reload the predictor when another process promotes a new version"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            version = model_registry.current_version()
+            if predictor is not None and version and version != predictor.version:
+                swap_predictor(version)
+        except Exception as e:
+            print(f"⚠️ Model reload failed: {e}")
 
 app = FastAPI(
     title="Heart Disease Prediction API",
@@ -46,6 +194,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount static files - try different approaches
@@ -60,6 +209,71 @@ try:
 except Exception as e:
     print(f"⚠️ Could not mount static files: {e}")
 
+async def seed_doctors():
+    """Add the demo accounts to the doctors collection that bearer tokens are checked against"""
+    for user in users_db.values():
+        if not await storage.doctors.find_by("email", user["email"]):
+            doctor = {key: value for key, value in user.items() if key not in ("id", "password_hash")}
+            await storage.doctors.insert({**doctor, "is_active": True})
+
+@app.on_event("startup")
+async def startup_event():
+    """Load the model before accepting traffic and start watching the registry"""
+    global model_watch_task
+    if PREDICTION_MODE != "heuristic":
+        get_predictor()
+    await storage.connect()
+    await seed_doctors()
+    # Durable engines start with existing predictions that the counters have not seen
+    if storage.backend != "memory":
+        for record in await predictions_db.all():
+            prediction_stats.added(record)
+    # A durable memory store that already holds patients is not seeded again
+    if SYNTHETIC_PATIENTS > 0 and storage.backend == "memory" and not len(patients_db.repository):
+        from .synthetic import seed_memory
+        patients, predictions = seed_memory(
+            patients_db.repository, predictions_db.repository, SYNTHETIC_PATIENTS, SYNTHETIC_PREDICTIONS_PER_PATIENT,
+            seed=SYNTHETIC_SEED, predictor=get_predictor()
+        )
+        # The cohort goes straight into the repositories, bypassing the log;
+        # a snapshot makes it durable in one write instead of a logged change per record
+        if storage.log is not None:
+            await storage.log.snapshot()
+        print(f"✅ Seeded {patients} synthetic patients and {predictions} predictions")
+    elif SYNTHETIC_PATIENTS > 0 and storage.backend != "memory":
+        print(f"⚠️ SYNTHETIC_PATIENTS only seeds the memory backend (STORAGE_BACKEND={storage.backend})")
+    if MODEL_WATCH_INTERVAL > 0:
+        model_watch_task = asyncio.create_task(watch_model_registry(MODEL_WATCH_INTERVAL))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    if model_watch_task is not None:
+        model_watch_task.cancel()
+    await inference_batcher.stop()
+    inference_executor.shutdown()
+    training_executor.shutdown()
+    password_executor.shutdown()
+    await storage.close()
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request, exc):
+    """Fail fast instead of queueing unbounded CPU work"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request, exc):
+    """Turn away login attempts over the limit before hashing anything"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Serve the main HTML page"""
@@ -113,21 +327,33 @@ async def health_check():
     }
 
 @app.post("/api/auth/login")
-async def login(credentials: dict):
+async def login(credentials: dict, request: Request):
     """Simple login endpoint"""
     email = credentials.get("email")
     password = credentials.get("password")
     
     if not email or not password:
         raise HTTPException(status_code=400, detail="Email and password required")
+    if not isinstance(email, str) or not isinstance(password, str):
+        raise HTTPException(status_code=400, detail="Email and password must be strings")
     
+    # Over the per-IP or per-account limit: 429 before any hashing
+    address = client_address(request)
+    await login_limiter.acquire_async(address, email)
     user = users_db.get(email)
-    if not user or user["password"] != password:
+    try:
+        # bcrypt runs on the password pool; a full login queue answers 503 at once
+        hashed = user["password_hash"] if user is not None else DUMMY_PASSWORD_HASH
+        valid = await verify_password_async(password, hashed) and user is not None
+    except ExecutorSaturated:
+        await login_limiter.release_async(address, email)
+        raise
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    await login_limiter.succeeded_async(address, email)
     
-    # Return user info (in production, return JWT token)
     return {
-        "access_token": "mock_token_" + user["id"],
+        "access_token": create_access_token({"sub": user["email"], "role": user["role"]}),
         "token_type": "bearer",
         "doctor_info": {
             "id": user["id"],
@@ -140,31 +366,97 @@ async def login(credentials: dict):
 
 @app.get("/api/dashboard/stats")
 async def get_dashboard_stats():
-    """Get dashboard statistics"""
+    """Get dashboard statistics from the incrementally maintained counters"""
     return {
-        "total_patients": len(patients_db),
-        "high_risk_patients": len([p for p in predictions_db if p.get("risk_level") == "High Risk"]),
-        "recent_predictions": len([p for p in predictions_db if (datetime.utcnow() - datetime.fromisoformat(p.get("created_at", "2024-01-01T00:00:00"))).days <= 7]),
-        "total_predictions": len(predictions_db)
+        "total_patients": await patients_db.count(),
+        "high_risk_patients": prediction_stats.risk_count("High Risk"),
+        "recent_predictions": prediction_stats.recent(),
+        "total_predictions": prediction_stats.total
     }
 
 @app.post("/api/patients")
 async def create_patient(patient: dict):
     """Create a new patient"""
-    patient["id"] = str(len(patients_db) + 1)
+    patient.pop("id", None)
     patient["created_at"] = datetime.utcnow().isoformat()
-    patients_db.append(patient)
-    return patient
+    return await patients_db.insert(patient)
+
+def encode_cursor(sort, order, position):
+    """Opaque page cursor: the sort order and the (value, id) of the last record"""
+    value, record_id = position
+    # Mongo records seeded by init_db.py and synthetic.py hold datetimes; they must come back as datetimes
+    if isinstance(value, datetime):
+        value = {"datetime": value.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps([sort, order, value, record_id]).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, sort, order):
+    """
+    (value, id) from a cursor created for the same sort order
+    
+    Raises:
+        HTTPException: 422 if the cursor is malformed or belongs to another order
+    """
+    try:
+        cursor_sort, cursor_order, value, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["datetime"])
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise HTTPException(status_code=422, detail="Cursor was issued for a different sort order")
+    return value, str(record_id)
 
 @app.get("/api/patients")
-async def get_patients():
-    """Get all patients"""
-    return patients_db
+async def get_patients(
+    response: Response,
+    limit: int = Query(PATIENTS_PAGE_SIZE, ge=1, le=PATIENTS_MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    sort: str = "id",
+    order: str = "asc",
+    fields: Optional[str] = None
+):
+    """
+    One page of patients, ordered by sort (id, name or created_at) then id
+    
+    The cursor for the next page is returned in the X-Next-Cursor header
+    (absent on the last page); pass it back as `after` with the same sort and
+    order. fields=name,email limits each patient to those fields plus its id.
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=422, detail="order must be asc or desc")
+    position = decode_cursor(after, sort, order) if after else None
+    projection = [field for field in fields.split(",") if field] if fields else None
+    try:
+        patients, next_position = await patients_db.page(limit, position, sort, order == "desc", projection)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if next_position is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, order, next_position)
+    return patients
 
-@app.post("/api/predictions")
-async def create_prediction(prediction_data: dict):
-    """Create heart disease prediction"""
-    # Simple mock prediction logic
+@app.get("/api/patients/{patient_id}")
+async def get_patient(patient_id: str):
+    """Get one patient by id"""
+    patient = await patients_db.get(patient_id)
+    if patient is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return patient
+
+@app.delete("/api/patients/{patient_id}")
+async def delete_patient(patient_id: str):
+    """Delete a patient; the id is not reused"""
+    patient = await patients_db.delete(patient_id)
+    if patient is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return {"deleted": patient_id}
+
+def heuristic_risk(prediction_data):
+    """
+    Additive rule-of-thumb risk score, used only when PREDICTION_MODE=heuristic
+    
+    Returns:
+        tuple: (probability, risk_level)
+    """
     age = prediction_data.get("age", 50)
     chol = prediction_data.get("chol", 200)
     trestbps = prediction_data.get("trestbps", 120)
@@ -180,27 +472,130 @@ async def create_prediction(prediction_data: dict):
     probability = min(risk_score, 0.95)  # Cap at 95%
     risk_level = "High Risk" if probability >= 0.5 else "Low Risk"
     
+    return probability, risk_level
+
+@app.post("/api/predictions")
+async def create_prediction(prediction_data: dict, explain: bool = False):
+    """Create heart disease prediction, with per-feature contributions if explain=true"""
+    explanation = None
+    if PREDICTION_MODE == "heuristic":
+        probability, risk_level = heuristic_risk(prediction_data)
+        model_version = "heuristic"
+    else:
+        try:
+            probability, risk_level, model_version = await score_prediction(prediction_data)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if explain:
+            # A single row is a 13-element broadcast: cheaper inline than a pool round trip
+            model = get_predictor()
+            if model.version != model_version:
+                # Scored (or cached) before a hot swap: explain with the model that produced the score
+                model = await asyncio.to_thread(model_registry.load_version, model_version)
+            row = clinical_row(prediction_data)
+            explanation = format_explanation(model, [row], model.explain_batch([row]))[0]
+    
     prediction = {
         **prediction_data,
-        "id": str(len(predictions_db) + 1),
         "probability": probability,
         "risk_level": risk_level,
+        "model_version": model_version,
         "created_at": datetime.utcnow().isoformat()
     }
     
-    predictions_db.append(prediction)
+    await predictions_db.insert(prediction)
+    if explanation is not None:
+        # Already JSON-native: skip jsonable_encoder, which would cost more than the explanation itself
+        return JSONResponse(content={**prediction, "explanation": explanation})
+    return prediction
+
+def score_batch_payload(model, body):
+    """
+    Parse, score and serialize a batch request body
+    
+    Runs on the inference pool: for large batches JSON decoding, building the
+    feature matrix and encoding the response cost far more than the model itself.
+    """
+    try:
+        payload = json.loads(body)
+        records = payload.get("records")
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    if not isinstance(records, list) or not records:
+        raise HTTPException(status_code=400, detail="records must be a non-empty list")
+    
+    try:
+        features = to_feature_matrix(records)
+        probabilities, risk_levels = model.predict_batch(features)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    results = []
+    for record, probability, risk_level in zip(records, probabilities.tolist(), risk_levels):
+        result = {"probability": probability, "risk_level": risk_level, "model_version": model.version}
+        if isinstance(record, dict) and "patient_id" in record:
+            result["patient_id"] = record["patient_id"]
+        results.append(result)
+    
+    if payload.get("explain"):
+        explanations = format_explanation(model, features.tolist(), model.explain_batch(features))
+        for result, explanation in zip(results, explanations):
+            result["explanation"] = explanation
+    
+    return json.dumps({"count": len(results), "model_version": model.version, "predictions": results})
+
+@app.post("/api/predictions/batch")
+async def create_batch_prediction(request: Request):
+    """Score many clinical records in one vectorized model call"""
+    body = await request.body()
+    content = await inference_executor.run(score_batch_payload, get_predictor(), body)
+    return Response(content=content, media_type="application/json")
+
+@app.put("/api/predictions/{prediction_id}/outcome")
+async def confirm_prediction_outcome(prediction_id: str, body: dict, user: dict = Depends(require_role("doctor", "admin"))):
+    """Record the confirmed diagnosis for a prediction and feed it to online learning (doctors and admins)"""
+    outcome = body.get("outcome")
+    if outcome not in (0, 1) or isinstance(outcome, bool):
+        raise HTTPException(status_code=422, detail="outcome must be 0 or 1")
+    
+    existing = await predictions_db.get(prediction_id)
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Prediction not found")
+    
+    # Heuristic-mode records carry no model version and would not be a fair training signal;
+    # a repeated confirmation of the same outcome is not a new sample
+    train = PREDICTION_MODE != "heuristic" and existing.get("outcome") != outcome
+    if train:
+        try:
+            clinical_row(existing)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Prediction cannot be used for training: {e}")
+    
+    prediction = await predictions_db.update(
+        prediction_id, {"outcome": outcome, "confirmed_at": datetime.utcnow().isoformat()}
+    )
+    if prediction is None:
+        raise HTTPException(status_code=404, detail="Prediction not found")
+    
+    if train:
+        # A thread of this process: the learner's buffer must stay here, and it cannot be pickled for a process pool
+        version = await asyncio.to_thread(online_learner.add, prediction, outcome)
+        # Unless ONLINE_AUTO_PROMOTE is set the checkpoint waits for an admin to promote it
+        if version is not None and online_learner.promote:
+            swap_predictor(version)
+    
     return prediction
 
 @app.get("/api/predictions/{patient_id}")
 async def get_patient_predictions(patient_id: str):
     """Get predictions for a patient"""
-    return [p for p in predictions_db if p.get("patient_id") == patient_id]
+    return await predictions_db.find_by("patient_id", patient_id)
 
 @app.get("/api/analytics/risk-distribution")
 async def get_risk_distribution():
     """Get risk distribution analytics"""
-    high_risk = len([p for p in predictions_db if p.get("risk_level") == "High Risk"])
-    low_risk = len([p for p in predictions_db if p.get("risk_level") == "Low Risk"])
+    high_risk = prediction_stats.risk_count("High Risk")
+    low_risk = prediction_stats.risk_count("Low Risk")
     
     return [
         {"risk_level": "Low Risk", "count": max(low_risk, 15)},  # Mock data if empty
@@ -208,16 +603,91 @@ async def get_risk_distribution():
     ]
 
 @app.get("/api/analytics/predictions-timeline")
-async def get_predictions_timeline():
-    """Get predictions timeline"""
-    # Mock timeline data
-    return [
-        {"date": "2024-01-01", "count": 3},
-        {"date": "2024-01-02", "count": 5},
-        {"date": "2024-01-03", "count": 2},
-        {"date": "2024-01-04", "count": 4},
-        {"date": "2024-01-05", "count": 6}
-    ]
+async def get_predictions_timeline(
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    granularity: str = "day"
+):
+    """
+    Prediction counts per hour/day/week/month between from and to (UTC)
+    
+    from/to are ISO dates or datetimes; a date-only `to` includes that whole
+    day. Defaults to the last 30 days. Served from the rollups in
+    prediction_stats, one lookup per bucket.
+    """
+    try:
+        if end is None:
+            end_at = datetime.utcnow() + timedelta(hours=1)
+        else:
+            end_at = parse_timestamp(end)
+            if len(end) == 10:
+                end_at += timedelta(days=1)
+        start_at = parse_timestamp(start) if start is not None else end_at - timedelta(days=30)
+        return prediction_stats.timeline(start_at, end_at, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.get("/api/analytics/feature-importance")
+async def get_feature_importance():
+    """Global feature importance of the served model"""
+    importance = get_predictor().get_feature_importance()
+    return [{"feature": name, "importance": float(value)} for name, value in importance]
+
+@app.get("/api/analytics/dataset-summary")
+async def get_dataset_summary():
+    """Per-feature statistics of the training dataset, read from its columnar cache"""
+    try:
+        return await inference_executor.run(dataset.summarize)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Training dataset not found")
+
+@app.get("/api/metrics/inference")
+async def get_inference_metrics():
+    """Micro-batcher, prediction cache and executor pool statistics"""
+    return {
+        **inference_batcher.metrics(),
+        "prediction_cache": prediction_cache.metrics(),
+        "inference_pool": inference_executor.metrics(),
+        "training_pool": training_executor.metrics(),
+        "password_pool": password_executor.metrics(),
+        "login_limiter": login_limiter.metrics(),
+        "online_learning": online_learner.metrics()
+    }
+
+@app.get("/api/admin/models")
+async def list_models(user: dict = Depends(require_role("admin"))):
+    """List registered model versions (admins only)"""
+    return {
+        "serving": get_predictor().version,
+        "models": model_registry.list_versions()
+    }
+
+@app.post("/api/admin/models/train")
+async def train_model_version(options: Optional[dict] = None, user: dict = Depends(require_role("admin"))):
+    """Train a new model version in a worker process, optionally promoting it (admins only)"""
+    promote = bool((options or {}).get("promote", False))
+    version = await training_executor.run(train_and_register, model_registry.root)
+    
+    if promote:
+        swap_predictor(version)
+        model_registry.promote(version)
+    
+    return {"version": version, "promoted": promote}
+
+@app.post("/api/admin/models/{version}/promote")
+async def promote_model(version: str, user: dict = Depends(require_role("admin"))):
+    """Promote a registered model version and hot swap it in without a restart (admins only)"""
+    try:
+        swap_predictor(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ArtifactError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Persist the pointer so other workers pick the version up through their watchers
+    model_registry.promote(version)
+    
+    return {"serving": version}
 
 # Serve CSS files
 @app.get("/css/{file_path:path}")
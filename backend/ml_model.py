@@ -1,35 +1,335 @@
+import math
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score
-import joblib
 import os
 
+from . import model_artifact
+
+# Serving only needs NumPy and SciPy's expit: pandas, sklearn and joblib are
+# imported inside the training and legacy-pickle code paths, and SciPy (about
+# 100 ms) when the first weights are loaded rather than with this module.
+MODEL_PATH = os.getenv("MODEL_PATH", "backend/heart_disease_model.bin")
+# Pickled sklearn model written by earlier versions, converted on first load
+LEGACY_MODEL_PATH = "backend/heart_disease_model.pkl"
+
+# SGD settings for incremental updates from confirmed outcomes
+ONLINE_LEARNING_RATE = float(os.getenv("ONLINE_LEARNING_RATE", "0.01"))
+ONLINE_ALPHA = float(os.getenv("ONLINE_ALPHA", "0.0001"))
+
+# Column order expected by the model (matches heart_disease_data.csv and PredictionCreate)
+FEATURE_NAMES = [
+    'age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg',
+    'thalach', 'exang', 'oldpeak', 'slope', 'ca', 'thal'
+]
+
+# scipy.special.expit once load_expit() has run
+expit = None
+
+def load_expit():
+    """Import SciPy's logistic ufunc (the one predict_proba uses) on first use"""
+    global expit
+    if expit is None:
+        from scipy.special import expit as scipy_expit
+        expit = scipy_expit
+    return expit
+
+def clinical_row(record):
+    """
+    Feature row of one clinical record, in FEATURE_NAMES order
+    
+    Raises:
+        ValueError: if a clinical parameter is missing, not numeric or not finite
+    """
+    try:
+        row = [float(record[name]) for name in FEATURE_NAMES]
+    except KeyError as e:
+        raise ValueError(f"Missing clinical parameter: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise ValueError("Clinical parameters must be numeric")
+    # float() parses "nan" and "inf"; they would score as NaN and break JSON encoding
+    if not all(math.isfinite(value) for value in row):
+        raise ValueError("Clinical parameters must be finite numbers")
+    return row
+
+def to_feature_matrix(records):
+    """
+    Convert a batch of clinical records into an (n, 13) float array
+    
+    Args:
+        records: (n, 13) array-like, list of dicts keyed by FEATURE_NAMES,
+            or a DataFrame containing the FEATURE_NAMES columns
+    
+    Returns:
+        np.ndarray: feature matrix in FEATURE_NAMES column order
+    
+    Raises:
+        ValueError: if a parameter is missing, not numeric or not finite
+    """
+    if not hasattr(records, "columns") and len(records) == 0:
+        return np.empty((0, len(FEATURE_NAMES)), dtype=np.float64)
+    
+    if hasattr(records, "columns"):
+        # DataFrame: select columns by name so extra columns (patient_id, target) are ignored
+        matrix = records[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    elif len(records) > 0 and isinstance(records[0], dict):
+        try:
+            matrix = np.array(
+                [[record[name] for name in FEATURE_NAMES] for record in records],
+                dtype=np.float64
+            )
+        except KeyError as e:
+            raise ValueError(f"Missing clinical parameter: {e.args[0]}")
+    else:
+        matrix = np.asarray(records, dtype=np.float64)
+    
+    if matrix.ndim != 2 or matrix.shape[1] != len(FEATURE_NAMES):
+        raise ValueError(
+            f"Expected input of shape (n, {len(FEATURE_NAMES)}), got {matrix.shape}"
+        )
+    if not np.isfinite(matrix).all():
+        raise ValueError("Clinical parameters must be finite numbers")
+    
+    return matrix
+
 class HeartDiseasePredictor:
-    def __init__(self):
+    def __init__(self, dtype=np.float64, model_path=None, load=True):
+        # sklearn estimator, only set when trained or unpickled in this process
         self.model = None
-        self.load_or_train_model()
+        self.model_path = model_path or MODEL_PATH
+        # Memory-mapped artifact arrays and header metadata
+        self.weights = None
+        self.metadata = {}
+        self.version = None
+        # Scoring kernel weights; float64 keeps bit-for-bit parity with sklearn's predict_proba
+        self.dtype = np.dtype(dtype)
+        self.coef = None
+        self.intercept = None
+        # Reference patient for explanations (training feature means) and its log-odds
+        self.baseline = None
+        self.base_score = None
+        # (feature, |coef|) pairs sorted by magnitude, computed once per set of weights
+        self.feature_importance = None
+        # Training feature means, recorded in artifacts saved from this process
+        self.feature_means = None
+        # SGDClassifier warm-started from the artifact weights by partial_fit
+        self.online_model = None
+        self.samples_seen = 0
+        # Trainers pass load=False and call train_model() themselves
+        if load:
+            self.load_or_train_model()
     
     def load_or_train_model(self):
-        """Load existing model or train new one"""
-        model_path = "backend/heart_disease_model.pkl"
+        """Load the model artifact, converting the legacy pickle or training a new model if needed"""
+        if not os.path.exists(self.model_path):
+            if os.path.exists(LEGACY_MODEL_PATH):
+                import joblib
+                self.model = joblib.load(LEGACY_MODEL_PATH)
+                source = os.path.basename(LEGACY_MODEL_PATH)
+            else:
+                self.train_model()
+                source = "train_model"
+            self.save_artifact(self.model_path, metadata={"source": source})
         
-        if os.path.exists(model_path):
-            self.model = joblib.load(model_path)
-        else:
-            self.train_model()
-            joblib.dump(self.model, model_path)
+        self.load_artifact(self.model_path)
+    
+    def save_artifact(self, path, metadata=None):
+        """Write the fitted estimator's weights (or the online-updated weights) as a model artifact"""
+        if self.model is not None:
+            extra = {"feature_means": self.feature_means} if self.feature_means is not None else {}
+            return model_artifact.save_artifact(
+                path,
+                feature_names=FEATURE_NAMES,
+                metadata={"model_type": type(self.model).__name__, **extra, **(metadata or {})},
+                **model_artifact.weights_from_estimator(self.model)
+            )
+        if self.online_model is None:
+            raise ValueError("Model not trained or loaded")
+        
+        return model_artifact.save_artifact(
+            path,
+            coef=self.weights["coef"],
+            intercept=self.weights["intercept"][0],
+            feature_names=FEATURE_NAMES,
+            scaler_mean=self.weights["scaler_mean"],
+            scaler_scale=self.weights["scaler_scale"],
+            metadata={
+                **{key: value for key, value in self.metadata.items() if key not in ("created_at", "version")},
+                "model_type": "SGDClassifier",
+                "samples_seen": self.samples_seen,
+                **(metadata or {})
+            }
+        )
+    
+    def load_artifact(self, path):
+        """Memory-map a model artifact and prepare the scoring kernel"""
+        arrays, header = model_artifact.load_artifact(path)
+        if header["feature_names"] != FEATURE_NAMES:
+            raise model_artifact.ArtifactError(
+                f"Artifact feature order {header['feature_names']} does not match {FEATURE_NAMES}"
+            )
+        
+        self.weights = arrays
+        self.metadata = header["metadata"]
+        # Registry version recorded on every prediction; artifacts outside the registry have none
+        self.version = self.metadata.get("version", "unversioned")
+        self.extract_weights()
+    
+    def extract_weights(self):
+        """Build contiguous kernel weights from the artifact arrays"""
+        coef = self.weights["coef"]
+        intercept = self.weights["intercept"][0]
+        mean = self.weights["scaler_mean"]
+        scale = self.weights["scaler_scale"]
+        
+        if np.any(mean != 0) or np.any(scale != 1):
+            # Fold standardization into the weights: coef . ((x - mean) / scale) + intercept
+            coef = coef / scale
+            intercept = intercept - coef @ mean
+        
+        # Explanations are relative to the training means; artifacts without
+        # them fall back to the scaler mean (zero for unscaled models)
+        baseline = self.metadata.get("feature_means")
+        self.baseline = np.array(baseline if baseline is not None else mean, dtype=np.float64)
+        self.base_score = float(intercept + coef @ self.baseline)
+        self.feature_importance = sorted(
+            zip(FEATURE_NAMES, np.abs(self.weights["coef"]).tolist()), key=lambda x: x[1], reverse=True
+        )
+        
+        load_expit()
+        # For float64 this is a zero-copy view of the shared memory map
+        self.coef = np.ascontiguousarray(coef, dtype=self.dtype)
+        self.intercept = self.dtype.type(intercept)
+    
+    def score(self, input_data):
+        """
+        Fused logistic kernel: sigmoid(X @ coef + intercept)
+        
+        Computes the same operations as LogisticRegression.predict_proba without
+        sklearn's per-call input validation.
+        
+        Args:
+            input_data: (n, 13) float array in FEATURE_NAMES order
+        
+        Returns:
+            np.ndarray: probability of heart disease for each row
+        """
+        scores = np.asarray(input_data, dtype=self.dtype) @ self.coef
+        scores += self.intercept
+        # Unpickled predictors (process pool workers) never ran extract_weights here
+        return (expit or load_expit())(scores, out=scores)
+    
+    def explain_batch(self, records):
+        """
+        Signed contribution of every feature to each prediction's log-odds
+        
+        contribution[i, j] = coef[j] * (x[i, j] - baseline[j]), computed for the
+        whole batch in one broadcast operation. Each row sums to the record's
+        log-odds minus base_score, the log-odds of the baseline patient.
+        
+        Args:
+            records: (n, 13) array, list of dicts or DataFrame (see to_feature_matrix)
+        
+        Returns:
+            np.ndarray: (n, 13) contributions in FEATURE_NAMES column order
+        """
+        if self.coef is None:
+            raise ValueError("Model not trained or loaded")
+        
+        input_data = to_feature_matrix(records)
+        contributions = input_data - self.baseline
+        contributions *= self.coef
+        return contributions
+    
+    def partial_fit(self, records, outcomes):
+        """
+        Update the weights with one mini-batch of confirmed outcomes
+        
+        The first call warm-starts an SGDClassifier (log loss) from the current
+        weights, so updates refine the served model instead of starting over.
+        SGD runs in standardized feature space; afterwards this instance scores
+        with the updated weights.
+        
+        Args:
+            records: (n, 13) array, list of dicts or DataFrame (see to_feature_matrix)
+            outcomes: n confirmed labels, 1 for heart disease and 0 otherwise
+        
+        Returns:
+            int: total samples seen by online updates
+        """
+        if self.weights is None:
+            raise ValueError("Model not trained or loaded")
+        
+        X = to_feature_matrix(records)
+        y = np.asarray(outcomes, dtype=np.int64)
+        if X.shape[0] != y.shape[0]:
+            raise ValueError(f"Got {X.shape[0]} records but {y.shape[0]} outcomes")
+        if X.shape[0] == 0:
+            return self.samples_seen
+        
+        if self.online_model is None:
+            self.online_model = self.start_online_model(X)
+        
+        mean = self.weights["scaler_mean"]
+        scale = self.weights["scaler_scale"]
+        self.online_model.partial_fit((X - mean) / scale, y, classes=[0, 1])
+        self.samples_seen += X.shape[0]
+        
+        self.weights = {
+            "coef": self.online_model.coef_[0].copy(),
+            "intercept": self.online_model.intercept_.copy(),
+            "scaler_mean": mean,
+            "scaler_scale": scale
+        }
+        # The weights no longer come from the estimator trained or unpickled in this process
+        self.model = None
+        self.extract_weights()
+        return self.samples_seen
+    
+    def start_online_model(self, X):
+        """
+        Create an SGDClassifier that predicts exactly like the current weights
+        
+        Artifacts without scaler statistics are standardized with the first
+        mini-batch's mean and standard deviation; the weights are re-expressed
+        in that space so scores are unchanged before the first update.
+        """
+        from sklearn.linear_model import SGDClassifier
+        
+        coef = np.array(self.weights["coef"], dtype=np.float64)
+        intercept = float(self.weights["intercept"][0])
+        mean = np.array(self.weights["scaler_mean"], dtype=np.float64)
+        scale = np.array(self.weights["scaler_scale"], dtype=np.float64)
+        
+        if np.all(mean == 0) and np.all(scale == 1):
+            mean = X.mean(axis=0)
+            scale = X.std(axis=0)
+            scale[scale == 0] = 1.0
+            intercept = intercept + coef @ mean
+            coef = coef * scale
+            self.weights = {
+                "coef": coef,
+                "intercept": np.array([intercept]),
+                "scaler_mean": mean,
+                "scaler_scale": scale
+            }
+        
+        model = SGDClassifier(
+            loss="log_loss", alpha=ONLINE_ALPHA,
+            learning_rate="constant", eta0=ONLINE_LEARNING_RATE, random_state=42
+        )
+        model.coef_ = coef.reshape(1, -1)
+        model.intercept_ = np.array([intercept])
+        return model
     
     def train_model(self):
         """Train the heart disease prediction model"""
+        from sklearn.model_selection import train_test_split
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import accuracy_score
+        from .dataset import load_arrays
+        
         try:
-            # Load the dataset
-            heart_disease = pd.read_csv('heart_disease_data.csv')
-            
-            # Prepare features and target
-            X = heart_disease.drop(columns='target', axis=1)
-            y = heart_disease['target']
+            # Load features and target from the memory-mapped columnar cache of the CSV
+            X, y = load_arrays()
             
             # Split the data
             X_train, X_test, y_train, y_test = train_test_split(
@@ -39,13 +339,14 @@ class HeartDiseasePredictor:
             # Train the model
             self.model = LogisticRegression(max_iter=1000, random_state=42)
             self.model.fit(X_train, y_train)
+            self.feature_means = X_train.mean(axis=0).tolist()
             
             # Calculate accuracy
             train_accuracy = accuracy_score(y_train, self.model.predict(X_train))
             test_accuracy = accuracy_score(y_test, self.model.predict(X_test))
             
             print(f"✅ Model trained - Training Accuracy: {train_accuracy:.4f}, Testing Accuracy: {test_accuracy:.4f}")
-            
+        
         except FileNotFoundError:
             print("⚠️ heart_disease_data.csv not found, creating mock model")
             # Create a simple mock model for development
@@ -56,6 +357,8 @@ class HeartDiseasePredictor:
     
     def create_mock_model(self):
         """Create a mock model for development when data file is not available"""
+        from sklearn.linear_model import LogisticRegression
+        
         # Create mock training data
         np.random.seed(42)
         X_mock = np.random.rand(100, 13)
@@ -63,6 +366,7 @@ class HeartDiseasePredictor:
         
         self.model = LogisticRegression(max_iter=1000, random_state=42)
         self.model.fit(X_mock, y_mock)
+        self.feature_means = X_mock.mean(axis=0).tolist()
         print("✅ Mock model created for development")
     
     def predict(self, clinical_data):
@@ -77,14 +381,14 @@ class HeartDiseasePredictor:
         Returns:
             tuple: (probability, risk_level)
         """
-        if self.model is None:
+        if self.coef is None:
             raise ValueError("Model not trained or loaded")
         
         # Convert to numpy array and reshape
-        input_data = np.array(clinical_data).reshape(1, -1)
+        input_data = np.array(clinical_data, dtype=np.float64).reshape(1, -1)
         
         # Get prediction probability
-        probability = self.model.predict_proba(input_data)[0][1]  # Probability of class 1 (disease)
+        probability = self.score(input_data)[0]  # Probability of class 1 (disease)
         
         # Determine risk level
         if probability >= 0.5:
@@ -94,17 +398,31 @@ class HeartDiseasePredictor:
         
         return float(probability), risk_level
     
-    def get_feature_importance(self):
-        """Get feature importance from the model"""
-        if self.model is None:
+    def predict_batch(self, records):
+        """
+        Make predictions for many patients in one vectorized call
+        
+        Args:
+            records: (n, 13) array, list of dicts or DataFrame (see to_feature_matrix)
+        
+        Returns:
+            tuple: (probabilities, risk_levels) as arrays of length n
+        """
+        if self.coef is None:
             raise ValueError("Model not trained or loaded")
         
-        feature_names = [
-            'age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg',
-            'thalach', 'exang', 'oldpeak', 'slope', 'ca', 'thal'
-        ]
+        input_data = to_feature_matrix(records)
+        if input_data.shape[0] == 0:
+            return np.empty(0, dtype=self.dtype), np.empty(0, dtype=object)
+        
+        probabilities = self.score(input_data)
+        risk_levels = np.where(probabilities >= 0.5, "High Risk", "Low Risk").astype(object)
         
-        importance = abs(self.model.coef_[0])
-        feature_importance = dict(zip(feature_names, importance))
+        return probabilities, risk_levels
+    
+    def get_feature_importance(self):
+        """Get feature importance from the model (precomputed when the weights are loaded)"""
+        if self.feature_importance is None:
+            raise ValueError("Model not trained or loaded")
         
-        return sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
\ No newline at end of file
+        return self.feature_importance
\ No newline at end of file
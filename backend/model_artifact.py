@@ -0,0 +1,196 @@
+"""
+Versioned, memory-mappable model artifact format
+
+Layout of an artifact file:
+    8 bytes   magic (b"HDMODEL\\0")
+    4 bytes   little-endian uint32 header length
+    N bytes   UTF-8 JSON header, space padded so the data starts 64-byte aligned
+    ...       little-endian float64 buffer holding every array back to back
+
+The header records the format version, feature order, array offsets/shapes
+and free-form metadata. Arrays are read with np.memmap so every worker process
+maps the same page-cache copy of the weights, and loading never imports sklearn.
+"""
+
+import json
+import os
+import struct
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b"HDMODEL\0"
+FORMAT_VERSION = 1
+DATA_DTYPE = "<f8"
+ALIGNMENT = 64
+
+class ArtifactError(ValueError):
+    """Raised when an artifact file is missing, corrupt or of an unsupported version"""
+
+def temp_path(path):
+    """Scratch name next to path, unique per call so concurrent writers never share one"""
+    return f"{path}.tmp{os.getpid()}-{uuid.uuid4().hex}"
+
+def save_artifact(path, coef, intercept, feature_names, scaler_mean=None, scaler_scale=None, metadata=None):
+    """
+    Write a model artifact atomically
+    
+    Args:
+        path: destination file
+        coef: (n_features,) logistic regression coefficients
+        intercept: scalar intercept
+        feature_names: column order the coefficients refer to
+        scaler_mean, scaler_scale: standardization applied before the dot product
+            (defaults to the identity transform, i.e. raw features)
+        metadata: extra JSON-serializable information (model version, source, metrics)
+    
+    Returns:
+        dict: the header that was written
+    """
+    coef = np.asarray(coef, dtype=DATA_DTYPE).ravel()
+    n_features = coef.shape[0]
+    if len(feature_names) != n_features:
+        raise ArtifactError(f"{len(feature_names)} feature names for {n_features} coefficients")
+    
+    arrays = {
+        "coef": coef,
+        "intercept": np.asarray(intercept, dtype=DATA_DTYPE).reshape(1),
+        "scaler_mean": np.zeros(n_features) if scaler_mean is None else scaler_mean,
+        "scaler_scale": np.ones(n_features) if scaler_scale is None else scaler_scale,
+    }
+    
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=DATA_DTYPE)
+        arrays[name] = array
+        layout[name] = {"offset": offset, "shape": list(array.shape)}
+        offset += array.nbytes
+    
+    header = {
+        "format_version": FORMAT_VERSION,
+        "dtype": DATA_DTYPE,
+        "feature_names": list(feature_names),
+        "arrays": layout,
+        "metadata": {
+            "created_at": datetime.utcnow().isoformat(),
+            **(metadata or {})
+        }
+    }
+    
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix_size = len(MAGIC) + 4
+    padding = -(prefix_size + len(header_bytes)) % ALIGNMENT
+    header_bytes += b" " * padding
+    
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for array in arrays.values():
+                f.write(array.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return header
+
+def read_header(path):
+    """Read and validate an artifact header, returning (header, data_offset)"""
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ArtifactError(f"{path} is not a model artifact")
+            (header_length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+    except FileNotFoundError:
+        raise ArtifactError(f"Model artifact not found: {path}")
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ArtifactError(f"Corrupt model artifact {path}: {e}")
+    
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(
+            f"Unsupported artifact format version {header.get('format_version')} (expected {FORMAT_VERSION})"
+        )
+    
+    return header, len(MAGIC) + 4 + header_length
+
+def load_artifact(path):
+    """
+    Memory-map a model artifact
+    
+    Returns:
+        tuple: (arrays, header) where arrays maps name -> read-only np.memmap view
+    """
+    header, data_offset = read_header(path)
+    layout = header["arrays"]
+    total = sum(int(np.prod(spec["shape"])) for spec in layout.values())
+    
+    buffer = np.memmap(path, dtype=header["dtype"], mode="r", offset=data_offset, shape=(total,))
+    itemsize = buffer.dtype.itemsize
+    
+    arrays = {}
+    for name, spec in layout.items():
+        start = spec["offset"] // itemsize
+        size = int(np.prod(spec["shape"]))
+        arrays[name] = buffer[start:start + size].reshape(spec["shape"])
+    
+    return arrays, header
+
+def weights_from_estimator(model):
+    """Extract artifact arrays from a fitted binary LogisticRegression-like estimator"""
+    return {
+        "coef": np.asarray(model.coef_, dtype=DATA_DTYPE)[0],
+        "intercept": np.asarray(model.intercept_, dtype=DATA_DTYPE)[0],
+    }
+
+def convert_pickle(pickle_path, artifact_path, feature_names, metadata=None):
+    """Convert a joblib-pickled sklearn model into an artifact file"""
+    import joblib
+    
+    model = joblib.load(pickle_path)
+    names = list(getattr(model, "feature_names_in_", feature_names))
+    if names != list(feature_names):
+        raise ArtifactError(f"Pickled model was trained on columns {names}, expected {list(feature_names)}")
+    
+    return save_artifact(
+        artifact_path,
+        feature_names=names,
+        metadata={"source": os.path.basename(pickle_path), "model_type": type(model).__name__, **(metadata or {})},
+        **weights_from_estimator(model)
+    )
+
+def main():
+    """Command line entry point: convert or inspect artifacts"""
+    import argparse
+    from .ml_model import FEATURE_NAMES, LEGACY_MODEL_PATH, MODEL_PATH
+    
+    parser = argparse.ArgumentParser(description="Heart disease model artifact tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    convert = subparsers.add_parser("convert", help="Convert a joblib pickle into an artifact")
+    convert.add_argument("pickle_path", nargs="?", default=LEGACY_MODEL_PATH)
+    convert.add_argument("artifact_path", nargs="?", default=MODEL_PATH)
+    
+    inspect = subparsers.add_parser("inspect", help="Print an artifact header")
+    inspect.add_argument("artifact_path", nargs="?", default=MODEL_PATH)
+    
+    args = parser.parse_args()
+    
+    if args.command == "convert":
+        convert_pickle(args.pickle_path, args.artifact_path, FEATURE_NAMES)
+        print(f"✅ Converted {args.pickle_path} -> {args.artifact_path}")
+    else:
+        header, _ = read_header(args.artifact_path)
+        print(json.dumps(header, indent=2))
+
+if __name__ == "__main__":
+    main()
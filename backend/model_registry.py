@@ -0,0 +1,216 @@
+"""
+Model registry: versioned artifacts plus an atomic "current" pointer
+
+Layout of the registry directory:
+    v0001.bin, v0002.bin, ...   model artifacts (see model_artifact.py)
+    CURRENT                     name of the promoted version
+
+Registering claims the next version number by creating its file with
+O_EXCL, so concurrent registrations (threads, the training pool, forked
+workers) each get their own number. Until the artifact is renamed over it
+the claimed file is empty and list_versions() skips it. Promoting a version
+rewrites CURRENT with an atomic rename, so every worker sees either the old
+or the new version, never a partial write.
+"""
+
+import os
+import re
+
+from . import model_artifact
+from .ml_model import HeartDiseasePredictor
+
+REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "backend/models")
+VERSION_PATTERN = re.compile(r"^v(\d+)\.bin$")
+
+class ModelRegistry:
+    def __init__(self, root=None):
+        self.root = root or REGISTRY_DIR
+        self.pointer_path = os.path.join(self.root, "CURRENT")
+    
+    def artifact_path(self, version):
+        """Path of the artifact file for a version"""
+        return os.path.join(self.root, f"{version}.bin")
+    
+    def versions(self):
+        """Registered version names, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        
+        numbered = []
+        for filename in os.listdir(self.root):
+            match = VERSION_PATTERN.match(filename)
+            if match:
+                numbered.append((int(match.group(1)), filename[:-len(".bin")]))
+        return [version for _, version in sorted(numbered)]
+    
+    def list_versions(self):
+        """Describe every registered version"""
+        current = self.current_version()
+        models = []
+        for version in self.versions():
+            if os.path.getsize(self.artifact_path(version)) == 0:
+                # Claimed by a registration that is still writing it
+                continue
+            header, _ = model_artifact.read_header(self.artifact_path(version))
+            models.append({
+                "version": version,
+                "current": version == current,
+                "metadata": header["metadata"]
+            })
+        return models
+    
+    def current_version(self):
+        """Version named by the CURRENT pointer, or None if nothing was promoted"""
+        try:
+            with open(self.pointer_path, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def _reserve_version(self):
+        """Claim the next free version number by creating its artifact file exclusively"""
+        while True:
+            versions = self.versions()
+            last = int(versions[-1][1:]) if versions else 0
+            version = f"v{last + 1:04d}"
+            try:
+                os.close(os.open(self.artifact_path(version), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                # Another registration took this number first
+                continue
+            return version
+    
+    def register(self, source_path, metadata=None, promote=False):
+        """
+        Copy an artifact into the registry under the next version number
+        
+        Args:
+            source_path: artifact file to register
+            metadata: extra metadata merged into the artifact header
+            promote: also make it the current version
+        
+        Returns:
+            str: the new version name
+        """
+        os.makedirs(self.root, exist_ok=True)
+        arrays, header = model_artifact.load_artifact(source_path)
+        
+        version = self._reserve_version()
+        try:
+            model_artifact.save_artifact(
+                self.artifact_path(version),
+                coef=arrays["coef"],
+                intercept=arrays["intercept"][0],
+                feature_names=header["feature_names"],
+                scaler_mean=arrays["scaler_mean"],
+                scaler_scale=arrays["scaler_scale"],
+                metadata={**header["metadata"], **(metadata or {}), "version": version}
+            )
+        except BaseException:
+            os.remove(self.artifact_path(version))
+            raise
+        
+        if promote:
+            self.promote(version)
+        return version
+    
+    def _check_registered(self, version):
+        """
+        Make sure a version's artifact is complete before it is loaded or promoted
+        
+        Raises:
+            KeyError: if the version does not exist or is still being written
+            model_artifact.ArtifactError: if its header is not a valid artifact header
+        """
+        path = self.artifact_path(version)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            raise KeyError(f"Model version {version} is not registered")
+        model_artifact.read_header(path)
+    
+    def promote(self, version):
+        """Atomically point CURRENT at a registered version"""
+        self._check_registered(version)
+        
+        tmp_path = model_artifact.temp_path(self.pointer_path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pointer_path)
+    
+    def load_version(self, version, dtype=None):
+        """Create a predictor serving a registered version"""
+        self._check_registered(version)
+        
+        kwargs = {"dtype": dtype} if dtype is not None else {}
+        return HeartDiseasePredictor(model_path=self.artifact_path(version), **kwargs)
+    
+    def load_current(self, dtype=None):
+        """
+        Create a predictor for the current version
+        
+        An empty registry is bootstrapped from the default model artifact
+        (converted or trained by HeartDiseasePredictor if needed).
+        """
+        version = self.current_version()
+        if version is None:
+            bootstrap = HeartDiseasePredictor()
+            version = self.register(bootstrap.model_path, metadata={"source": bootstrap.model_path}, promote=True)
+        return self.load_version(version, dtype=dtype)
+
+def train_and_register(root=None, promote=False):
+    """
+    Train a fresh model from heart_disease_data.csv and register it
+    
+    Module-level so it can run in a worker process.
+    
+    Returns:
+        str: the new version name
+    """
+    registry = ModelRegistry(root)
+    os.makedirs(registry.root, exist_ok=True)
+    
+    # load=False: the predictor would otherwise load (or train) the default model first
+    trainer = HeartDiseasePredictor(load=False)
+    trainer.train_model()
+    staging_path = model_artifact.temp_path(os.path.join(registry.root, "staging.bin"))
+    try:
+        trainer.save_artifact(staging_path, metadata={"source": "train_model"})
+        return registry.register(staging_path, promote=promote)
+    finally:
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+
+def main():
+    """Command line entry point: list, register and promote model versions"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Heart disease model registry")
+    parser.add_argument("--root", default=REGISTRY_DIR, help="registry directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    subparsers.add_parser("list", help="List registered versions")
+    
+    register = subparsers.add_parser("register", help="Register an artifact file")
+    register.add_argument("artifact_path")
+    register.add_argument("--promote", action="store_true", help="make it the current version")
+    
+    promote = subparsers.add_parser("promote", help="Make a version current")
+    promote.add_argument("version")
+    
+    args = parser.parse_args()
+    registry = ModelRegistry(args.root)
+    
+    if args.command == "list":
+        for model in registry.list_versions():
+            marker = "*" if model["current"] else " "
+            print(f"{marker} {model['version']}  {model['metadata'].get('created_at', '')}  {model['metadata'].get('source', '')}")
+    elif args.command == "register":
+        version = registry.register(args.artifact_path, promote=args.promote)
+        print(f"✅ Registered {args.artifact_path} as {version}")
+    else:
+        registry.promote(args.version)
+        print(f"✅ Promoted {args.version}")
+
+if __name__ == "__main__":
+    main()
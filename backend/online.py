@@ -0,0 +1,176 @@
+"""
+Online model updates from confirmed prediction outcomes
+
+Confirmed (record, outcome) pairs are buffered into mini-batches and fed to
+HeartDiseasePredictor.partial_fit. Every checkpoint_every mini-batches the
+updated weights are written as a new artifact and registered. Checkpoints
+are only promoted automatically with ONLINE_AUTO_PROMOTE=1; otherwise an
+admin reviews and promotes them, and updates keep building on the latest
+checkpoint until a different version is promoted.
+"""
+
+import os
+import threading
+
+from . import model_artifact
+from .ml_model import clinical_row
+
+ONLINE_BATCH_SIZE = int(os.getenv("ONLINE_BATCH_SIZE", "32"))
+ONLINE_CHECKPOINT_EVERY = int(os.getenv("ONLINE_CHECKPOINT_EVERY", "10"))
+ONLINE_AUTO_PROMOTE = os.getenv("ONLINE_AUTO_PROMOTE", "0") == "1"
+
+def iter_minibatches(confirmed, batch_size=ONLINE_BATCH_SIZE):
+    """
+    Group (record, outcome) pairs into mini-batches without materializing the input
+    
+    Args:
+        confirmed: iterable of (record, outcome), e.g. a database cursor
+        batch_size: pairs per mini-batch; the last one may be smaller
+    
+    Yields:
+        tuple: (records, outcomes) lists
+    """
+    records, outcomes = [], []
+    for record, outcome in confirmed:
+        records.append(record)
+        outcomes.append(outcome)
+        if len(records) >= batch_size:
+            yield records, outcomes
+            records, outcomes = [], []
+    if records:
+        yield records, outcomes
+
+class OnlineLearner:
+    def __init__(self, registry, batch_size=ONLINE_BATCH_SIZE, checkpoint_every=ONLINE_CHECKPOINT_EVERY,
+                 promote=ONLINE_AUTO_PROMOTE):
+        """
+        Args:
+            registry: ModelRegistry that checkpoints are registered in
+            batch_size: confirmed outcomes per partial_fit call
+            checkpoint_every: mini-batches between checkpoints (0 disables them)
+            promote: also promote every checkpoint to the current version
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        self.registry = registry
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.promote = promote
+        self.predictor = None
+        # Registry version current when the learner last (re)based its updates
+        self.following = None
+        self._pending = []
+        # add() runs on threads off the event loop; partial_fit must not interleave
+        self._lock = threading.Lock()
+        self.batches_since_checkpoint = 0
+        self.total_batches = 0
+        self.checkpoints = 0
+    
+    def _base_predictor(self):
+        """
+        Predictor being updated, following the registry's current version
+        
+        If another version was promoted (e.g. a full retrain) since the
+        learner based its updates on the current one, updates continue from
+        that version instead; unpromoted checkpoints of its own are kept.
+        """
+        current = self.registry.current_version()
+        if self.predictor is None or (current and current != self.following):
+            if self.predictor is not None and current == self.predictor.version:
+                # An admin promoted this learner's own checkpoint
+                self.following = current
+            else:
+                self.predictor = self.registry.load_current()
+                self.following = self.predictor.version
+                self.batches_since_checkpoint = 0
+        return self.predictor
+    
+    def add(self, record, outcome):
+        """
+        Buffer one confirmed outcome, updating the model once a mini-batch is full
+        
+        Returns:
+            str: newly promoted version if this call wrote a checkpoint, else None
+        
+        Raises:
+            ValueError: if the record's clinical parameters cannot be used
+        """
+        row = clinical_row(record)
+        with self._lock:
+            self._pending.append((row, int(outcome)))
+            if len(self._pending) < self.batch_size:
+                return None
+            
+            batch, self._pending = self._pending, []
+            return self._update([row for row, _ in batch], [outcome for _, outcome in batch])
+    
+    def consume(self, confirmed):
+        """
+        Stream (record, outcome) pairs through partial_fit in mini-batches
+        
+        Used to catch up on a backlog of confirmed predictions; a trailing
+        partial mini-batch is applied as well, and a checkpoint is always
+        written at the end.
+        
+        Returns:
+            str: version of the final checkpoint, or None if nothing was consumed
+        """
+        updated = False
+        with self._lock:
+            for records, outcomes in iter_minibatches(confirmed, self.batch_size):
+                self._update(records, outcomes)
+                updated = True
+            if updated and self.batches_since_checkpoint:
+                return self.checkpoint()
+        return self.predictor.version if updated else None
+    
+    def _update(self, records, outcomes):
+        """Apply one mini-batch and checkpoint if it is due"""
+        self._base_predictor().partial_fit(records, outcomes)
+        self.batches_since_checkpoint += 1
+        self.total_batches += 1
+        
+        if self.checkpoint_every and self.batches_since_checkpoint >= self.checkpoint_every:
+            return self.checkpoint()
+        return None
+    
+    def checkpoint(self):
+        """
+        Register the updated weights as a new model version, promoting it if self.promote
+        
+        Returns:
+            str: the new version name
+        """
+        os.makedirs(self.registry.root, exist_ok=True)
+        staging_path = model_artifact.temp_path(os.path.join(self.registry.root, "online.bin"))
+        try:
+            self.predictor.save_artifact(staging_path, metadata={
+                "source": "online",
+                "base_version": self.predictor.version
+            })
+            version = self.registry.register(staging_path, promote=self.promote)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+        
+        # Keep updating the same SGD state, now saved as this version
+        self.predictor.version = version
+        if self.promote:
+            self.following = version
+        self.batches_since_checkpoint = 0
+        self.checkpoints += 1
+        return version
+    
+    def metrics(self):
+        """Buffered outcomes and update counters"""
+        return {
+            "pending": len(self._pending),
+            "batch_size": self.batch_size,
+            "checkpoint_every": self.checkpoint_every,
+            "promote": self.promote,
+            "total_batches": self.total_batches,
+            "checkpoints": self.checkpoints,
+            "samples_seen": self.predictor.samples_seen if self.predictor is not None else 0,
+            "base_version": self.predictor.version if self.predictor is not None else None
+        }
@@ -0,0 +1,104 @@
+"""
+Content-addressed cache of prediction results
+
+Keys are a digest of the canonical 13-feature vector plus the model version,
+so re-submitting the same clinical values (54 vs 54.0 included) is a hit and
+a newly promoted model never serves stale scores. Entries are evicted in LRU
+order once max_size is reached and expire after ttl_seconds (or a shorter
+per-entry TTL). The same structure backs the token and doctor caches in
+auth.py.
+"""
+
+import hashlib
+import os
+import struct
+import time
+from collections import OrderedDict
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+
+def make_key(features, model_version):
+    """
+    Canonical digest of a feature vector and model version
+    
+    Features are packed as little-endian doubles, so ints and floats with the
+    same value (and 0.0 / -0.0) produce the same key.
+    """
+    packed = struct.pack(f"<{len(features)}d", *(float(value) + 0.0 for value in features))
+    digest = hashlib.blake2b(packed, digest_size=16)
+    digest.update(str(model_version).encode("utf-8"))
+    return digest.digest()
+
+class PredictionCache:
+    def __init__(self, max_size=PREDICTION_CACHE_SIZE, ttl_seconds=PREDICTION_CACHE_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.clock = clock
+        # key -> (expires_at, value), least recently used first
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key):
+        """Return the cached value, or None on a miss or expired entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value, ttl_seconds=None):
+        """
+        Store a value, evicting the least recently used entries beyond max_size
+        
+        Args:
+            ttl_seconds: lifetime of this entry if shorter than the cache's TTL
+        """
+        if self.max_size <= 0:
+            return
+        
+        ttl = self.ttl if ttl_seconds is None else min(ttl_seconds, self.ttl)
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def discard(self, key):
+        """Drop one entry if present"""
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+    
+    def clear(self):
+        """Drop every entry, e.g. after a model reload"""
+        self._entries.clear()
+        self.invalidations += 1
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def metrics(self):
+        """Size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,333 @@
+"""
+Sliding-window login limiter
+
+Login attempts are counted per client IP and per account before any
+password is hashed, so a brute-force run is turned away with a 429 instead
+of burning bcrypt CPU. This covers deployments without the nginx front end
+(start.py, the Docker image alone), whose limit_req zone is otherwise the
+only throttle.
+
+Each key keeps a sliding-window counter: the number of attempts in the
+current fixed window and in the previous one, with the previous count
+weighted by how much of it still overlaps the sliding window. That is
+three integers per key whatever the limit, instead of a timestamp per
+attempt. Keys are stored as 16-byte digests, so the store never holds
+emails or addresses.
+
+MemoryWindowStore keeps the counters in an LRU dict capped at max_keys that
+drops expired keys as it goes; SQLiteWindowStore keeps them in a table that
+every worker process on the host can share. Its transactions can wait on
+another worker's write lock, so the API calls the limiter through the
+*_async methods, which run them on the store's own thread.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+from .storage import connect_sqlite
+
+LOGIN_LIMIT_STORE = os.getenv("LOGIN_LIMIT_STORE", "memory")
+LOGIN_LIMIT_SQLITE_PATH = os.getenv("LOGIN_LIMIT_SQLITE_PATH", "login_limits.db")
+LOGIN_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_LIMIT_MAX_KEYS", "100000"))
+# Attempts per client IP, and failed attempts per account, allowed per window (0 disables)
+LOGIN_IP_LIMIT = int(os.getenv("LOGIN_IP_LIMIT", "10"))
+LOGIN_IP_WINDOW = float(os.getenv("LOGIN_IP_WINDOW", "60"))
+LOGIN_ACCOUNT_LIMIT = int(os.getenv("LOGIN_ACCOUNT_LIMIT", "5"))
+LOGIN_ACCOUNT_WINDOW = float(os.getenv("LOGIN_ACCOUNT_WINDOW", "900"))
+# Behind nginx every request comes from the proxy; use the X-Real-IP it sets instead
+LOGIN_TRUST_PROXY = os.getenv("LOGIN_TRUST_PROXY", "0") == "1"
+
+# Stores write expired keys out at most once per this many updates
+PURGE_EVERY = 1000
+
+class RateLimited(Exception):
+    """Raised when a key has used up its window; the API answers 429"""
+    
+    def __init__(self, retry_after):
+        super().__init__(f"Too many attempts, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+def limit_key(scope, value):
+    """Compact store key for a value in a scope ("ip", "account")"""
+    return hashlib.blake2b(f"{scope}:{value}".encode("utf-8"), digest_size=16).digest()
+
+def account_key(email):
+    """Store key for an account; emails differing only in case share one"""
+    return limit_key("account", str(email).lower())
+
+def roll(state, window, now):
+    """
+    Counter state moved forward to the window containing now
+    
+    Args:
+        state: (window index, previous count, current count), or None for a new key
+    """
+    index = int(now // window)
+    if state is None:
+        return index, 0, 0
+    stored_index, previous, current = state
+    if stored_index == index:
+        return state
+    if stored_index == index - 1:
+        return index, current, 0
+    return index, 0, 0
+
+def estimate(state, window, now):
+    """Attempts in the sliding window ending at now"""
+    index, previous, current = state
+    overlap = 1 - (now / window - index)
+    return previous * overlap + current
+
+def retry_after(state, window, now, limit):
+    """Seconds until one more attempt fits under limit"""
+    index, previous, current = state
+    elapsed = now / window - index
+    if current < limit:
+        # The previous window's weight has to fall to what the current one leaves
+        needed = 1 - (limit - 1 - current) / previous if previous else 0
+        return max(needed - elapsed, 0) * window
+    # Wait for the next window, where the current count becomes the previous one
+    return (1 - elapsed + max(1 - (limit - 1) / current, 0)) * window
+
+class WindowStore:
+    """Sliding-window counters; subclasses keep the (index, previous, current) states"""
+    
+    # Thread that blocking stores run their updates on; None runs them in the caller
+    executor = None
+    
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.allowed = 0
+        self.rejected = 0
+    
+    def acquire(self, key, limit, window):
+        """
+        Count an attempt if it fits under limit
+        
+        Returns:
+            float: 0 if the attempt was counted, else seconds until one would fit
+        """
+        if limit <= 0:
+            return 0
+        now = self.clock()
+        with self._transaction():
+            state = roll(self._load(key), window, now)
+            if estimate(state, window, now) + 1 > limit:
+                self.rejected += 1
+                return retry_after(state, window, now, limit)
+            index, previous, current = state
+            self._save(key, (index, previous, current + 1), window)
+        self.allowed += 1
+        return 0
+    
+    def release(self, key, window):
+        """Uncount an attempt acquired earlier, e.g. one that succeeded"""
+        now = self.clock()
+        with self._transaction():
+            state = self._load(key)
+            if state is None:
+                return
+            index, previous, current = roll(state, window, now)
+            if current:
+                current -= 1
+            elif previous:
+                previous -= 1
+            self._save(key, (index, previous, current), window)
+    
+    def reset(self, key):
+        """Forget every attempt of key"""
+        with self._transaction():
+            self._delete(key)
+    
+    def _transaction(self):
+        return nullcontext()
+    
+    def metrics(self):
+        return {"keys": len(self), "allowed": self.allowed, "rejected": self.rejected}
+
+class MemoryWindowStore(WindowStore):
+    def __init__(self, max_keys=LOGIN_LIMIT_MAX_KEYS, clock=time.time):
+        super().__init__(clock)
+        self.max_keys = max_keys
+        # key -> (expires_at, state), least recently updated first
+        self._entries = OrderedDict()
+        self.evictions = 0
+    
+    def _load(self, key):
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+    
+    def _save(self, key, state, window):
+        # A state counts nothing once two windows have passed since it was written
+        self._entries[key] = ((state[0] + 2) * window, state)
+        self._entries.move_to_end(key)
+        now = self.clock()
+        while self._entries:
+            oldest, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_keys:
+                break
+            if expires_at > now:
+                # Full of live keys: the least recently updated one is forgotten
+                self.evictions += 1
+            del self._entries[oldest]
+    
+    def _delete(self, key):
+        self._entries.pop(key, None)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def metrics(self):
+        return {**super().metrics(), "max_keys": self.max_keys, "evictions": self.evictions}
+
+class SQLiteWindowStore(WindowStore):
+    """
+    Counters in a SQLite table, shared by every process that opens the file
+    
+    Each update is a read-modify-write inside BEGIN IMMEDIATE, so concurrent
+    workers serialise on the write lock and never lose a count. With WAL and
+    synchronous=NORMAL a transaction costs tens of microseconds.
+    """
+    
+    def __init__(self, path=LOGIN_LIMIT_SQLITE_PATH, clock=time.time):
+        super().__init__(clock)
+        self.connection = connect_sqlite(path)
+        # Transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection.isolation_level = None
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS login_limits (key BLOB PRIMARY KEY, window_index INTEGER NOT NULL, "
+            "previous INTEGER NOT NULL, current INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS login_limits_expires_at ON login_limits (expires_at)")
+        self._writes = 0
+        # One thread, so transactions on the shared connection never overlap
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="login-limits")
+    
+    @contextmanager
+    def _transaction(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+    
+    def _load(self, key):
+        row = self.connection.execute(
+            "SELECT window_index, previous, current FROM login_limits WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else tuple(row)
+    
+    def _save(self, key, state, window):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO login_limits VALUES (?, ?, ?, ?, ?)", (key, *state, (state[0] + 2) * window)
+        )
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.connection.execute("DELETE FROM login_limits WHERE expires_at <= ?", (self.clock(),))
+    
+    def _delete(self, key):
+        self.connection.execute("DELETE FROM login_limits WHERE key = ?", (key,))
+    
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM login_limits").fetchone()[0]
+    
+    def close(self):
+        self.executor.submit(self.connection.close).result()
+        self.executor.shutdown()
+
+class LoginLimiter:
+    def __init__(self, store, ip_limit=LOGIN_IP_LIMIT, ip_window=LOGIN_IP_WINDOW,
+                 account_limit=LOGIN_ACCOUNT_LIMIT, account_window=LOGIN_ACCOUNT_WINDOW):
+        """
+        Args:
+            store: a WindowStore shared by both limits
+            ip_limit: attempts per client IP per ip_window seconds
+            account_limit: failed attempts per account per account_window seconds
+        """
+        self.store = store
+        self.ip_limit = ip_limit
+        self.ip_window = ip_window
+        self.account_limit = account_limit
+        self.account_window = account_window
+    
+    def acquire(self, ip, email):
+        """
+        Reserve an attempt for this IP and account before checking the password
+        
+        The reservation stays counted if the password is wrong; succeeded()
+        or release() give it back.
+        
+        Raises:
+            RateLimited: if either limit is used up (nothing is counted then)
+        """
+        ip_key = limit_key("ip", ip)
+        wait = self.store.acquire(ip_key, self.ip_limit, self.ip_window)
+        if wait:
+            raise RateLimited(wait)
+        wait = self.store.acquire(account_key(email), self.account_limit, self.account_window)
+        if wait:
+            self.store.release(ip_key, self.ip_window)
+            raise RateLimited(wait)
+    
+    def release(self, ip, email):
+        """Give back a reservation whose password was never checked"""
+        self.store.release(limit_key("ip", ip), self.ip_window)
+        self.store.release(account_key(email), self.account_window)
+    
+    def succeeded(self, ip, email):
+        """Give back the IP's attempt and clear the account's failures"""
+        self.store.release(limit_key("ip", ip), self.ip_window)
+        self.store.reset(account_key(email))
+    
+    async def _off_loop(self, method, *args):
+        """Call method on the store's thread, or directly if the store does no I/O"""
+        if self.store.executor is None:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.store.executor, method, *args)
+    
+    async def acquire_async(self, ip, email):
+        """acquire() without blocking the event loop"""
+        await self._off_loop(self.acquire, ip, email)
+    
+    async def release_async(self, ip, email):
+        """release() without blocking the event loop"""
+        await self._off_loop(self.release, ip, email)
+    
+    async def succeeded_async(self, ip, email):
+        """succeeded() without blocking the event loop"""
+        await self._off_loop(self.succeeded, ip, email)
+    
+    def metrics(self):
+        return {
+            "ip_limit": self.ip_limit,
+            "ip_window": self.ip_window,
+            "account_limit": self.account_limit,
+            "account_window": self.account_window,
+            **self.store.metrics()
+        }
+
+def client_address(request):
+    """Client IP of a request, from X-Real-IP when LOGIN_TRUST_PROXY is set"""
+    if LOGIN_TRUST_PROXY and request.headers.get("x-real-ip"):
+        return request.headers["x-real-ip"]
+    return request.client.host if request.client else "unknown"
+
+def open_login_limiter(store=LOGIN_LIMIT_STORE, sqlite_path=LOGIN_LIMIT_SQLITE_PATH):
+    """
+    Create the login limiter on the store named by LOGIN_LIMIT_STORE
+    
+    Args:
+        store: "memory" (per process) or "sqlite" (shared by the workers on a host)
+    """
+    if store == "memory":
+        return LoginLimiter(MemoryWindowStore())
+    if store == "sqlite":
+        return LoginLimiter(SQLiteWindowStore(sqlite_path))
+    raise ValueError(f"Unknown login limit store: {store}")
@@ -0,0 +1,246 @@
+"""
+Indexed in-memory record store
+
+Replaces plain lists for the development/in-memory mode. Records live in a
+primary-key dict, secondary indexes map a field value to the ids holding it,
+and ids come from a monotonic counter, so deleting a record never causes an
+id to be handed out twice. Lookups by id or by an indexed field cost O(1) and
+O(k) respectively, independent of how many records are stored.
+
+Sorted indexes keep (value, id) keys in a sorted list for keyset
+pagination: a page after a cursor is one binary search plus a slice.
+Values are compared as text, like the SQLite engine's TEXT columns, so a
+field holding numbers in some records and strings in others still sorts.
+
+Observers (e.g. the dashboard counters in stats.py) are told about every
+insert and delete, so aggregates stay current without rescanning.
+
+Not thread-safe: the API mutates repositories only from the event loop.
+"""
+
+import bisect
+
+def id_key(record_id):
+    """Ids order numerically when numeric ("9" before "10"), after that as strings"""
+    return (0, int(record_id), "") if record_id.isdigit() else (1, 0, record_id)
+
+def sort_key(field, value, record_id):
+    """Position of a record in the sorted index on field; missing values sort first"""
+    if field == "id":
+        return (id_key(record_id),)
+    return ("" if value is None else str(value), id_key(record_id))
+
+class SortedIndex:
+    """
+    Sorted list of sort_key() tuples
+    
+    Inserts and removals shift the list (a memmove, fast up to millions of
+    entries); values that only grow, like ids and created_at, append.
+    """
+    
+    def __init__(self, field):
+        self.field = field
+        self.keys = []
+    
+    def key(self, record):
+        return sort_key(self.field, record.get(self.field), record["id"])
+    
+    def add(self, record):
+        bisect.insort(self.keys, self.key(record))
+    
+    def remove(self, record):
+        key = self.key(record)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+
+class Repository:
+    def __init__(self, indexes=(), sorted_fields=()):
+        """
+        Args:
+            indexes: record fields to maintain secondary indexes for, e.g. ("patient_id",)
+            sorted_fields: fields pages can be ordered by, e.g. ("id", "created_at")
+        """
+        # id -> record, in insertion order
+        self._records = {}
+        # field -> value -> {id: None}; a dict keeps insertion order and O(1) removal
+        self._indexes = {field: {} for field in indexes}
+        # field -> SortedIndex; ids are keys in it, records are looked up in _records
+        self._sorted = {field: SortedIndex(field) for field in sorted_fields}
+        self.next_id = 1
+        # Objects with added(record) and removed(record) methods
+        self._observers = []
+    
+    def observe(self, observer):
+        """Notify observer of every record added or removed from now on"""
+        self._observers.append(observer)
+    
+    def allocate_id(self):
+        """Reserve the next id"""
+        record_id = str(self.next_id)
+        self.next_id += 1
+        return record_id
+    
+    def insert(self, record):
+        """
+        Store a record, assigning record["id"] if it has none
+        
+        A record that brings its own numeric id (e.g. one restored from storage)
+        moves the allocator past it.
+        
+        Returns:
+            dict: the stored record
+        """
+        self._check_indexable(record)
+        record_id = record.get("id")
+        if record_id is None:
+            record_id = record["id"] = self.allocate_id()
+        else:
+            record_id = record["id"] = str(record_id)
+            if record_id.isdigit():
+                self.next_id = max(self.next_id, int(record_id) + 1)
+        if record_id in self._records:
+            raise KeyError(f"Duplicate id: {record_id}")
+        
+        for field, index in self._indexes.items():
+            if field in record:
+                index.setdefault(record[field], {})[record_id] = None
+        for index in self._sorted.values():
+            index.add(record)
+        self._records[record_id] = record
+        for observer in self._observers:
+            observer.added(record)
+        return record
+    
+    def get(self, record_id):
+        """Record with this id, or None"""
+        return self._records.get(record_id)
+    
+    def update(self, record_id, changes):
+        """
+        Apply field changes to a stored record, keeping indexes in sync
+        
+        The stored dict is replaced, not mutated, so a record handed out
+        earlier (e.g. to a snapshot being written) never changes under it.
+        
+        Returns:
+            dict: the updated record, or None if the id is unknown
+        """
+        record = self._records.get(record_id)
+        if record is None:
+            return None
+        self._check_indexable(changes)
+        
+        for observer in self._observers:
+            observer.removed(record)
+        for field, index in self._indexes.items():
+            if field in changes and record.get(field) != changes[field]:
+                self._unindex(index, record, field, record_id)
+                index.setdefault(changes[field], {})[record_id] = None
+        updated = {**record, **changes}
+        for field, index in self._sorted.items():
+            if record.get(field) != updated.get(field):
+                index.remove(record)
+                index.add(updated)
+        record = self._records[record_id] = updated
+        for observer in self._observers:
+            observer.added(record)
+        return record
+    
+    def delete(self, record_id):
+        """
+        Remove a record; its id is never reused
+        
+        Returns:
+            dict: the removed record, or None if the id is unknown
+        """
+        record = self._records.pop(record_id, None)
+        if record is not None:
+            for field, index in self._indexes.items():
+                self._unindex(index, record, field, record_id)
+            for index in self._sorted.values():
+                index.remove(record)
+            for observer in self._observers:
+                observer.removed(record)
+        return record
+    
+    def _check_indexable(self, values):
+        """
+        Fail before anything is changed, so a rejected record never ends up half-indexed
+        
+        Raises:
+            TypeError: if an indexed field holds an unhashable value (a list or dict)
+        """
+        for field in self._indexes:
+            if field in values:
+                try:
+                    hash(values[field])
+                except TypeError:
+                    raise TypeError(f"{field} must be a string or number, not {type(values[field]).__name__}")
+    
+    @staticmethod
+    def _unindex(index, record, field, record_id):
+        if field not in record:
+            return
+        ids = index.get(record[field])
+        if ids is not None:
+            ids.pop(record_id, None)
+            if not ids:
+                del index[record[field]]
+    
+    def find_by(self, field, value):
+        """Records whose indexed field equals value, in the order they were indexed"""
+        ids = self._indexes[field].get(value, ())
+        return [self._records[record_id] for record_id in ids]
+    
+    def count_by(self, field, value):
+        """Number of records whose indexed field equals value"""
+        return len(self._indexes[field].get(value, ()))
+    
+    def page(self, field, limit, after=None, descending=False):
+        """
+        Up to limit records ordered by field (then id), strictly after a cursor
+        
+        Args:
+            field: one of sorted_fields
+            after: (value, id) of the last record of the previous page
+            descending: walk the order backwards
+        
+        Returns:
+            list: the records of the page
+        """
+        keys = self._sorted[field].keys
+        if descending:
+            end = bisect.bisect_left(keys, sort_key(field, *after)) if after else len(keys)
+            selected = keys[max(end - limit, 0):end][::-1]
+        else:
+            start = bisect.bisect_right(keys, sort_key(field, *after)) if after else 0
+            selected = keys[start:start + limit]
+        return [self._records[self._id(key)] for key in selected]
+    
+    @staticmethod
+    def _id(key):
+        """The record id inside a sort_key() tuple"""
+        _, number, text = key[-1]
+        return text or str(number)
+    
+    def all(self):
+        """Every record, in insertion order"""
+        return list(self._records.values())
+    
+    def clear(self):
+        """Drop every record; ids keep increasing"""
+        for record in self._records.values():
+            for observer in self._observers:
+                observer.removed(record)
+        self._records.clear()
+        for index in self._indexes.values():
+            index.clear()
+        for index in self._sorted.values():
+            index.keys.clear()
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __iter__(self):
+        return iter(self._records.values())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Preload-and-fork server for multi-worker deployments
+
+`uvicorn --workers N` starts N fresh interpreters, and each of them
+imports NumPy, SciPy, pandas and FastAPI and loads the model again. Memory
+grows by a full copy per worker and the cold start repeats N times. This
+entry point does that work once, in a master process, and then forks the
+workers. They share the master's pages copy-on-write, so the model
+weights, compiled modules and warmed code paths are only paid for once.
+
+The master only preloads libraries and the model. backend.main, which
+opens the storage engine and login limiter (SQLite connections must not
+cross a fork), is imported by each worker after the fork. The master keeps
+the listening socket, replaces workers that die and forwards SIGINT and
+SIGTERM to them.
+
+Run from the project root:
+    python -m backend.server
+    python -m backend.server --workers 4 --port 8000
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Everything backend.main imports that holds no connection, file or thread
+PRELOAD_MODULES = (
+    "numpy", "pandas", "scipy.special", "fastapi", "fastapi.middleware.cors", "fastapi.staticfiles",
+    "uvicorn", "uvicorn.protocols.http.h11_impl", "uvicorn.lifespan.on",
+    "backend.auth", "backend.batching", "backend.dataset", "backend.executor", "backend.ml_model",
+    "backend.model_registry", "backend.online", "backend.prediction_cache", "backend.rate_limit",
+    "backend.stats", "backend.storage"
+)
+# One row through the model warms NumPy's and SciPy's first-call paths
+WARMUP_ROW = [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]
+
+def preload():
+    """
+    Import the app's dependencies and load the served model in this process
+    
+    Returns:
+        HeartDiseasePredictor: the current registry version, or None in heuristic mode
+    """
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    if os.getenv("PREDICTION_MODE", "model") == "heuristic":
+        return None
+    
+    from .model_registry import ModelRegistry
+    predictor = ModelRegistry().load_current()
+    predictor.predict_batch([WARMUP_ROW])
+    return predictor
+
+def check_worker_safety(workers):
+    """
+    Refuse configurations that break with several workers and warn about per-worker state
+    
+    Every worker keeps its own dashboard counters, auth caches and online
+    learning buffer, whatever the storage engine: only the stores (SQLite,
+    Mongo) and LOGIN_LIMIT_STORE=sqlite are shared.
+    
+    Returns:
+        list: the warnings printed
+    """
+    from .rate_limit import LOGIN_LIMIT_STORE
+    from .storage import STORAGE_BACKEND
+    from .wal import MEMORY_DATA_DIR
+    
+    if workers <= 1:
+        return []
+    if STORAGE_BACKEND == "memory" and MEMORY_DATA_DIR:
+        raise SystemExit(
+            "❌ Workers would replay and append to the same write-ahead log: use STORAGE_BACKEND=sqlite "
+            "or mongo, or MEMORY_DATA_DIR= for a volatile store per worker"
+        )
+    warnings = []
+    if STORAGE_BACKEND == "memory":
+        warnings.append("Each worker keeps its own in-memory store")
+    else:
+        warnings.append("Dashboard counters and the predictions timeline are per worker: each counts the "
+                        "predictions stored at its startup plus the ones it created itself")
+    warnings.append("Auth caches are per worker: a doctor deactivated or changed through one worker stays "
+                    "cached in the others for up to DOCTOR_CACHE_TTL and TOKEN_CACHE_TTL seconds")
+    warnings.append("Online learning buffers confirmed outcomes per worker; each checkpoints its own mini-batches")
+    if LOGIN_LIMIT_STORE == "memory":
+        warnings.append("Login limits are counted per worker; LOGIN_LIMIT_STORE=sqlite shares them")
+    for warning in warnings:
+        print(f"⚠️ {warning}")
+    return warnings
+
+def bind(host, port):
+    """Listening socket created in the master and inherited by every worker"""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    return sock
+
+def run_worker(sock, predictor, ready_fd, log_level):
+    """Body of a forked worker: import the app, adopt the preloaded model and serve"""
+    import uvicorn
+    
+    gc.enable()
+    from . import main
+    if predictor is not None:
+        main.predictor = predictor
+    
+    async def notify_ready():
+        os.write(ready_fd, b"%d\n" % os.getpid())
+    
+    # Replacement workers (ready_fd None) start after the master stopped waiting
+    if ready_fd is not None:
+        main.app.add_event_handler("startup", notify_ready)
+    config = uvicorn.Config(main.app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def fork_worker(sock, predictor, ready_fd, log_level):
+    """Start a worker process and return its pid"""
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        # Ctrl+C reaches only the master, which stops the workers with one SIGTERM
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        run_worker(sock, predictor, ready_fd, log_level)
+    except BaseException as e:
+        print(f"❌ Worker {os.getpid()} failed: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Never return into the master's code
+        os._exit(code)
+
+def process_memory(pid):
+    """
+    RSS, PSS and USS of a process in MB, from /proc/<pid>/smaps_rollup
+    
+    PSS splits every shared page between the processes mapping it, so the
+    PSS of all workers adds up to their real footprint. Returns None where
+    /proc is not available.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line and not line.startswith(" "))
+    except OSError:
+        return None
+    kb = {name: int(value.split()[0]) for name, value in fields.items() if value.strip().endswith("kB")}
+    return {
+        "rss": kb.get("Rss", 0) / 1024,
+        "pss": kb.get("Pss", 0) / 1024,
+        "uss": (kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)) / 1024
+    }
+
+def report_memory(pids):
+    """Print per-worker and total memory of the master and its workers"""
+    rows = [("master", os.getpid())] + [("worker", pid) for pid in pids]
+    usage = [(label, pid, process_memory(pid)) for label, pid in rows]
+    if any(memory is None for _, _, memory in usage):
+        return
+    print(f"📦 {'process':<8} {'pid':>8} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9}")
+    for label, pid, memory in usage:
+        print(f"📦 {label:<8} {pid:>8} {memory['rss']:>9.1f} {memory['pss']:>9.1f} {memory['uss']:>9.1f}")
+    print(f"📦 {'total':<8} {'':>8} {sum(m['rss'] for _, _, m in usage):>9.1f} "
+          f"{sum(m['pss'] for _, _, m in usage):>9.1f} {sum(m['uss'] for _, _, m in usage):>9.1f}")
+
+def wait_until_ready(ready_fd, workers):
+    """Block until every worker has started, or exit if one dies first"""
+    ready = 0
+    buffered = b""
+    while ready < workers:
+        readable, _, _ = select.select([ready_fd], [], [], 0.5)
+        if readable:
+            buffered += os.read(ready_fd, 4096)
+            *lines, buffered = buffered.split(b"\n")
+            ready += len(lines)
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            raise SystemExit(f"❌ Worker {pid} exited during startup (status {status})")
+
+def serve(host=HOST, port=PORT, workers=WORKERS, log_level="info"):
+    """Preload, fork `workers` workers and supervise them until SIGINT/SIGTERM"""
+    start = time.perf_counter()
+    check_worker_safety(workers)
+    # Objects created from here on are frozen before the fork, so the
+    # workers' collections never touch (and copy) the master's pages
+    gc.disable()
+    predictor = preload()
+    preloaded = time.perf_counter() - start
+    sock = bind(host, port)
+    ready_read, ready_write = os.pipe()
+    gc.freeze()
+    
+    children = {fork_worker(sock, predictor, ready_write, log_level) for _ in range(workers)}
+    stopping = False
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        wait_until_ready(ready_read, workers)
+    except SystemExit:
+        stop(None, None)
+        raise
+    finally:
+        os.close(ready_read)
+        os.close(ready_write)
+    print(f"✅ {workers} workers ready on http://{host}:{port} in {time.perf_counter() - start:.2f}s "
+          f"(preload {preloaded:.2f}s)")
+    report_memory(sorted(children))
+    sys.stdout.flush()
+    
+    while children:
+        try:
+            pid, status = os.waitpid(-1, 0)
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited (status {status}), starting a replacement")
+            children.add(fork_worker(sock, predictor, None, log_level))
+    sock.close()
+    print("✅ Server stopped")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="forked worker processes (default: WEB_CONCURRENCY)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.log_level)
+
+if __name__ == "__main__":
+    main()
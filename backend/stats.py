@@ -0,0 +1,154 @@
+"""
+Incrementally maintained prediction statistics
+
+PredictionStats observes the predictions repository and updates its counters
+on every insert and delete: totals, counts per risk level and histograms of
+prediction timestamps rolled up by UTC hour and by UTC day. Dashboard reads
+then cost O(1) (the rolling window sums a fixed number of day buckets)
+instead of a scan that parses every record's created_at, and timeline
+queries cost one lookup per bucket, whatever the number of predictions.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+RECENT_DAYS = 7
+GRANULARITIES = ("hour", "day", "week", "month")
+MAX_TIMELINE_BUCKETS = 10_000
+
+def parse_timestamp(value):
+    """created_at as a naive UTC datetime (ISO strings or datetime objects)"""
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def hour_ordinal(moment):
+    """Hours since 0001-01-01 00:00 for a naive UTC datetime"""
+    return moment.toordinal() * 24 + moment.hour
+
+def bucket_start(moment, granularity):
+    """Start of the hour/day/week (Monday)/month bucket containing moment"""
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = datetime(moment.year, moment.month, moment.day)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def next_bucket(start, granularity):
+    """Start of the bucket after the one beginning at start"""
+    if granularity == "hour":
+        return start + timedelta(hours=1)
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(weeks=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+class PredictionStats:
+    def __init__(self):
+        self.total = 0
+        self.by_risk = {}
+        # date.toordinal() -> number of predictions created that UTC day
+        self.daily = {}
+        # hour_ordinal() -> number of predictions created that UTC hour
+        self.hourly = {}
+    
+    def added(self, record):
+        """Count a new prediction"""
+        self._apply(record, 1)
+    
+    def removed(self, record):
+        """Uncount a deleted (or about to be updated) prediction"""
+        self._apply(record, -1)
+    
+    def _apply(self, record, delta):
+        self.total += delta
+        risk_level = record.get("risk_level")
+        if risk_level is not None:
+            self.by_risk[risk_level] = self.by_risk.get(risk_level, 0) + delta
+        
+        created_at = record.get("created_at")
+        if created_at is None:
+            return
+        moment = parse_timestamp(created_at)
+        self._bump(self.daily, moment.toordinal(), delta)
+        self._bump(self.hourly, hour_ordinal(moment), delta)
+    
+    @staticmethod
+    def _bump(buckets, key, delta):
+        count = buckets.get(key, 0) + delta
+        if count:
+            buckets[key] = count
+        else:
+            buckets.pop(key, None)
+    
+    def risk_count(self, risk_level):
+        """Predictions with this risk level"""
+        return self.by_risk.get(risk_level, 0)
+    
+    def recent(self, days=RECENT_DAYS, today=None):
+        """
+        Predictions created in the last `days` UTC days, today included
+        
+        Args:
+            today: date the window ends on (default: the current UTC date)
+        """
+        last = (today or datetime.utcnow().date()).toordinal()
+        return sum(self.daily.get(day, 0) for day in range(last - days + 1, last + 1))
+    
+    def count_between(self, first_hour, end_hour):
+        """
+        Predictions created in hours [first_hour, end_hour), as hour_ordinal() values
+        
+        Whole days are read from the daily rollup, so only the partial days
+        at either end touch hour buckets.
+        """
+        first_day = -(-first_hour // 24)
+        end_day = end_hour // 24
+        if first_day >= end_day:
+            return sum(self.hourly.get(hour, 0) for hour in range(first_hour, end_hour))
+        return (
+            sum(self.hourly.get(hour, 0) for hour in range(first_hour, first_day * 24))
+            + sum(self.daily.get(day, 0) for day in range(first_day, end_day))
+            + sum(self.hourly.get(hour, 0) for hour in range(end_day * 24, end_hour))
+        )
+    
+    def timeline(self, start, end, granularity="day"):
+        """
+        Prediction counts per bucket for created_at in [start, end)
+        
+        start and end are naive UTC datetimes, resolved to the hour (minutes
+        are truncated). Buckets are aligned to calendar hours, days, ISO weeks
+        (starting Monday) or months; the first and last bucket only count
+        the part that falls inside the range. Empty buckets are included.
+        
+        Args:
+            granularity: one of GRANULARITIES
+        
+        Returns:
+            list: [{"date": bucket start, "count": n}, ...] in chronological order
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        if end < start:
+            raise ValueError("end must not be before start")
+        
+        first_hour = hour_ordinal(start)
+        end_hour = hour_ordinal(end)
+        timeline = []
+        bucket = bucket_start(start, granularity)
+        while hour_ordinal(bucket) < end_hour:
+            if len(timeline) == MAX_TIMELINE_BUCKETS:
+                raise ValueError(f"Range spans more than {MAX_TIMELINE_BUCKETS} {granularity} buckets")
+            following = next_bucket(bucket, granularity)
+            count = self.count_between(max(hour_ordinal(bucket), first_hour), min(hour_ordinal(following), end_hour))
+            label = bucket.isoformat() if granularity == "hour" else bucket.date().isoformat()
+            timeline.append({"date": label, "count": count})
+            bucket = following
+        return timeline
@@ -0,0 +1,513 @@
+"""
+Pluggable record storage
+
+One interface for doctors, patients, predictions, files and audit logs, with
+three engines selected by STORAGE_BACKEND:
+
+    memory  indexed in-memory repositories (development, tests, load testing),
+            made durable by a write-ahead log and snapshots (wal.py) unless
+            MEMORY_DATA_DIR is empty
+    sqlite  a single SQLite file in WAL mode, for durable single-node sites
+    mongo   MongoDB through Motor (backend/database.py)
+
+Every collection exposes the same async methods (insert, insert_many, get,
+update, delete, find_by, count, all, page) and returns plain dicts whose "id"
+is a string. Observers (e.g. the dashboard counters) are notified of every added
+and removed record, whichever engine stores it.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from .repository import Repository
+from .wal import MEMORY_DATA_DIR, WriteAheadLog
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "heart_disease.db")
+
+# Collection -> fields looked up by equality, indexed by every engine
+COLLECTIONS = {
+    "doctors": ("email",),
+    "patients": ("email",),
+    "predictions": ("patient_id",),
+    "files": ("patient_id",),
+    "audit_logs": ("doctor_id", "patient_id")
+}
+# Collection -> fields page() can order by (always ending in the id as tie-break)
+SORT_FIELDS = {
+    "patients": ("id", "name", "created_at")
+}
+
+class Collection:
+    """Observer bookkeeping and page assembly shared by every engine"""
+    
+    def __init__(self, name, indexes):
+        self.name = name
+        self.indexes = indexes
+        self.sort_fields = SORT_FIELDS.get(name, ())
+        self._observers = []
+    
+    def observe(self, observer):
+        """Notify observer (added(record)/removed(record)) of every change from now on"""
+        self._observers.append(observer)
+    
+    def _added(self, record):
+        for observer in self._observers:
+            observer.added(record)
+    
+    def _removed(self, record):
+        for observer in self._observers:
+            observer.removed(record)
+    
+    async def page(self, limit, after=None, sort="id", descending=False, fields=None):
+        """
+        Keyset pagination: up to limit records ordered by (sort, id)
+        
+        Cost depends on limit, not on the collection size: every engine seeks
+        to the cursor in a sorted index instead of skipping rows.
+        
+        Args:
+            after: (sort value, id) cursor returned with the previous page
+            fields: field names to return (the id is always included), None for all
+        
+        Returns:
+            tuple: (records, cursor for the next page or None on the last page)
+        """
+        if sort not in self.sort_fields:
+            raise ValueError(f"{self.name} cannot be sorted by {sort!r}")
+        # One extra record tells whether another page follows. Engines that can
+        # project in the query (Mongo) fetch the requested fields plus the sort key.
+        needed = None if fields is None else [*fields, sort]
+        records = await self._page(sort, limit + 1, after, descending, needed)
+        cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            cursor = (records[-1].get(sort) if sort != "id" else None, records[-1]["id"])
+        if fields is not None:
+            records = [project(record, fields) for record in records]
+        return records, cursor
+
+def project(record, fields):
+    """The id and the listed fields of record"""
+    projected = {"id": record["id"]}
+    for field in fields:
+        if field in record:
+            projected[field] = record[field]
+    return projected
+
+class MemoryCollection(Collection):
+    def __init__(self, name, indexes):
+        super().__init__(name, indexes)
+        self.repository = Repository(indexes=indexes, sorted_fields=self.sort_fields)
+        # The repository already notifies on insert/update/delete
+        self.repository.observe(self)
+        # Set by Storage.connect() once the write-ahead log has been replayed
+        self.log = None
+    
+    def added(self, record):
+        self._added(record)
+    
+    def removed(self, record):
+        self._removed(record)
+    
+    async def _logged(self, record_id, record):
+        """Log a change and wait for it to be durable"""
+        if self.log is not None:
+            self.log.append(self.name, record_id, record)
+            await self.log.commit()
+    
+    async def insert(self, record):
+        record.pop("id", None)
+        self.repository.insert(record)
+        await self._logged(record["id"], record)
+        return record
+    
+    async def insert_many(self, records):
+        """Insert all records, acknowledged by a single fsync"""
+        for record in records:
+            record.pop("id", None)
+            self.repository.insert(record)
+            if self.log is not None:
+                self.log.append(self.name, record["id"], record)
+        if self.log is not None:
+            await self.log.commit()
+        return records
+    
+    async def get(self, record_id):
+        return self.repository.get(record_id)
+    
+    async def update(self, record_id, changes):
+        record = self.repository.update(record_id, changes)
+        if record is not None:
+            await self._logged(record_id, record)
+        return record
+    
+    async def delete(self, record_id):
+        record = self.repository.delete(record_id)
+        if record is not None:
+            await self._logged(record_id, None)
+        return record
+    
+    async def find_by(self, field, value):
+        return self.repository.find_by(field, value)
+    
+    async def count(self):
+        return len(self.repository)
+    
+    async def all(self):
+        return self.repository.all()
+    
+    async def _page(self, sort, limit, after, descending, fields):
+        return self.repository.page(sort, limit, after, descending)
+
+class SQLiteCollection(Collection):
+    """
+    One table per collection: an INTEGER PRIMARY KEY, a column per indexed
+    or sortable field (with a B-tree index) and the full record as JSON.
+    Sortable columns hold "" for missing values, so they order first as in
+    the memory engine.
+    
+    Statements are fixed strings with ? parameters, so sqlite3's statement
+    cache prepares each of them once per connection. AUTOINCREMENT keeps ids
+    of deleted records from being reused, as in the memory engine.
+    
+    Statements run on the connection's single-thread executor, never on the
+    event loop: a commit waiting on a WAL checkpoint or on another process's
+    write lock would otherwise stall every request. One thread also keeps
+    the connection's transactions in submission order, and each
+    read-modify-write (update, delete) runs as one job, so it stays atomic.
+    """
+    
+    def __init__(self, connection, name, indexes, executor):
+        super().__init__(name, indexes)
+        self.connection = connection
+        self.executor = executor
+        self.sort_columns = tuple(field for field in self.sort_fields if field != "id" and field not in indexes)
+        self.columns = tuple(indexes) + self.sort_columns
+        definitions = "".join(f", {field} TEXT" for field in self.columns)
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY AUTOINCREMENT{definitions}, data TEXT NOT NULL)")
+        # Tables created before a field became sortable get the column, filled from the JSON body
+        existing = {row[1] for row in connection.execute(f"PRAGMA table_info({name})")}
+        for field in self.columns:
+            if field not in existing:
+                connection.execute(f"ALTER TABLE {name} ADD COLUMN {field} TEXT")
+                connection.execute(f"UPDATE {name} SET {field} = COALESCE(json_extract(data, '$.{field}'), '')")
+        # An index on a column also holds the rowid, so it serves ORDER BY field, id
+        for field in self.columns:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {name}_{field} ON {name} ({field})")
+        connection.commit()
+        
+        placeholders = ", ".join("?" * (len(self.columns) + 1))
+        self._insert_sql = f"INSERT INTO {name} ({''.join(f'{field}, ' for field in self.columns)}data) VALUES ({placeholders})"
+        self._update_sql = f"UPDATE {name} SET {''.join(f'{field} = ?, ' for field in self.columns)}data = ? WHERE id = ?"
+        self._get_sql = f"SELECT id, data FROM {name} WHERE id = ?"
+        self._delete_sql = f"DELETE FROM {name} WHERE id = ?"
+        self._find_sql = {field: f"SELECT id, data FROM {name} WHERE {field} = ? ORDER BY id" for field in indexes}
+        self._count_sql = f"SELECT COUNT(*) FROM {name}"
+        self._all_sql = f"SELECT id, data FROM {name} ORDER BY id"
+        self._page_sql = {}
+        for field in self.sort_fields:
+            for descending, (compare, direction) in ((False, (">", "ASC")), (True, ("<", "DESC"))):
+                if field == "id":
+                    first = f"SELECT id, data FROM {name} ORDER BY id {direction} LIMIT ?"
+                    after = f"SELECT id, data FROM {name} WHERE id {compare} ? ORDER BY id {direction} LIMIT ?"
+                else:
+                    first = f"SELECT id, data FROM {name} ORDER BY {field} {direction}, id {direction} LIMIT ?"
+                    after = (f"SELECT id, data FROM {name} WHERE {field} {compare}= ? AND ({field} {compare} ? OR id {compare} ?) "
+                             f"ORDER BY {field} {direction}, id {direction} LIMIT ?")
+                self._page_sql[field, descending] = (first, after)
+    
+    def _row(self, record):
+        """Parameters for the indexed and sortable columns and the JSON body (without the id)"""
+        body = {key: value for key, value in record.items() if key != "id"}
+        values = [None if record.get(field) is None else str(record[field]) for field in self.indexes]
+        values.extend("" if record.get(field) is None else str(record[field]) for field in self.sort_columns)
+        values.append(json.dumps(body, default=str))
+        return values
+    
+    @staticmethod
+    def _record(row):
+        record = json.loads(row[1])
+        record["id"] = str(row[0])
+        return record
+    
+    @staticmethod
+    def _key(record_id):
+        """Integer primary key for an API id, or None if it cannot exist"""
+        try:
+            return int(record_id)
+        except (TypeError, ValueError):
+            return None
+    
+    async def _run(self, function, *args):
+        """Run function(*args) on the connection's thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+    
+    def _fetch(self, sql, parameters=()):
+        return [self._record(row) for row in self.connection.execute(sql, parameters)]
+    
+    def _count(self):
+        return self.connection.execute(self._count_sql).fetchone()[0]
+    
+    def _insert_rows(self, rows):
+        """Insert rows in one transaction, returning their ids"""
+        with self.connection:
+            return [str(self.connection.execute(self._insert_sql, row).lastrowid) for row in rows]
+    
+    def _update_row(self, record_id, changes):
+        """(record before, record after) the update, or None if it does not exist"""
+        key = self._key(record_id)
+        row = self.connection.execute(self._get_sql, (key,)).fetchone()
+        if row is None:
+            return None
+        
+        old = self._record(row)
+        record = {**old, **changes, "id": str(record_id)}
+        with self.connection:
+            self.connection.execute(self._update_sql, [*self._row(record), key])
+        return old, record
+    
+    def _delete_row(self, record_id):
+        """The deleted record, or None if it does not exist"""
+        key = self._key(record_id)
+        row = self.connection.execute(self._get_sql, (key,)).fetchone()
+        if row is None:
+            return None
+        
+        with self.connection:
+            self.connection.execute(self._delete_sql, (key,))
+        return self._record(row)
+    
+    async def insert(self, record):
+        record.pop("id", None)
+        (record["id"],) = await self._run(self._insert_rows, [self._row(record)])
+        self._added(record)
+        return record
+    
+    async def insert_many(self, records):
+        """Insert in a single transaction"""
+        for record in records:
+            record.pop("id", None)
+        ids = await self._run(self._insert_rows, [self._row(record) for record in records])
+        for record, record_id in zip(records, ids):
+            record["id"] = record_id
+            self._added(record)
+        return records
+    
+    async def get(self, record_id):
+        records = await self._run(self._fetch, self._get_sql, (self._key(record_id),))
+        return records[0] if records else None
+    
+    async def update(self, record_id, changes):
+        result = await self._run(self._update_row, record_id, changes)
+        if result is None:
+            return None
+        
+        old, record = result
+        self._removed(old)
+        self._added(record)
+        return record
+    
+    async def delete(self, record_id):
+        record = await self._run(self._delete_row, record_id)
+        if record is not None:
+            self._removed(record)
+        return record
+    
+    async def find_by(self, field, value):
+        return await self._run(self._fetch, self._find_sql[field], (str(value),))
+    
+    async def count(self):
+        return await self._run(self._count)
+    
+    async def all(self):
+        return await self._run(self._fetch, self._all_sql)
+    
+    async def _page(self, sort, limit, after, descending, fields):
+        first, following = self._page_sql[sort, descending]
+        if after is None:
+            return await self._run(self._fetch, first, (limit,))
+        elif sort == "id":
+            return await self._run(self._fetch, following, (self._key(after[1]), limit))
+        value = "" if after[0] is None else str(after[0])
+        return await self._run(self._fetch, following, (value, value, self._key(after[1]), limit))
+
+class MongoCollection(Collection):
+    """Documents keyed by ObjectId; the API id is its hex string"""
+    
+    async def _collection(self):
+        from .database import get_database
+        return (await get_database())[self.name]
+    
+    @staticmethod
+    def _record(document):
+        document["id"] = str(document.pop("_id"))
+        return document
+    
+    @staticmethod
+    def _key(record_id):
+        from bson import ObjectId
+        return ObjectId(record_id) if ObjectId.is_valid(record_id) else None
+    
+    async def insert(self, record):
+        record.pop("id", None)
+        document = dict(record)
+        result = await (await self._collection()).insert_one(document)
+        record["id"] = str(result.inserted_id)
+        self._added(record)
+        return record
+    
+    async def insert_many(self, records):
+        documents = []
+        for record in records:
+            record.pop("id", None)
+            documents.append(dict(record))
+        if documents:
+            result = await (await self._collection()).insert_many(documents)
+            for record, inserted_id in zip(records, result.inserted_ids):
+                record["id"] = str(inserted_id)
+                self._added(record)
+        return records
+    
+    async def get(self, record_id):
+        key = self._key(record_id)
+        if key is None:
+            return None
+        document = await (await self._collection()).find_one({"_id": key})
+        return None if document is None else self._record(document)
+    
+    async def update(self, record_id, changes):
+        record = await self.get(record_id)
+        if record is None:
+            return None
+        
+        changes = {key: value for key, value in changes.items() if key != "id"}
+        await (await self._collection()).update_one({"_id": self._key(record_id)}, {"$set": changes})
+        self._removed(record)
+        record.update(changes)
+        self._added(record)
+        return record
+    
+    async def delete(self, record_id):
+        key = self._key(record_id)
+        if key is None:
+            return None
+        document = await (await self._collection()).find_one_and_delete({"_id": key})
+        if document is None:
+            return None
+        record = self._record(document)
+        self._removed(record)
+        return record
+    
+    async def find_by(self, field, value):
+        cursor = (await self._collection()).find({field: value}).sort("_id", 1)
+        return [self._record(document) for document in await cursor.to_list(length=None)]
+    
+    async def count(self):
+        return await (await self._collection()).count_documents({})
+    
+    async def all(self):
+        cursor = (await self._collection()).find().sort("_id", 1)
+        return [self._record(document) for document in await cursor.to_list(length=None)]
+    
+    async def _page(self, sort, limit, after, descending, fields):
+        key = "_id" if sort == "id" else sort
+        direction, compare = (-1, "$lt") if descending else (1, "$gt")
+        query = {}
+        if after is not None:
+            last_id = self._key(after[1])
+            if sort == "id":
+                query = {"_id": {compare: last_id}}
+            else:
+                query = {"$or": [{key: {compare: after[0]}}, {key: after[0], "_id": {compare: last_id}}]}
+        projection = None if fields is None else {field: 1 for field in fields if field != "id"}
+        cursor = (await self._collection()).find(query, projection).sort([(key, direction), ("_id", direction)]).limit(limit)
+        return [self._record(document) for document in await cursor.to_list(length=limit)]
+
+class Storage:
+    """The set of collections of one engine, as attributes (storage.patients, ...)"""
+    
+    def __init__(self, backend, collections, log=None):
+        self.backend = backend
+        self.collections = collections
+        self.log = log
+        for name, collection in collections.items():
+            setattr(self, name, collection)
+    
+    async def connect(self):
+        """Replay the memory engine's log or open the Mongo connection (SQLite is ready on creation)"""
+        if self.log is not None:
+            recovered = self.log.recover({name: c.repository for name, c in self.collections.items()})
+            for collection in self.collections.values():
+                collection.log = self.log
+            print(f"✅ Restored {recovered['snapshot_records']} records and replayed "
+                  f"{recovered['replayed_changes']} logged changes in {recovered['seconds']:.2f}s")
+        elif self.backend == "mongo":
+            from . import database
+            await database.connect_to_mongo()
+            if database.database is None:
+                return
+            for name, indexes in COLLECTIONS.items():
+                keys = list(indexes)
+                # (field, _id) serves the keyset sort of page() without an in-memory sort
+                keys += [[(field, 1), ("_id", 1)] for field in SORT_FIELDS.get(name, ()) if field != "id"]
+                for key in keys:
+                    try:
+                        await database.database[name].create_index(key)
+                    except Exception:
+                        # An existing index on the same key (e.g. the unique email indexes) is kept
+                        pass
+    
+    async def close(self):
+        if self.log is not None:
+            await self.log.close()
+        elif self.backend == "mongo":
+            from .database import close_mongo_connection
+            await close_mongo_connection()
+        elif self.backend == "sqlite":
+            collection = next(iter(self.collections.values()))
+            await asyncio.get_running_loop().run_in_executor(collection.executor, collection.connection.close)
+            collection.executor.shutdown()
+
+def connect_sqlite(path=SQLITE_PATH):
+    """
+    SQLite connection tuned for a single-node API server
+    
+    WAL lets readers proceed while a write is in progress. synchronous=NORMAL
+    only fsyncs at checkpoints: a power loss can drop the last transactions but
+    never corrupts the file, and commits stay in the tens of microseconds.
+    """
+    connection = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    return connection
+
+def open_storage(backend=STORAGE_BACKEND, sqlite_path=SQLITE_PATH, data_dir=MEMORY_DATA_DIR):
+    """
+    Create the storage engine named by backend
+    
+    Args:
+        backend: "memory", "sqlite" or "mongo"
+        sqlite_path: database file for the sqlite engine
+        data_dir: write-ahead log directory for the memory engine ("" keeps it volatile)
+    
+    Returns:
+        Storage: with one attribute per collection in COLLECTIONS
+    """
+    if backend == "memory":
+        collections = {name: MemoryCollection(name, indexes) for name, indexes in COLLECTIONS.items()}
+        return Storage(backend, collections, WriteAheadLog(data_dir) if data_dir else None)
+    elif backend == "sqlite":
+        connection = connect_sqlite(sqlite_path)
+        # Every statement on the connection runs on this one thread
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        collections = {name: SQLiteCollection(connection, name, indexes, executor) for name, indexes in COLLECTIONS.items()}
+    elif backend == "mongo":
+        collections = {name: MongoCollection(name, indexes) for name, indexes in COLLECTIONS.items()}
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend!r} (expected memory, sqlite or mongo)")
+    return Storage(backend, collections)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Out-of-core training for datasets larger than memory
+
+The CSV is read twice in fixed-size chunks with explicit dtypes: the first
+pass computes the scaler mean and standard deviation, the second (and any
+further epochs) fits an SGDClassifier with log loss through partial_fit on
+standardized chunks. Peak memory depends on the chunk size, not the file size.
+
+Usage:
+    python -m backend.stream_train --data extract.csv
+    python -m backend.stream_train --data extract.csv --chunksize 200000 --epochs 2
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from . import model_artifact
+from .dataset import DATA_PATH, iter_chunks
+from .ml_model import FEATURE_NAMES, MODEL_PATH
+
+CHUNK_SIZE = 100_000
+
+def scaler_stats(path=DATA_PATH, chunksize=CHUNK_SIZE):
+    """
+    Feature mean and standard deviation in a single streaming pass
+    
+    Per-chunk means and sums of squared deviations are merged with Chan's
+    parallel update, which stays accurate where a running sum of squares
+    would lose precision on millions of rows.
+    
+    Returns:
+        dict: rows, positives, mean and scale (population std, 0 replaced by 1 like StandardScaler)
+    """
+    rows = 0
+    positives = 0
+    mean = np.zeros(len(FEATURE_NAMES))
+    m2 = np.zeros(len(FEATURE_NAMES))
+    
+    for X, y in iter_chunks(path, chunksize):
+        count = X.shape[0]
+        if count == 0:
+            continue
+        chunk_mean = X.mean(axis=0)
+        X -= chunk_mean
+        chunk_m2 = np.einsum("ij,ij->j", X, X)
+        
+        total = rows + count
+        delta = chunk_mean - mean
+        mean += delta * (count / total)
+        m2 += chunk_m2 + delta ** 2 * (rows * count / total)
+        rows = total
+        positives += int(y.sum())
+    
+    if rows == 0:
+        raise ValueError(f"{path} contains no rows")
+    
+    scale = np.sqrt(m2 / rows)
+    scale[scale == 0] = 1.0
+    return {"rows": rows, "positives": positives, "mean": mean, "scale": scale}
+
+def fit_streaming(path, stats, chunksize=CHUNK_SIZE, epochs=1, alpha=0.0001, seed=42):
+    """
+    Fit an SGDClassifier (log loss) chunk by chunk on standardized features
+    
+    Averaged SGD keeps the final weights stable despite per-step noise. Rows
+    are shuffled within each chunk. Accuracy on each chunk is measured
+    before the model learns from it (progressive validation), so the last
+    epoch's figure is an honest estimate without a held-out pass.
+    
+    Returns:
+        tuple: (fitted SGDClassifier, progressive accuracy of the last epoch)
+    """
+    from sklearn.linear_model import SGDClassifier
+    
+    model = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=seed)
+    rng = np.random.default_rng(seed)
+    fitted = False
+    correct = seen = 0
+    
+    for _ in range(epochs):
+        correct = seen = 0
+        for X, y in iter_chunks(path, chunksize):
+            X -= stats["mean"]
+            X /= stats["scale"]
+            order = rng.permutation(X.shape[0])
+            X, y = X[order], y[order]
+            
+            if fitted:
+                correct += int((model.predict(X) == y).sum())
+                seen += X.shape[0]
+            model.partial_fit(X, y, classes=[0, 1])
+            fitted = True
+    
+    return model, (correct / seen if seen else None)
+
+def train_streaming(path=DATA_PATH, output=MODEL_PATH, chunksize=CHUNK_SIZE, epochs=1, alpha=0.0001, seed=42):
+    """
+    Train out of core and write the model artifact
+    
+    Returns:
+        dict: metadata stored in the artifact header
+    """
+    start = time.perf_counter()
+    stats = scaler_stats(path, chunksize)
+    model, accuracy = fit_streaming(path, stats, chunksize, epochs, alpha, seed)
+    
+    metadata = {
+        "source": "backend.stream_train",
+        "model_type": "SGDClassifier",
+        "training_rows": stats["rows"],
+        "positive_rate": stats["positives"] / stats["rows"],
+        "epochs": epochs,
+        "chunksize": chunksize,
+        "alpha": alpha,
+        "progressive_accuracy": accuracy,
+        "training_seconds": time.perf_counter() - start
+    }
+    model_artifact.save_artifact(
+        output,
+        coef=model.coef_[0],
+        intercept=model.intercept_[0],
+        feature_names=FEATURE_NAMES,
+        scaler_mean=stats["mean"],
+        scaler_scale=stats["scale"],
+        metadata=metadata
+    )
+    return metadata
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core training on a CSV larger than memory")
+    parser.add_argument("--data", default=DATA_PATH, help="training CSV")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="rows per chunk")
+    parser.add_argument("--epochs", type=int, default=1, help="passes over the data after the statistics pass")
+    parser.add_argument("--alpha", type=float, default=0.0001, help="L2 regularization strength")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=MODEL_PATH, help="artifact path for the trained model")
+    parser.add_argument("--no-register", action="store_true", help="do not register/promote in the model registry")
+    args = parser.parse_args(argv)
+    
+    print(f"📦 Streaming {args.data} in chunks of {args.chunksize} rows")
+    metadata = train_streaming(args.data, args.output, args.chunksize, args.epochs, args.alpha, args.seed)
+    accuracy = metadata["progressive_accuracy"]
+    print(f"✅ Trained on {metadata['training_rows']} rows in {metadata['training_seconds']:.2f}s"
+          + (f", progressive accuracy {accuracy:.4f}" if accuracy is not None else ""))
+    print(f"✅ Model written to {args.output}")
+    
+    if not args.no_register:
+        from .model_registry import ModelRegistry
+        version = ModelRegistry().register(args.output, promote=True)
+        print(f"✅ Registered and promoted as {version}")
+    
+    return metadata
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Synthetic patient cohorts for load and scale testing
+
+A Gaussian copula is fitted to heart_disease_data.csv: every column keeps its
+empirical marginal distribution, and the latent correlation is calibrated so
+samples reproduce the rank correlations between columns (target included).
+Samples are drawn chunk by chunk, so arbitrarily large cohorts are written in
+constant memory, and a seed makes every run reproducible.
+
+Usage:
+    python -m backend.synthetic dataset --rows 10000000 --output synthetic.csv
+    python -m backend.synthetic patients --rows 100000 --output patients.ndjson
+    python -m backend.synthetic predictions --rows 1000000 --output predictions.ndjson
+    python -m backend.synthetic mongo --rows 100000 --predictions-per-patient 3
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.special import ndtr
+
+from .dataset import COLUMN_DTYPES, COLUMNS, DATA_PATH, TARGET, load_columns
+from .ml_model import FEATURE_NAMES
+
+CHUNK_SIZE = 100_000
+# Columns sampled between observed values instead of only at them
+CONTINUOUS = {"age", "trestbps", "chol", "thalach", "oldpeak"}
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor"]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St", "Lake Rd", "Hill St"]
+
+def _midranks(values):
+    """Ranks 1..n with ties sharing their average rank"""
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    return (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+def _rank_correlation(matrix):
+    """Spearman correlation between the columns of a 2-D array"""
+    ranks = np.column_stack([_midranks(matrix[:, index]) for index in range(matrix.shape[1])])
+    # Constant columns give NaN; treat them as independent
+    correlation = np.nan_to_num(np.corrcoef(ranks, rowvar=False))
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+def _nearest_correlation(matrix, floor=1e-6):
+    """Clip eigenvalues so the matrix stays a valid (positive definite) correlation matrix"""
+    eigenvalues, vectors = np.linalg.eigh((matrix + matrix.T) / 2)
+    matrix = (vectors * np.maximum(eigenvalues, floor)) @ vectors.T
+    scale = np.sqrt(np.diag(matrix))
+    matrix = matrix / np.outer(scale, scale)
+    np.fill_diagonal(matrix, 1.0)
+    return matrix
+
+class CohortModel:
+    def __init__(self, sorted_values, correlation):
+        """
+        Args:
+            sorted_values: column name -> sorted observed values (the empirical marginal)
+            correlation: latent Gaussian correlation matrix, in COLUMNS order
+        """
+        self.sorted_values = sorted_values
+        self.correlation = correlation
+        self._cholesky = np.linalg.cholesky(correlation)
+    
+    @classmethod
+    def fit(cls, path=DATA_PATH, iterations=15, calibration_rows=20_000, seed=0):
+        """
+        Fit marginals and the copula correlation from the dataset (via its columnar cache)
+        
+        Discrete columns attenuate correlations passed through a Gaussian copula,
+        so the latent correlation is calibrated: starting from the real rank
+        correlations, it is corrected until a calibration sample reproduces them.
+        """
+        columns = load_columns(path)
+        rows = len(columns[TARGET])
+        if rows < 2:
+            raise ValueError(f"{path} needs at least two rows to fit a cohort model")
+        
+        sorted_values = {name: np.sort(np.asarray(columns[name], dtype=np.float64)) for name in COLUMNS}
+        target = _rank_correlation(np.column_stack([columns[name] for name in COLUMNS]))
+        
+        model = cls(sorted_values, target)
+        for _ in range(iterations):
+            sample = model.sample(calibration_rows, np.random.default_rng(seed))
+            achieved = _rank_correlation(np.column_stack([sample[name] for name in COLUMNS]))
+            model = cls(sorted_values, _nearest_correlation(model.correlation + (target - achieved)))
+        return model
+    
+    def sample(self, n, rng):
+        """
+        Draw n synthetic rows
+        
+        Returns:
+            dict: column name -> array of n values with the COLUMN_DTYPES dtype
+        """
+        uniforms = ndtr(rng.standard_normal((n, len(COLUMNS))) @ self._cholesky.T)
+        sample = {}
+        for index, name in enumerate(COLUMNS):
+            observed = self.sorted_values[name]
+            positions = uniforms[:, index] * (len(observed) - 1)
+            if name in CONTINUOUS:
+                values = np.interp(positions, np.arange(len(observed)), observed)
+            else:
+                values = observed[np.rint(positions).astype(np.int64)]
+            if np.issubdtype(COLUMN_DTYPES[name], np.integer):
+                values = np.rint(values)
+            else:
+                values = np.round(values, 1)
+            sample[name] = values.astype(COLUMN_DTYPES[name])
+        return sample
+
+def iter_samples(model, rows, seed=42, chunksize=CHUNK_SIZE):
+    """
+    Stream synthetic rows in chunks
+    
+    Yields:
+        tuple: (offset of the chunk's first row, column dict from CohortModel.sample)
+    """
+    rng = np.random.default_rng(seed)
+    for offset in range(0, rows, chunksize):
+        yield offset, model.sample(min(chunksize, rows - offset), rng)
+
+def iter_patients(model, rows, seed=42, end=None, days=365, chunksize=CHUNK_SIZE, first_id=1):
+    """
+    Stream synthetic patients shaped like POST /api/patients records
+    
+    Gender and date of birth follow the sampled sex and age; created_at
+    values increase with the id and span the `days` before `end`.
+    
+    Yields:
+        dict: one patient
+    """
+    end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+    rng = np.random.default_rng([seed, 1])
+    
+    for offset, sample in iter_samples(model, rows, seed, chunksize):
+        count = len(sample[TARGET])
+        first_names = rng.integers(0, len(FIRST_NAMES), count)
+        last_names = rng.integers(0, len(LAST_NAMES), count)
+        houses = rng.integers(1, 9999, count)
+        streets = rng.integers(0, len(STREETS), count)
+        birth_days = rng.integers(0, 365, count)
+        # Evenly spaced with jitter: monotonic without sorting across chunks
+        created = (offset + np.arange(count) + rng.random(count)) * (span / rows)
+        
+        for i in range(count):
+            number = first_id + offset + i
+            first, last = FIRST_NAMES[first_names[i]], LAST_NAMES[last_names[i]]
+            created_at = start + timedelta(seconds=float(created[i]))
+            birth = created_at - timedelta(days=int(sample["age"][i]) * 365 + int(birth_days[i]))
+            yield {
+                "id": str(number),
+                "name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}.{number}@example.com",
+                "phone": f"+1-555-{number % 10000:04d}",
+                "date_of_birth": birth.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+                "gender": "male" if sample["sex"][i] == 1 else "female",
+                "address": f"{houses[i]} {STREETS[streets[i]]}, Anytown, ST {10000 + number % 90000}",
+                "emergency_contact": f"{FIRST_NAMES[(first_names[i] + 1) % len(FIRST_NAMES)]} {last} - +1-555-{(number + 1) % 10000:04d}",
+                "medical_history": "Diagnosed heart disease" if sample[TARGET][i] == 1 else "No significant medical history",
+                "created_at": created_at.isoformat(),
+                "created_by": "admin@heartpredict.com"
+            }
+
+def iter_predictions(model, rows, seed=42, patients=None, end=None, days=365, chunksize=CHUNK_SIZE, predictor=None,
+                     first_patient_id=1):
+    """
+    Stream synthetic POST /api/predictions inputs
+    
+    Args:
+        patients: number of patients to spread the predictions over (default: one per prediction)
+        first_patient_id: id of the first of those patients
+        predictor: if given, each record is scored and gets probability,
+            risk_level and model_version like a stored prediction
+    
+    Yields:
+        dict: patient_id, the 13 clinical features, created_at and the true target
+    """
+    end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+    patients = patients or rows
+    rng = np.random.default_rng([seed, 2])
+    
+    for offset, sample in iter_samples(model, rows, seed + 1, chunksize):
+        count = len(sample[TARGET])
+        patient_ids = rng.integers(first_patient_id, first_patient_id + patients, count)
+        created = (offset + np.arange(count) + rng.random(count)) * (span / rows)
+        columns = {name: sample[name].tolist() for name in COLUMNS}
+        
+        if predictor is not None:
+            features = np.column_stack([sample[name] for name in FEATURE_NAMES]).astype(np.float64)
+            probabilities, risk_levels = predictor.predict_batch(features)
+            probabilities = probabilities.tolist()
+        
+        for i in range(count):
+            record = {"patient_id": str(patient_ids[i])}
+            for name in FEATURE_NAMES:
+                record[name] = columns[name][i]
+            record["target"] = columns[TARGET][i]
+            record["created_at"] = (start + timedelta(seconds=float(created[i]))).isoformat()
+            if predictor is not None:
+                record["probability"] = probabilities[i]
+                record["risk_level"] = risk_levels[i]
+                record["model_version"] = predictor.version
+            yield record
+
+def write_csv(path, rows, seed=42, model=None, chunksize=CHUNK_SIZE):
+    """Write a synthetic dataset with the same columns as heart_disease_data.csv"""
+    import pandas as pd
+    
+    model = model or CohortModel.fit()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for offset, sample in iter_samples(model, rows, seed, chunksize):
+            pd.DataFrame(sample, columns=COLUMNS).to_csv(f, header=offset == 0, index=False)
+    return path
+
+def write_ndjson(path, records):
+    """Write one JSON object per line from any record iterator"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write("\n")
+            count += 1
+    return count
+
+def seed_memory(patients_db, predictions_db, patients, predictions_per_patient=1, seed=42, predictor=None, model=None, end=None):
+    """
+    Insert synthetic patients and scored predictions into the in-memory repositories
+    
+    Ids continue from each repository's allocator, matching the API's numbering.
+    
+    Returns:
+        tuple: (patients added, predictions added)
+    """
+    model = model or CohortModel.fit()
+    first_patient_id = patients_db.next_id
+    for patient in iter_patients(model, patients, seed, end=end, first_id=first_patient_id):
+        patients_db.insert(patient)
+    
+    rows = patients * predictions_per_patient
+    for record in iter_predictions(model, rows, seed, patients, end=end, predictor=predictor, first_patient_id=first_patient_id):
+        record.pop("target")
+        predictions_db.insert(record)
+    return patients, rows
+
+async def seed_mongo(database, patients, predictions_per_patient=1, seed=42, predictor=None, model=None, end=None, batch_size=5000):
+    """
+    Insert synthetic patients and predictions into MongoDB in bounded batches
+    
+    Dates are stored as datetime objects, like the API and init_db.py do.
+    Patients are inserted first; each prediction's patient_id is then the
+    API id (str of the ObjectId) of the patient it was generated for.
+    
+    Returns:
+        tuple: (patients inserted, predictions inserted)
+    """
+    model = model or CohortModel.fit()
+    
+    async def insert(collection, records, date_fields):
+        """Insert records in batches, returning their _ids in order"""
+        inserted_ids = []
+        batch = []
+        for record in records:
+            for field in date_fields:
+                record[field] = datetime.fromisoformat(record[field])
+            batch.append(record)
+            if len(batch) >= batch_size:
+                inserted_ids.extend((await collection.insert_many(batch, ordered=False)).inserted_ids)
+                batch = []
+        if batch:
+            inserted_ids.extend((await collection.insert_many(batch, ordered=False)).inserted_ids)
+        return inserted_ids
+    
+    def linked(predictions, patient_ids):
+        """Replace the 1-based patient numbers with the inserted patients' ids"""
+        for record in predictions:
+            record["patient_id"] = str(patient_ids[int(record["patient_id"]) - 1])
+            yield record
+    
+    rows = patients * predictions_per_patient
+    patient_ids = await insert(database.patients, iter_patients(model, patients, seed, end=end), ("date_of_birth", "created_at"))
+    predictions = iter_predictions(model, rows, seed, patients, end=end, predictor=predictor)
+    await insert(database.predictions, linked(predictions, patient_ids), ("created_at",))
+    return patients, rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic heart disease cohorts")
+    parser.add_argument("kind", choices=["dataset", "patients", "predictions", "mongo"],
+                        help="dataset: CSV like heart_disease_data.csv; patients/predictions: NDJSON; mongo: seed MongoDB")
+    parser.add_argument("--rows", type=int, required=True, help="rows (or patients for mongo) to generate")
+    parser.add_argument("--output", help="output file for dataset/patients/predictions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--source", default=DATA_PATH, help="CSV the cohort model is fitted to")
+    parser.add_argument("--patients", type=int, help="patients the predictions refer to (predictions only)")
+    parser.add_argument("--predictions-per-patient", type=int, default=1, help="predictions per patient (mongo only)")
+    parser.add_argument("--score", action="store_true", help="score predictions with the current model")
+    parser.add_argument("--end", help="ISO date the generated timestamps end at (default: today); fix it for identical output")
+    args = parser.parse_args(argv)
+    
+    if args.kind != "mongo" and not args.output:
+        parser.error("--output is required")
+    
+    model = CohortModel.fit(args.source)
+    end = datetime.fromisoformat(args.end) if args.end else None
+    predictor = None
+    if args.score or args.kind == "mongo":
+        from .model_registry import ModelRegistry
+        predictor = ModelRegistry().load_current()
+    
+    if args.kind == "dataset":
+        write_csv(args.output, args.rows, args.seed, model)
+    elif args.kind == "patients":
+        write_ndjson(args.output, iter_patients(model, args.rows, args.seed, end=end))
+    elif args.kind == "predictions":
+        write_ndjson(args.output, iter_predictions(model, args.rows, args.seed, args.patients, end=end, predictor=predictor))
+    else:
+        import asyncio
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from .database import DATABASE_NAME, MONGODB_URL
+        
+        async def run():
+            client = AsyncIOMotorClient(MONGODB_URL)
+            try:
+                return await seed_mongo(client[DATABASE_NAME], args.rows, args.predictions_per_patient,
+                                        args.seed, predictor, model, end)
+            finally:
+                client.close()
+        
+        patients, predictions = asyncio.run(run())
+        print(f"✅ Inserted {patients} patients and {predictions} predictions into {DATABASE_NAME}")
+        return
+    
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"✅ Wrote {args.rows} {args.kind} rows to {args.output} ({size_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Training command: cross-validated hyperparameter search for the heart disease model
+
+Every candidate (C, penalty, solver, class_weight) is scored with stratified
+k-fold cross-validation. Candidates are spread over a process pool. The best
+one is refit on the full dataset, written to the artifact path that
+HeartDiseasePredictor loads, and registered/promoted in the model registry.
+
+Usage:
+    python -m backend.train                       # full grid on all cores
+    python -m backend.train --search random --n-iter 20
+    python -m backend.train --scaling 1,2,4,8     # report wall-clock scaling
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import model_artifact
+from .dataset import DATA_PATH, load_arrays
+from .ml_model import FEATURE_NAMES, MODEL_PATH
+
+SEARCH_SPACE = {
+    "C": [0.001, 0.01, 0.1, 1.0, 10.0, 100.0],
+    "penalty": ["l1", "l2"],
+    "solver": ["lbfgs", "liblinear", "saga"],
+    "class_weight": [None, "balanced"],
+}
+
+# lbfgs only supports the l2 penalty
+UNSUPPORTED = {("lbfgs", "l1")}
+
+def load_training_data(path=DATA_PATH):
+    """Read the dataset as (X, y) arrays with columns in FEATURE_NAMES order"""
+    return load_arrays(path)
+
+def candidate_params(search="grid", n_iter=20, seed=42, space=None):
+    """
+    Hyperparameter combinations to evaluate
+    
+    Args:
+        search: "grid" for every valid combination, "random" for n_iter samples of it
+        n_iter: number of random candidates
+        seed: random search seed
+        space: override SEARCH_SPACE
+    
+    Returns:
+        list[dict]: candidate parameter sets
+    """
+    space = space or SEARCH_SPACE
+    names = list(space)
+    grid = [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+    grid = [params for params in grid if (params.get("solver"), params.get("penalty")) not in UNSUPPORTED]
+    
+    if search == "random":
+        return random.Random(seed).sample(grid, min(n_iter, len(grid)))
+    return grid
+
+def build_model(params, seed=42):
+    """Standardize features, then logistic regression with the given hyperparameters"""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    
+    return make_pipeline(
+        StandardScaler(),
+        LogisticRegression(max_iter=5000, random_state=seed, **params)
+    )
+
+# Dataset shared with pool workers through the initializer instead of per-task pickling
+_worker_data = {}
+
+def _init_worker(X, y):
+    _worker_data["X"] = X
+    _worker_data["y"] = y
+    warnings.filterwarnings("ignore")
+
+def evaluate_candidate(params, folds=5, scoring="accuracy", seed=42):
+    """Cross-validate one candidate on the worker's dataset"""
+    from sklearn.model_selection import StratifiedKFold, cross_val_score
+    
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    start = time.perf_counter()
+    scores = cross_val_score(build_model(params, seed), _worker_data["X"], _worker_data["y"], cv=cv, scoring=scoring)
+    return {
+        "params": params,
+        "mean_score": float(np.mean(scores)),
+        "std_score": float(np.std(scores)),
+        "fit_seconds": time.perf_counter() - start
+    }
+
+def run_search(X, y, candidates, folds=5, scoring="accuracy", jobs=None, seed=42):
+    """
+    Evaluate all candidates across a process pool
+    
+    Returns:
+        tuple: (leaderboard sorted best first, wall-clock seconds)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(X, y)) as pool:
+        futures = [pool.submit(evaluate_candidate, params, folds, scoring, seed) for params in candidates]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    
+    leaderboard = sorted(results, key=lambda result: (-result["mean_score"], result["std_score"]))
+    return leaderboard, elapsed
+
+def save_best(X, y, best, path=MODEL_PATH, scoring="accuracy", folds=5, seed=42):
+    """Refit the best candidate on the full dataset and write it as a model artifact"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pipeline = build_model(best["params"], seed).fit(X, y)
+    scaler, model = pipeline[0], pipeline[-1]
+    
+    return model_artifact.save_artifact(
+        path,
+        coef=model.coef_[0],
+        intercept=model.intercept_[0],
+        feature_names=FEATURE_NAMES,
+        scaler_mean=scaler.mean_,
+        scaler_scale=scaler.scale_,
+        metadata={
+            "source": "backend.train",
+            "model_type": "LogisticRegression",
+            "params": best["params"],
+            "cv_folds": folds,
+            "cv_scoring": scoring,
+            "cv_mean_score": best["mean_score"],
+            "cv_std_score": best["std_score"],
+            "training_rows": int(len(y))
+        }
+    )
+
+def print_leaderboard(leaderboard, scoring, top=10):
+    print(f"\n🏆 Leaderboard (top {min(top, len(leaderboard))} of {len(leaderboard)}, {scoring})")
+    print(f"{'rank':>4}  {'mean':>7}  {'std':>6}  {'C':>7}  {'penalty':<7}  {'solver':<9}  class_weight")
+    for rank, result in enumerate(leaderboard[:top], 1):
+        params = result["params"]
+        print(f"{rank:>4}  {result['mean_score']:7.4f}  {result['std_score']:6.4f}  {params['C']:>7g}  "
+              f"{params['penalty']:<7}  {params['solver']:<9}  {params['class_weight']}")
+
+def report_scaling(X, y, candidates, job_counts, folds, scoring, seed):
+    """Time the same search with different pool sizes"""
+    print("\n⏱️ Wall-clock scaling")
+    print(f"{'workers':>7}  {'seconds':>8}  {'speedup':>7}")
+    baseline = None
+    for jobs in job_counts:
+        _, elapsed = run_search(X, y, candidates, folds, scoring, jobs, seed)
+        baseline = baseline or elapsed
+        print(f"{jobs:>7}  {elapsed:8.2f}  {baseline / elapsed:6.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search for the heart disease model")
+    parser.add_argument("--data", default=DATA_PATH, help="training CSV")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=20, help="candidates for random search")
+    parser.add_argument("--scoring", default="accuracy", help="sklearn scoring name, e.g. accuracy or roc_auc")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=MODEL_PATH, help="artifact path for the best model")
+    parser.add_argument("--leaderboard", help="write the full leaderboard as JSON to this path")
+    parser.add_argument("--no-register", action="store_true", help="do not register/promote in the model registry")
+    parser.add_argument("--scaling", help="comma-separated worker counts to benchmark, e.g. 1,2,4,8")
+    args = parser.parse_args(argv)
+    
+    X, y = load_training_data(args.data)
+    candidates = candidate_params(args.search, args.n_iter, args.seed)
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f"🔍 {len(candidates)} candidates x {args.folds} folds on {len(y)} rows with {jobs} workers")
+    
+    leaderboard, elapsed = run_search(X, y, candidates, args.folds, args.scoring, jobs, args.seed)
+    print(f"✅ Search finished in {elapsed:.2f}s")
+    print_leaderboard(leaderboard, args.scoring)
+    
+    if args.leaderboard:
+        with open(args.leaderboard, "w", encoding="utf-8") as f:
+            json.dump(leaderboard, f, indent=2)
+    
+    best = leaderboard[0]
+    save_best(X, y, best, args.output, args.scoring, args.folds, args.seed)
+    print(f"\n✅ Best model ({best['mean_score']:.4f}) written to {args.output}")
+    
+    if not args.no_register:
+        from .model_registry import ModelRegistry
+        version = ModelRegistry().register(args.output, promote=True)
+        print(f"✅ Registered and promoted as {version}")
+    
+    if args.scaling:
+        job_counts = [int(count) for count in args.scaling.split(",")]
+        report_scaling(X, y, candidates, job_counts, args.folds, args.scoring, args.seed)
+    
+    return leaderboard
+
+if __name__ == "__main__":
+    main()
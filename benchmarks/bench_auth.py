@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: authenticated endpoint throughput with and without the auth caches
+
+Serves a minimal route that depends on get_current_user through the ASGI
+app, with a doctors collection that answers find_by after a simulated
+database round trip. Clients reuse a pool of tokens, as logged-in browsers
+do; with the caches off every request decodes its JWT and queries the
+doctor again. Also times get_current_user on its own, one call at a time,
+since on a single core the HTTP stack dominates the request throughput.
+Run from the project root:
+    python -m benchmarks.bench_auth
+    python -m benchmarks.bench_auth --requests 5000 --concurrency 64 --latency-ms 1
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from httpx import AsyncClient
+
+from backend import auth
+from backend.prediction_cache import PredictionCache
+
+class SlowDoctors:
+    """doctors collection answering after a fixed round trip"""
+    
+    def __init__(self, doctors, latency):
+        self.records = {f"doctor{index}@example.com": {"id": str(index), "email": f"doctor{index}@example.com",
+                                                      "role": "doctor"} for index in range(doctors)}
+        self.latency = latency
+        self.queries = 0
+    
+    async def find_by(self, field, value):
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        record = self.records.get(value)
+        return [record] if record is not None else []
+
+def make_app(doctors):
+    app = FastAPI()
+    
+    @app.get("/api/me")
+    async def me(user=Depends(auth.get_current_user)):
+        return user
+    
+    app.dependency_overrides[auth.get_doctor_store] = lambda: doctors
+    return app
+
+async def measure(args, cached):
+    """Requests per second, doctor queries and µs per get_current_user call for one configuration"""
+    size = 10_000 if cached else 0
+    auth.token_cache = PredictionCache(size, auth.TOKEN_CACHE_TTL)
+    auth.doctor_cache = PredictionCache(size, auth.DOCTOR_CACHE_TTL)
+    doctors = SlowDoctors(args.doctors, args.latency_ms / 1000)
+    headers = [
+        {"Authorization": "Bearer " + auth.create_access_token({"sub": email, "role": "doctor"})}
+        for email in doctors.records
+    ]
+    
+    async with AsyncClient(app=make_app(doctors), base_url="http://test") as client:
+        async def worker(offset):
+            for index in range(offset, args.requests, args.concurrency):
+                response = await client.get("/api/me", headers=headers[index % len(headers)])
+                assert response.status_code == 200
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(offset) for offset in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    queries = doctors.queries
+    
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=h["Authorization"][7:]) for h in headers]
+    start = time.perf_counter()
+    for index in range(args.requests):
+        await auth.get_current_user(credentials[index % len(credentials)], doctors)
+    per_call = (time.perf_counter() - start) / args.requests * 1e6
+    return args.requests / elapsed, queries, per_call
+
+async def run(args):
+    print(f"🫀 Authenticated requests ({args.doctors} doctors, {args.concurrency} concurrent, "
+          f"{args.latency_ms} ms per doctor query)")
+    print("=" * 64)
+    print(f"{'auth caches':<12} {'requests/s':>12} {'doctor queries':>16} {'µs per auth':>14}")
+    for cached in (False, True):
+        throughput, queries, per_call = await measure(args, cached)
+        print(f"{'on' if cached else 'off':<12} {throughput:>12,.0f} {queries:>16,} {per_call:>14,.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--doctors", type=int, default=50, help="distinct tokens in use")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated find_by round trip")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
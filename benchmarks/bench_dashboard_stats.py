@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard statistics and the predictions timeline,
+full recompute vs incremental counters and rollups
+
+Run from the project root:
+    python -m benchmarks.bench_dashboard_stats
+    python -m benchmarks.bench_dashboard_stats --sizes 10000,100000,1000000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.repository import Repository
+from backend.stats import PredictionStats
+
+def recompute(predictions_db):
+    """The stats endpoint before the counters: two walks and an ISO parse per record"""
+    return {
+        "high_risk_patients": len([p for p in predictions_db if p.get("risk_level") == "High Risk"]),
+        "recent_predictions": len([p for p in predictions_db if (datetime.utcnow() - datetime.fromisoformat(p.get("created_at", "2024-01-01T00:00:00"))).days <= 7]),
+        "total_predictions": len(predictions_db)
+    }
+
+def incremental(stats):
+    return {
+        "high_risk_patients": stats.risk_count("High Risk"),
+        "recent_predictions": stats.recent(),
+        "total_predictions": stats.total
+    }
+
+def scan_timeline(predictions_db, start, end):
+    """Daily counts by walking every record"""
+    counts = {}
+    for p in predictions_db:
+        created_at = datetime.fromisoformat(p["created_at"])
+        if start <= created_at < end:
+            day = created_at.date().isoformat()
+            counts[day] = counts.get(day, 0) + 1
+    return counts
+
+def best_of(func, repeat):
+    """Best wall-clock microseconds over repeat calls"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated prediction counts")
+    args = parser.parse_args(argv)
+    
+    print("🫀 GET /api/dashboard/stats computation (predictions spread over one year)")
+    print("=" * 76)
+    print(f"{'predictions':>11}  {'recompute':>12}  {'counters':>10}  {'insert overhead':>16}  "
+          f"{'1y daily scan':>13}  {'1y rollup':>10}")
+    
+    now = datetime.utcnow()
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = np.random.default_rng(42)
+        offsets = rng.uniform(0, 365 * 86400, size)
+        records = [
+            {"risk_level": "High Risk" if offset % 3 < 1 else "Low Risk", "created_at": (now - timedelta(seconds=offset)).isoformat()}
+            for offset in offsets.tolist()
+        ]
+        
+        plain = Repository()
+        start = time.perf_counter()
+        for record in records:
+            plain.insert(dict(record))
+        plain_insert = time.perf_counter() - start
+        
+        tracked = Repository()
+        stats = PredictionStats()
+        tracked.observe(stats)
+        start = time.perf_counter()
+        for record in records:
+            tracked.insert(dict(record))
+        tracked_insert = time.perf_counter() - start
+        
+        assert recompute(tracked)["high_risk_patients"] == incremental(stats)["high_risk_patients"]
+        slow = best_of(lambda: recompute(tracked), 3)
+        fast = best_of(lambda: incremental(stats), 1000)
+        overhead = (tracked_insert - plain_insert) / size * 1e6
+        
+        end = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        start = end - timedelta(days=365)
+        assert sum(scan_timeline(tracked, start, end).values()) == sum(b["count"] for b in stats.timeline(start, end))
+        scan = best_of(lambda: scan_timeline(tracked, start, end), 3)
+        rollup = best_of(lambda: stats.timeline(start, end, "day"), 20)
+        print(f"{size:>11}  {slow / 1000:9.1f} ms  {fast:7.2f} µs  {overhead:10.2f} µs/op  "
+              f"{scan / 1000:10.1f} ms  {rollup / 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
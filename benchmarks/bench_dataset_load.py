@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parsing the training CSV vs loading the columnar cache
+
+Each load runs in a fresh interpreter so nothing is warm in-process (the OS
+page cache is warm for every mode).
+Run from the project root:
+    python -m benchmarks.bench_dataset_load                 # 10M synthetic rows
+    python -m benchmarks.bench_dataset_load --rows 1000000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend import dataset
+from backend.synthetic import write_csv
+
+TIMED = """
+import time
+{setup}
+start = time.perf_counter()
+{body}
+print((time.perf_counter() - start) * 1000)
+"""
+
+# (label, untimed imports, timed load)
+LOADS = [
+    ("pd.read_csv (inferred dtypes)", "import pandas as pd", "data = pd.read_csv({path!r}); data['age'].sum()"),
+    ("cache: load_columns (mmap)", "from backend.dataset import load_columns", "columns = load_columns({path!r}, build=False); columns['age'].sum()"),
+    ("cache: load_arrays (X, y)", "from backend.dataset import load_arrays", "X, y = load_arrays({path!r})"),
+]
+
+def timed_load(setup, body, path, repeat=3):
+    """Best wall-clock milliseconds for body in a new interpreter, imports excluded"""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMED.format(setup=setup, body=body.format(path=path))],
+            check=True, capture_output=True, text=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="synthetic dataset size")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.csv")
+        write_csv(path, args.rows)
+        
+        start = time.perf_counter()
+        dataset.build_cache(path)
+        build_seconds = time.perf_counter() - start
+        
+        print(f"🫀 Dataset load, {args.rows} rows ({os.path.getsize(path) / 1e6:.0f} MB CSV)")
+        print("=" * 60)
+        print(f"{'one-time build_cache':<32} {build_seconds * 1000:10.1f} ms")
+        for label, setup, body in LOADS:
+            print(f"{label:<32} {timed_load(setup, body, path):10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/health latency while heavy batch scoring runs
+
+Starts the API under uvicorn, measures health check latency idle, then again
+while background threads keep posting large /api/predictions/batch jobs.
+Runs once per INFERENCE_EXECUTOR kind: thread pools keep the loop free during
+NumPy work but still share the GIL with JSON decoding, process pools isolate
+it completely at the cost of shipping the payload to the worker.
+Run from the project root:
+    python -m benchmarks.bench_event_loop
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+BATCH_ROWS = 20000
+LOAD_THREADS = 4
+HEALTH_SAMPLES = 300
+
+def wait_for_server(timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{BASE_URL}/api/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+def measure_health(client):
+    latencies = []
+    for _ in range(HEALTH_SAMPLES):
+        start = time.perf_counter()
+        client.get("/api/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def run(kind, payload):
+    """Measure health latency idle and under batch load for one executor kind"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(PORT), "--log-level", "warning"],
+        env={**os.environ, "INFERENCE_EXECUTOR": kind},
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        wait_for_server()
+        stop = threading.Event()
+        batches = []
+        
+        def load():
+            with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+                while not stop.is_set():
+                    response = client.post("/api/predictions/batch", content=payload,
+                                           headers={"Content-Type": "application/json"})
+                    batches.append(response.status_code)
+        
+        with httpx.Client(base_url=BASE_URL) as client:
+            idle = measure_health(client)
+            threads = [threading.Thread(target=load) for _ in range(LOAD_THREADS)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(1)
+            loaded = measure_health(client)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+    
+    print(f"[{kind} pool]")
+    print(f"  idle                  : p50 {idle[0]:6.2f} ms | p99 {idle[1]:6.2f} ms")
+    print(f"  under batch load      : p50 {loaded[0]:6.2f} ms | p99 {loaded[1]:6.2f} ms")
+    print(f"  scoring throughput    : {batches.count(200) * BATCH_ROWS / elapsed:,.0f} rows/s "
+          f"({batches.count(503)} batches rejected with 503)")
+
+def main():
+    rows = np.random.default_rng(42).uniform(0, 200, (BATCH_ROWS, 13)).round(1).tolist()
+    payload = json.dumps({"records": rows})
+    
+    print(f"🫀 /api/health latency, {HEALTH_SAMPLES} samples, {LOAD_THREADS} clients posting {BATCH_ROWS}-row batches")
+    print("=" * 78)
+    for kind in ("thread", "process"):
+        run(kind, payload)
+
+if __name__ == "__main__":
+    main()
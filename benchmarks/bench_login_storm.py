@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/health latency during a login storm
+
+Probes GET /api/health at a fixed interval while a burst of concurrent
+POST /api/auth/login requests runs through the ASGI app, once with bcrypt
+called inline on the event loop (how login used to verify passwords) and
+once on the bounded password pool. Logins the pool cannot queue are
+answered 503 straight away and counted as rejected.
+Run from the project root:
+    python -m benchmarks.bench_login_storm
+    python -m benchmarks.bench_login_storm --logins 64 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient
+
+from backend import auth
+from backend import main as api
+
+async def inline_verify(plain_password, hashed_password):
+    return auth.verify_password(plain_password, hashed_password)
+
+async def probe_health(client, interval, stop):
+    """
+    Health check latencies in ms until stop is set
+    
+    Each probe is timed from when it was due, so time the event loop spent
+    blocked before it could even send the request counts.
+    """
+    latencies = []
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await client.get("/api/health")
+        assert response.status_code == 200
+        latencies.append((time.perf_counter() - due) * 1000)
+    return latencies
+
+async def storm(client, args):
+    """Status code counts of args.logins logins sent args.concurrency at a time"""
+    statuses = {}
+    
+    async def worker(count):
+        for _ in range(count):
+            response = await client.post("/api/auth/login", json={
+                "email": "dr.smith@heartpredict.com", "password": "doctor123"
+            })
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    
+    per_worker, extra = divmod(args.logins, args.concurrency)
+    await asyncio.gather(*(worker(per_worker + (index < extra)) for index in range(args.concurrency)))
+    return statuses
+
+async def measure(args, mode):
+    if mode == "inline":
+        api.verify_password_async = inline_verify
+    else:
+        api.verify_password_async = auth.verify_password_async
+    
+    async with AsyncClient(app=api.app, base_url="http://test", timeout=None) as client:
+        stop = asyncio.Event()
+        prober = asyncio.ensure_future(probe_health(client, args.interval_ms / 1000, stop))
+        start = time.perf_counter()
+        statuses = await storm(client, args) if mode != "idle" else {}
+        if mode == "idle":
+            await asyncio.sleep(1)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        latencies = sorted(await prober)
+    
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{mode:<9} {statistics.median(latencies):>9.1f} {p99:>9.1f} {latencies[-1]:>9.1f} {len(latencies):>7} "
+          f"{statuses.get(200, 0):>7} {statuses.get(503, 0):>9} {elapsed:>8.1f}")
+
+async def run(args):
+    print(f"🫀 /api/health latency (ms) during {args.logins} logins, {args.concurrency} concurrent")
+    print("=" * 74)
+    print(f"{'bcrypt':<9} {'p50':>9} {'p99':>9} {'max':>9} {'probes':>7} {'logins':>7} {'rejected':>9} {'seconds':>8}")
+    for mode in ("idle", "inline", "pool"):
+        await measure(args, mode)
+    print(f"pool: {auth.password_executor.max_workers} workers, queue {auth.password_executor.max_queue}")
+    auth.password_executor.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--interval-ms", type=float, default=20, help="pause between health probes")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
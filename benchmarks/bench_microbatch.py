@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent single-row scoring, direct vs micro-batched
+
+Simulates many concurrent /api/predictions callers and reports throughput,
+latency and the batcher's batch size statistics for several settings.
+Run from the project root:
+    python -m benchmarks.bench_microbatch
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from backend.batching import MicroBatcher
+from backend.ml_model import HeartDiseasePredictor
+
+CONCURRENCY = 500
+ROUNDS = 20
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000
+
+async def run_clients(score, rows):
+    """Fire CONCURRENCY requests per round and collect per-request latency"""
+    latencies = []
+    
+    async def one(row):
+        start = time.perf_counter()
+        await score(row)
+        latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await asyncio.gather(*(one(row) for row in rows))
+    elapsed = time.perf_counter() - start
+    return CONCURRENCY * ROUNDS / elapsed, latencies
+
+async def main():
+    predictor = HeartDiseasePredictor()
+    rows = np.random.default_rng(42).uniform(0, 200, (CONCURRENCY, 13)).tolist()
+    
+    async def direct(row):
+        return predictor.predict(row)
+    
+    def handler(batch):
+        probabilities, risk_levels = predictor.predict_batch(batch)
+        return list(zip(probabilities.tolist(), risk_levels))
+    
+    print(f"🫀 {CONCURRENCY} concurrent callers x {ROUNDS} rounds")
+    print("=" * 78)
+    throughput, latencies = await run_clients(direct, rows)
+    print(f"{'direct predict()':<28} {throughput:10.0f} rows/s | p50 {percentile(latencies, 50):7.2f} ms | "
+          f"p99 {percentile(latencies, 99):7.2f} ms")
+    
+    for max_batch_size, max_wait_ms in [(16, 1), (64, 2), (256, 5)]:
+        batcher = MicroBatcher(handler, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        throughput, latencies = await run_clients(batcher.submit, rows)
+        metrics = batcher.metrics()
+        await batcher.stop()
+        label = f"batched n={max_batch_size} t={max_wait_ms}ms"
+        print(f"{label:<28} {throughput:10.0f} rows/s | p50 {percentile(latencies, 50):7.2f} ms | "
+              f"p99 {percentile(latencies, 99):7.2f} ms | avg batch {metrics['avg_batch_size']:.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
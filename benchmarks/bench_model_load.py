@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: joblib pickle vs memory-mapped model artifact
+
+Each measurement runs in a fresh interpreter so import costs are included.
+Run from the project root:
+    python -m benchmarks.bench_model_load
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.ml_model import HeartDiseasePredictor
+
+PICKLE_LOAD = "import joblib; joblib.load({path!r}).predict_proba([[54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]])"
+ARTIFACT_LOAD = "from backend.ml_model import HeartDiseasePredictor; HeartDiseasePredictor(model_path={path!r}).predict([54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2])"
+
+def cold_start(code, repeat=5):
+    """Best wall-clock time in milliseconds to run code in a new interpreter"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def main():
+    import joblib
+    
+    predictor = HeartDiseasePredictor()
+    predictor.train_model()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, "model.pkl")
+        artifact_path = os.path.join(tmp, "model.bin")
+        joblib.dump(predictor.model, pickle_path)
+        predictor.save_artifact(artifact_path)
+        
+        baseline = cold_start("pass")
+        pickle_ms = cold_start(PICKLE_LOAD.format(path=pickle_path))
+        artifact_ms = cold_start(ARTIFACT_LOAD.format(path=artifact_path))
+    
+    print("🫀 Model cold start (new interpreter, load + first prediction)")
+    print("=" * 50)
+    print(f"interpreter only : {baseline:8.1f} ms")
+    print(f"joblib pickle    : {pickle_ms:8.1f} ms")
+    print(f"mmap artifact    : {artifact_ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /api/patients, whole list vs keyset pages
+
+Fills the patients store, then times requests through the ASGI app: the
+full list (what the endpoint used to return), the first page, a page deep
+in the collection (via its cursor), and a projected page.
+Run from the project root:
+    python -m benchmarks.bench_patients_page
+    python -m benchmarks.bench_patients_page --sizes 10000,200000 --engines memory,sqlite
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from fastapi.encoders import jsonable_encoder
+from httpx import AsyncClient
+
+from backend import main as api
+from backend.storage import open_storage
+
+def make_patients(count):
+    return [
+        {
+            "name": f"Patient {(index * 7919) % count:07d}",
+            "email": f"patient{index}@example.com",
+            "phone": "+1-555-0100",
+            "date_of_birth": "1960-01-01T00:00:00",
+            "gender": "female" if index % 2 else "male",
+            "address": f"{index} Main Street, Springfield",
+            "emergency_contact": "Next of kin - +1-555-0199",
+            "medical_history": "Hypertension" if index % 3 == 0 else None,
+            "created_at": f"2025-01-01T00:00:{index % 60:02d}.{index:06d}"
+        }
+        for index in range(count)
+    ]
+
+async def timed_get(client, params, repeat):
+    """Best latency in ms, response size in KB and the next cursor"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get("/api/patients", params=params)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(response.content) / 1000, response.headers.get("X-Next-Cursor")
+
+async def run(args):
+    print("🫀 GET /api/patients latency (best of runs) and response size")
+    print("=" * 96)
+    print(f"{'engine':<7} {'patients':>9}  {'full list':>20}  {'first page (50)':>16}  {'page at 50%':>12}  {'50, fields=name':>16}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in args.engines.split(","):
+            for size in (int(value) for value in args.sizes.split(",")):
+                storage = open_storage(engine, sqlite_path=os.path.join(tmp, f"{engine}_{size}.db"), data_dir="")
+                await storage.patients.insert_many(make_patients(size))
+                api.patients_db = storage.patients
+                
+                async with AsyncClient(app=api.app, base_url="http://test") as client:
+                    # The old endpoint returned every patient: what FastAPI does with that list
+                    start = time.perf_counter()
+                    records = await storage.patients.all()
+                    body = json.dumps(jsonable_encoder(records)).encode()
+                    full_ms, full_kb = (time.perf_counter() - start) * 1000, len(body) / 1000
+                    
+                    params = {"sort": "name", "limit": 50}
+                    first_ms, first_kb, _ = await timed_get(client, params, args.repeat)
+                    # Jump to the middle: a cursor on the median name
+                    middle = sorted(records, key=lambda r: (r["name"], int(r["id"])))[size // 2]
+                    cursor = api.encode_cursor("name", "asc", (middle["name"], middle["id"]))
+                    deep_ms, _, _ = await timed_get(client, {**params, "after": cursor}, args.repeat)
+                    projected_ms, projected_kb, _ = await timed_get(client, {**params, "fields": "name"}, args.repeat)
+                
+                print(f"{engine:<7} {size:>9}  {full_ms:8.0f} ms {full_kb:7.0f} KB  {first_ms:6.2f} ms {first_kb:4.0f} KB  "
+                      f"{deep_ms:9.2f} ms  {projected_ms:6.2f} ms {projected_kb:4.1f} KB")
+                await storage.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,200000", help="comma-separated patient counts")
+    parser.add_argument("--engines", default="memory,sqlite", help="comma-separated: memory, sqlite, mongo")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
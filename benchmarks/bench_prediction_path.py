@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of scoring /api/predictions with the model vs the heuristic
+
+Measures the scoring step on its own and the full endpoint (in-process ASGI
+client, no network) for each mode, with and without explanations.
+Run from the project root:
+    python -m benchmarks.bench_prediction_path
+"""
+
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from backend import main
+from backend.ml_model import FEATURE_NAMES
+from backend.prediction_cache import PredictionCache
+
+REQUESTS = 2000
+
+def make_records(n, seed=42):
+    rng = np.random.default_rng(seed)
+    rows = rng.uniform(0, 200, (n, len(FEATURE_NAMES))).round(1)
+    return [{"patient_id": "1", **dict(zip(FEATURE_NAMES, row.tolist()))} for row in rows]
+
+def summarize(label, latencies):
+    latencies = np.array(latencies) * 1e6
+    print(f"{label:<36} p50 {np.percentile(latencies, 50):9.1f} µs | p99 {np.percentile(latencies, 99):9.1f} µs")
+
+async def time_calls(func, records):
+    latencies = []
+    for record in records:
+        start = time.perf_counter()
+        result = func(record)
+        if asyncio.iscoroutine(result):
+            await result
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+async def time_endpoint(client, records, url="/api/predictions"):
+    latencies = []
+    for record in records:
+        start = time.perf_counter()
+        await client.post(url, json=record)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+async def run():
+    model = main.get_predictor()
+    records = make_records(REQUESTS)
+    
+    print(f"🫀 /api/predictions scoring cost ({REQUESTS} distinct records)")
+    print("=" * 78)
+    summarize("heuristic_risk()", await time_calls(main.heuristic_risk, records))
+    summarize("predictor.predict()", await time_calls(
+        lambda record: model.predict([record[name] for name in FEATURE_NAMES]), records))
+    
+    main.prediction_cache = PredictionCache(max_size=0)
+    summarize("score_prediction() (batcher + pool)", await time_calls(main.score_prediction, records))
+    # Sequential callers never share a batch, so they only pay the batching wait
+    max_wait = main.inference_batcher.max_wait
+    main.inference_batcher.max_wait = 0
+    summarize("score_prediction() (max wait 0)", await time_calls(main.score_prediction, records))
+    main.inference_batcher.max_wait = max_wait
+    main.prediction_cache = PredictionCache()
+    await time_calls(main.score_prediction, records)
+    summarize("score_prediction() (cache hit)", await time_calls(main.score_prediction, records))
+    
+    async with httpx.AsyncClient(app=main.app, base_url="http://bench") as client:
+        for mode in ("heuristic", "model"):
+            main.PREDICTION_MODE = mode
+            main.prediction_cache = PredictionCache(max_size=0)
+            summarize(f"POST /api/predictions [{mode}]", await time_endpoint(client, records))
+        main.prediction_cache = PredictionCache(max_size=0)
+        summarize("POST /api/predictions?explain=true", await time_endpoint(client, records, "/api/predictions?explain=true"))
+
+if __name__ == "__main__":
+    asyncio.run(run())
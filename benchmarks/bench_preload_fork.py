@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: boot time and memory of N workers, uvicorn --workers vs preload-and-fork
+
+Starts the API with `uvicorn backend.main:app --workers N` (every worker
+imports the app and loads the model itself) and with `python -m
+backend.server --workers N` (the master does it once and forks), times
+the launch until every worker has completed application startup, then
+reads each process's RSS, PSS and USS from /proc. RSS counts shared pages
+in every process that maps them; PSS splits them, so total PSS is the
+real footprint. Linux only.
+Run from the project root:
+    python -m benchmarks.bench_preload_fork
+    python -m benchmarks.bench_preload_fork --workers 1,4,16
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from backend.server import process_memory
+
+READY_LINE = b"Application startup complete."
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def children(pid):
+    """Child pids of a process, found by scanning /proc"""
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The parent pid follows the ")" that closes the command name
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                command = f.read()
+        except OSError:
+            continue
+        if int(fields[1]) == pid and b"resource_tracker" not in command:
+            found.append(int(entry))
+    return found
+
+def launch(mode, workers, port):
+    if mode == "uvicorn":
+        command = [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+                   "--port", str(port), "--workers", str(workers)]
+    else:
+        command = [sys.executable, "-m", "backend.server", "--host", "127.0.0.1",
+                   "--port", str(port), "--workers", str(workers)]
+    # Volatile per-worker stores: several workers cannot share one write-ahead log
+    env = {**os.environ, "MEMORY_DATA_DIR": "", "MODEL_WATCH_INTERVAL": "0"}
+    return subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+def measure(mode, workers):
+    """Seconds until every worker is up, and memory of the supervisor and the workers"""
+    start = time.perf_counter()
+    process = launch(mode, workers, free_port())
+    ready = 0
+    try:
+        while ready < workers:
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"{mode} exited before {workers} workers started")
+            ready += READY_LINE in line
+        boot = time.perf_counter() - start
+        # Let the last workers finish their first event loop iterations
+        time.sleep(1)
+        worker_pids = children(process.pid) or [process.pid]
+        supervisor = process_memory(process.pid) if worker_pids != [process.pid] else None
+        memory = [process_memory(pid) for pid in worker_pids]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+    return boot, supervisor, memory
+
+def run(args):
+    print("🫀 API workers: boot time and memory (MB per worker: mean RSS / PSS / USS)")
+    print("=" * 92)
+    print(f"{'server':<10} {'workers':>7} {'boot s':>8} {'RSS':>8} {'PSS':>8} {'USS':>8} "
+          f"{'supervisor PSS':>15} {'total PSS':>10}")
+    for workers in (int(value) for value in args.workers.split(",")):
+        for mode in ("uvicorn", "preload"):
+            boot, supervisor, memory = measure(mode, workers)
+            mean = {key: sum(m[key] for m in memory) / len(memory) for key in ("rss", "pss", "uss")}
+            supervisor_pss = supervisor["pss"] if supervisor else 0.0
+            total = sum(m["pss"] for m in memory) + supervisor_pss
+            print(f"{mode:<10} {workers:>7} {boot:>8.2f} {mean['rss']:>8.1f} {mean['pss']:>8.1f} {mean['uss']:>8.1f} "
+                  f"{supervisor_pss:>15.1f} {total:>10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,4,16", help="comma-separated worker counts")
+    run(parser.parse_args(argv))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-patient prediction lookup, list scan vs indexed repository
+
+Every patient has the same number of predictions, so the work a lookup must
+do is constant; only the total number of stored predictions grows.
+Run from the project root:
+    python -m benchmarks.bench_repository
+    python -m benchmarks.bench_repository --sizes 10000,100000,1000000 --per-patient 5
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from backend.repository import Repository
+
+def make_predictions(total, per_patient):
+    """Lightweight prediction records spread evenly over total / per_patient patients"""
+    patients = max(total // per_patient, 1)
+    for index in range(total):
+        yield {
+            "patient_id": str(index % patients + 1),
+            "risk_level": "High Risk" if index % 3 == 0 else "Low Risk",
+            "probability": 0.5
+        }
+
+def time_lookups(lookup, patient_ids):
+    """p50 and p99 latency in microseconds"""
+    latencies = []
+    for patient_id in patient_ids:
+        start = time.perf_counter()
+        lookup(patient_id)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e6
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated total prediction counts")
+    parser.add_argument("--per-patient", type=int, default=5, help="predictions per patient")
+    parser.add_argument("--lookups", type=int, default=1000, help="repository lookups per size")
+    parser.add_argument("--scan-lookups", type=int, default=20, help="list scans per size (they are slow)")
+    args = parser.parse_args(argv)
+    
+    print(f"🫀 Predictions for one patient ({args.per_patient} per patient)")
+    print("=" * 86)
+    print(f"{'total':>9}  {'insert/s':>10}  {'list scan p50':>14}  {'index p50':>10}  {'index p99':>10}  {'speedup':>9}")
+    
+    for total in (int(size) for size in args.sizes.split(",")):
+        records = list(make_predictions(total, args.per_patient))
+        patients = max(total // args.per_patient, 1)
+        rng = random.Random(1)
+        patient_ids = [str(rng.randrange(patients) + 1) for _ in range(args.lookups)]
+        
+        repository = Repository(indexes=("patient_id",))
+        start = time.perf_counter()
+        for record in records:
+            repository.insert(record)
+        insert_rate = total / (time.perf_counter() - start)
+        
+        scan_p50, _ = time_lookups(
+            lambda patient_id: [p for p in records if p.get("patient_id") == patient_id],
+            patient_ids[:args.scan_lookups]
+        )
+        index_p50, index_p99 = time_lookups(lambda patient_id: repository.find_by("patient_id", patient_id), patient_ids)
+        
+        print(f"{total:>9}  {insert_rate:10.0f}  {scan_p50:11.1f} µs  {index_p50:7.2f} µs  {index_p99:7.2f} µs  {scan_p50 / index_p50:8.0f}x")
+        del records, repository
+
+if __name__ == "__main__":
+    main()
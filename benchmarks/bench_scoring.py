@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: sklearn predict_proba vs the NumPy scoring kernel
+
+Run from the project root:
+    python -m benchmarks.bench_scoring
+"""
+
+import timeit
+import warnings
+
+import numpy as np
+
+from backend.ml_model import HeartDiseasePredictor
+
+def best_of(func, number, repeat=5):
+    """Best per-call time in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def main():
+    # sklearn warns about missing feature names when given plain arrays
+    warnings.filterwarnings("ignore", category=UserWarning)
+    
+    predictor = HeartDiseasePredictor()
+    # Refit the (deterministic) sklearn estimator to compare against
+    predictor.train_model()
+    rng = np.random.default_rng(42)
+    single = rng.uniform(0, 200, (1, 13))
+    batch = rng.uniform(0, 200, (10000, 13))
+    
+    print("🫀 Scoring kernel benchmark (per call)")
+    print("=" * 50)
+    for label, rows, number in [("single row", single, 5000), ("10k-row batch", batch, 200)]:
+        sklearn_us = best_of(lambda: predictor.model.predict_proba(rows)[:, 1], number)
+        kernel_us = best_of(lambda: predictor.score(rows), number)
+        print(f"{label:>14}: sklearn {sklearn_us:10.1f} µs | numpy {kernel_us:10.1f} µs | "
+              f"speedup {sklearn_us / kernel_us:5.1f}x")
+
+if __name__ == "__main__":
+    main()
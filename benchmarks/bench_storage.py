@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: storage engines on the same workload
+
+Inserts prediction records one at a time and in batches, then measures
+lookups by id, per-patient queries and counts, for each engine behind
+backend.storage. The mongo engine needs a server at MONGODB_URL.
+Run from the project root:
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --records 100000 --engines memory,sqlite,mongo
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from backend.storage import open_storage
+
+PER_PATIENT = 5
+
+def make_predictions(count, first=0):
+    """Prediction-shaped records, PER_PATIENT per patient"""
+    return [
+        {
+            "patient_id": str((first + index) // PER_PATIENT + 1),
+            "age": 40 + index % 40, "chol": 180 + index % 120, "trestbps": 120 + index % 40,
+            "probability": (index % 100) / 100,
+            "risk_level": "High Risk" if index % 3 == 0 else "Low Risk",
+            "model_version": "v0001",
+            "created_at": "2025-01-01T00:00:00"
+        }
+        for index in range(count)
+    ]
+
+async def rate(operation, items):
+    """Operations per second of awaiting operation(item) for every item"""
+    start = time.perf_counter()
+    for item in items:
+        await operation(item)
+    return len(items) / (time.perf_counter() - start)
+
+async def run_engine(engine, records, batch, sqlite_path):
+    storage = open_storage(engine, sqlite_path=sqlite_path)
+    await storage.connect()
+    predictions = storage.predictions
+    try:
+        single = await rate(predictions.insert, make_predictions(min(records, 20_000)))
+        
+        start = time.perf_counter()
+        inserted = min(records, 20_000)
+        while inserted < records:
+            chunk = min(batch, records - inserted)
+            await predictions.insert_many(make_predictions(chunk, inserted))
+            inserted += chunk
+        bulk = (records - min(records, 20_000)) / (time.perf_counter() - start) if records > 20_000 else float("nan")
+        
+        rng = random.Random(0)
+        ids = [record["id"] for record in await predictions.all()]
+        by_id = await rate(predictions.get, rng.sample(ids, min(len(ids), 10_000)))
+        patients = [str(rng.randrange(records // PER_PATIENT) + 1) for _ in range(5_000)]
+        by_patient = await rate(lambda patient_id: predictions.find_by("patient_id", patient_id), patients)
+        counts = await rate(lambda _: predictions.count(), range(200))
+        return single, bulk, by_id, by_patient, counts
+    finally:
+        if engine == "mongo":
+            from backend.database import database
+            if database is not None:
+                await database.predictions.drop()
+        await storage.close()
+
+async def run(args):
+    print(f"🫀 Storage engines, {args.records} predictions ({PER_PATIENT} per patient), operations per second")
+    print("=" * 86)
+    print(f"{'engine':<8}  {'insert':>9}  {'insert_many':>11}  {'get(id)':>9}  {'find_by patient':>15}  {'count':>9}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in args.engines.split(","):
+            try:
+                results = await run_engine(engine, args.records, args.batch, os.path.join(tmp, f"{engine}.db"))
+            except Exception as e:
+                print(f"{engine:<8}  skipped: {e}")
+                continue
+            single, bulk, by_id, by_patient, counts = results
+            print(f"{engine:<8}  {single:9.0f}  {bulk:11.0f}  {by_id:9.0f}  {by_patient:15.0f}  {counts:9.0f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000, help="predictions stored per engine")
+    parser.add_argument("--batch", type=int, default=5_000, help="records per insert_many call")
+    parser.add_argument("--engines", default="memory,sqlite", help="comma-separated: memory, sqlite, mongo")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: out-of-core training vs loading the whole CSV
+
+Writes synthetic extracts (backend.synthetic, fitted to
+heart_disease_data.csv) and measures wall-clock time and peak RSS of
+each training mode in a fresh interpreter.
+Run from the project root:
+    python -m benchmarks.bench_stream_train                      # 1M and 10M rows
+    python -m benchmarks.bench_stream_train --rows 100000,1000000 --skip-in-memory
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.synthetic import write_csv
+
+# Peak RSS of the child process; ru_maxrss is in KiB on Linux
+MEASURE = """
+import json, resource, time
+start = time.perf_counter()
+{body}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+STREAMING = """
+from backend.stream_train import train_streaming
+train_streaming({path!r}, {output!r}, chunksize={chunksize})
+"""
+
+# What train_model does today: one DataFrame for the whole file
+IN_MEMORY = """
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+data = pd.read_csv({path!r})
+LogisticRegression(max_iter=200).fit(data.drop(columns="target"), data["target"])
+"""
+
+def measure(body):
+    """Run body in a new interpreter and return its timing and peak RSS"""
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(body=body)], check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", default="1000000,10000000", help="comma-separated synthetic file sizes")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--skip-in-memory", action="store_true", help="only measure streaming training")
+    args = parser.parse_args(argv)
+    
+    print("🫀 Training peak RSS (fresh interpreter per run)")
+    print("=" * 72)
+    print(f"{'rows':>11}  {'file MB':>8}  {'mode':<10}  {'seconds':>8}  {'peak RSS MB':>11}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "model.bin")
+        for rows in (int(value) for value in args.rows.split(",")):
+            path = os.path.join(tmp, f"synthetic_{rows}.csv")
+            start = time.perf_counter()
+            write_csv(path, rows)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{'':>11}  (wrote {rows} rows in {time.perf_counter() - start:.1f}s)")
+            
+            modes = [("streaming", STREAMING.format(path=path, output=output, chunksize=args.chunksize))]
+            if not args.skip_in_memory:
+                modes.append(("in-memory", IN_MEMORY.format(path=path)))
+            for label, body in modes:
+                try:
+                    result = measure(body)
+                    print(f"{rows:>11}  {size_mb:8.1f}  {label:<10}  {result['seconds']:8.2f}  {result['peak_rss_mb']:11.1f}")
+                except subprocess.CalledProcessError:
+                    print(f"{rows:>11}  {size_mb:8.1f}  {label:<10}  {'failed (out of memory?)':>21}")
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
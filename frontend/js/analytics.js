@@ -263,7 +263,10 @@ class AnalyticsManager {
     
     async loadMonthlyPredictionsChart() {
         try {
-            const response = await this.app.apiCall('/analytics/predictions-timeline', 'GET');
+            // Last twelve calendar months, bucketed by the API
+            const now = new Date();
+            const from = new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth() - 11, 1)).toISOString().split('T')[0];
+            const response = await this.app.apiCall(`/analytics/predictions-timeline?granularity=month&from=${from}`, 'GET');
             if (response.ok) {
                 const data = await response.json();
                 this.createMonthlyPredictionsChart(data);
@@ -332,27 +335,14 @@ class AnalyticsManager {
     }
     
     processMonthlyData(data) {
-        // Group data by month
-        const monthlyGroups = {};
-        
-        data.forEach(item => {
-            const date = new Date(item.date);
-            const monthKey = `${date.getFullYear()}-${(date.getMonth() + 1).toString().padStart(2, '0')}`;
-            
-            if (!monthlyGroups[monthKey]) {
-                monthlyGroups[monthKey] = 0;
-            }
-            monthlyGroups[monthKey] += item.count;
-        });
-        
-        // Convert to arrays
-        const labels = Object.keys(monthlyGroups).map(key => {
-            const [year, month] = key.split('-');
+        // The API returns one bucket per month, starting on the 1st
+        const labels = data.map(item => {
+            const [year, month] = item.date.split('-');
             const date = new Date(year, month - 1);
             return date.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
         });
         
-        const values = Object.values(monthlyGroups);
+        const values = data.map(item => item.count);
         
         return { labels, values };
     }
@@ -4,6 +4,9 @@ class PatientsManager {
     constructor(app) {
         this.app = app;
         this.patients = [];
+        // Cursor of the next page of GET /patients, null once everything is loaded
+        this.nextCursor = null;
+        this.pageSize = 50;
         this.currentStep = 1;
         this.setupEventListeners();
     }
@@ -13,13 +16,23 @@ class PatientsManager {
         document.getElementById('addPatientForm').addEventListener('submit', this.handleAddPatient.bind(this));
     }
     
+    patientsPageUrl(cursor) {
+        // Newest first, matching where handleAddPatient inserts new rows
+        let url = `/patients?sort=created_at&order=desc&limit=${this.pageSize}`;
+        if (cursor) {
+            url += `&after=${encodeURIComponent(cursor)}`;
+        }
+        return url;
+    }
+    
     async loadPatients() {
         try {
             this.app.showLoading();
             
-            const response = await this.app.apiCall('/patients', 'GET');
+            const response = await this.app.apiCall(this.patientsPageUrl(null), 'GET');
             if (response.ok) {
                 this.patients = await response.json();
+                this.nextCursor = response.headers.get('X-Next-Cursor');
                 this.displayPatients();
             } else {
                 this.app.showToast('Error loading patients', 'error');
@@ -33,6 +46,24 @@ class PatientsManager {
         }
     }
     
+    async loadMorePatients() {
+        if (!this.nextCursor) return;
+        
+        try {
+            const response = await this.app.apiCall(this.patientsPageUrl(this.nextCursor), 'GET');
+            if (response.ok) {
+                this.patients = this.patients.concat(await response.json());
+                this.nextCursor = response.headers.get('X-Next-Cursor');
+                this.displayPatients();
+            } else {
+                this.app.showToast('Error loading patients', 'error');
+            }
+        } catch (error) {
+            console.error('Patients error:', error);
+            this.app.showToast('Network error loading patients', 'error');
+        }
+    }
+    
     displayPatients() {
         const tbody = document.getElementById('patientsTableBody');
         tbody.innerHTML = '';
@@ -42,6 +73,11 @@ class PatientsManager {
             tbody.appendChild(row);
         });
         
+        const loadMore = document.getElementById('loadMorePatients');
+        if (loadMore) {
+            loadMore.style.display = this.nextCursor ? '' : 'none';
+        }
+        
         // Animate rows
         gsap.from('#patientsTableBody tr', {
             duration: 0.5,
@@ -16,9 +16,8 @@ class PredictionsManager {
         try {
             this.app.showLoading();
             
-            // For now, we'll load all patients and their predictions
-            // In a real app, you might want to paginate this
-            const patientsResponse = await this.app.apiCall('/patients', 'GET');
+            // Predictions of the most recently added patients, one page of them
+            const patientsResponse = await this.app.apiCall('/patients?sort=created_at&order=desc&fields=name,email&limit=50', 'GET');
             if (patientsResponse.ok) {
                 const patients = await patientsResponse.json();
                 await this.loadPredictionsForPatients(patients);
@@ -125,21 +124,31 @@ class PredictionsManager {
     
     async loadPatientsForSelect() {
         try {
-            const response = await this.app.apiCall('/patients', 'GET');
-            if (response.ok) {
-                const patients = await response.json();
-                const select = document.getElementById('patientSelect');
-                
-                // Clear existing options except the first one
-                select.innerHTML = '<option value="">Choose a patient...</option>';
+            const select = document.getElementById('patientSelect');
+            
+            // Clear existing options except the first one
+            select.innerHTML = '<option value="">Choose a patient...</option>';
+            
+            // Only what the options show, in the largest pages the API allows,
+            // following X-Next-Cursor until every patient is listed
+            let cursor = null;
+            do {
+                let url = '/patients?sort=name&fields=name,email&limit=1000';
+                if (cursor) {
+                    url += `&after=${encodeURIComponent(cursor)}`;
+                }
+                const response = await this.app.apiCall(url, 'GET');
+                if (!response.ok) break;
                 
+                const patients = await response.json();
                 patients.forEach(patient => {
                     const option = document.createElement('option');
                     option.value = patient.id;
                     option.textContent = `${patient.name} (${patient.email})`;
                     select.appendChild(option);
                 });
-            }
+                cursor = response.headers.get('X-Next-Cursor');
+            } while (cursor);
         } catch (error) {
             console.error('Error loading patients for select:', error);
         }
@@ -13,6 +13,16 @@ import os
 from pathlib import Path
 import json
 
+from backend.storage import open_storage
+
+# The trained model needs NumPy/SciPy; without them the server falls back to the heuristic
+try:
+    from backend.ml_model import clinical_row
+    from backend.model_registry import ModelRegistry
+except ImportError as e:
+    ModelRegistry = None
+    print(f"⚠️ Model dependencies not installed ({e}), predictions will use the heuristic")
+
 # Simple in-memory storage
 users_db = {
     "admin@heartpredict.com": {
@@ -33,8 +43,16 @@ users_db = {
     }
 }
 
-patients_db = []
-predictions_db = []
+# In-memory by default, made durable by a write-ahead log in its own directory
+# (MINIMAL_DATA_DIR), so it never replays or appends to the main server's log
+MINIMAL_DATA_DIR = os.getenv("MINIMAL_DATA_DIR", "data-minimal")
+storage = open_storage(data_dir=MINIMAL_DATA_DIR)
+patients_db = storage.patients
+predictions_db = storage.predictions
+
+# "model" scores with the trained model; "heuristic" is an explicit fallback mode
+PREDICTION_MODE = os.getenv("PREDICTION_MODE", "model" if ModelRegistry is not None else "heuristic")
+predictor = None
 
 app = FastAPI(
     title="Heart Disease Prediction API",
@@ -60,6 +78,20 @@ try:
 except Exception as e:
     print(f"⚠️ Could not mount static files: {e}")
 
+@app.on_event("startup")
+async def load_model():
+    """Load the shared predictor once, before serving requests"""
+    global predictor
+    await storage.connect()
+    if PREDICTION_MODE == "model":
+        predictor = ModelRegistry().load_current()
+        print(f"✅ Serving model version {predictor.version}")
+
+@app.on_event("shutdown")
+async def close_storage():
+    """Flush and snapshot the stores"""
+    await storage.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Serve the main HTML page"""
@@ -196,30 +228,27 @@ async def login(credentials: dict):
 @app.get("/api/dashboard/stats")
 async def get_dashboard_stats():
     """Get dashboard statistics"""
+    predictions = await predictions_db.all()
     return {
-        "total_patients": len(patients_db),
-        "high_risk_patients": len([p for p in predictions_db if p.get("risk_level") == "High Risk"]),
-        "recent_predictions": len([p for p in predictions_db if (datetime.utcnow() - datetime.fromisoformat(p.get("created_at", "2024-01-01T00:00:00"))).days <= 7]),
-        "total_predictions": len(predictions_db)
+        "total_patients": await patients_db.count(),
+        "high_risk_patients": len([p for p in predictions if p.get("risk_level") == "High Risk"]),
+        "recent_predictions": len([p for p in predictions if (datetime.utcnow() - datetime.fromisoformat(p.get("created_at", "2024-01-01T00:00:00"))).days <= 7]),
+        "total_predictions": len(predictions)
     }
 
 @app.post("/api/patients")
 async def create_patient(patient: dict):
     """Create a new patient"""
-    patient["id"] = str(len(patients_db) + 1)
     patient["created_at"] = datetime.utcnow().isoformat()
-    patients_db.append(patient)
-    return patient
+    return await patients_db.insert(patient)
 
 @app.get("/api/patients")
 async def get_patients():
     """Get all patients"""
-    return patients_db
+    return await patients_db.all()
 
-@app.post("/api/predictions")
-async def create_prediction(prediction_data: dict):
-    """Create heart disease prediction"""
-    # Simple mock prediction logic
+def heuristic_risk(prediction_data):
+    """Additive rule-of-thumb risk score, used only when PREDICTION_MODE=heuristic"""
     age = prediction_data.get("age", 50)
     chol = prediction_data.get("chol", 200)
     trestbps = prediction_data.get("trestbps", 120)
@@ -234,28 +263,44 @@ async def create_prediction(prediction_data: dict):
     
     probability = min(risk_score, 0.95)
     risk_level = "High Risk" if probability >= 0.5 else "Low Risk"
+    return probability, risk_level
+
+@app.post("/api/predictions")
+async def create_prediction(prediction_data: dict):
+    """Create heart disease prediction"""
+    if PREDICTION_MODE == "heuristic":
+        probability, risk_level = heuristic_risk(prediction_data)
+        model_version = "heuristic"
+    else:
+        try:
+            features = clinical_row(prediction_data)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        
+        probability, risk_level = predictor.predict(features)
+        model_version = predictor.version
     
     prediction = {
         **prediction_data,
-        "id": str(len(predictions_db) + 1),
         "probability": probability,
         "risk_level": risk_level,
+        "model_version": model_version,
         "created_at": datetime.utcnow().isoformat()
     }
     
-    predictions_db.append(prediction)
-    return prediction
+    return await predictions_db.insert(prediction)
 
 @app.get("/api/predictions/{patient_id}")
 async def get_patient_predictions(patient_id: str):
     """Get predictions for a patient"""
-    return [p for p in predictions_db if p.get("patient_id") == patient_id]
+    return await predictions_db.find_by("patient_id", patient_id)
 
 @app.get("/api/analytics/risk-distribution")
 async def get_risk_distribution():
     """Get risk distribution analytics"""
-    high_risk = len([p for p in predictions_db if p.get("risk_level") == "High Risk"])
-    low_risk = len([p for p in predictions_db if p.get("risk_level") == "Low Risk"])
+    predictions = await predictions_db.all()
+    high_risk = len([p for p in predictions if p.get("risk_level") == "High Risk"])
+    low_risk = len([p for p in predictions if p.get("risk_level") == "Low Risk"])
     
     return [
         {"risk_level": "Low Risk", "count": max(low_risk, 15)},
@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Model artifacts and the registry live in a scratch directory for the whole
+# session, so tests never overwrite backend/heart_disease_model.bin or move
+# backend/models/CURRENT. Set before backend modules read them at import.
+MODEL_DIR = tempfile.mkdtemp(prefix="heart-models-")
+os.environ["MODEL_PATH"] = os.path.join(MODEL_DIR, "heart_disease_model.bin")
+os.environ["MODEL_REGISTRY_DIR"] = os.path.join(MODEL_DIR, "models")
+
+from backend import auth, main
+
+def pytest_unconfigure(config):
+    shutil.rmtree(MODEL_DIR, ignore_errors=True)
+
+async def bearer_for(email):
+    """Authorization header for one of the demo accounts, seeded into the doctors collection"""
+    await main.seed_doctors()
+    user = main.users_db[email]
+    token = auth.create_access_token({"sub": email, "role": user["role"]})
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+async def admin_headers():
+    return await bearer_for("admin@heartpredict.com")
+
+@pytest.fixture
+async def doctor_headers():
+    return await bearer_for("dr.smith@heartpredict.com")
@@ -1,6 +1,10 @@
 import pytest
 import asyncio
+import threading
+import time
 from httpx import AsyncClient
+from backend import auth
+from backend.executor import BoundedExecutor
 from backend.main import app
 
 @pytest.fixture
@@ -62,4 +66,47 @@ async def test_protected_route_with_invalid_token(client):
     headers = {"Authorization": "Bearer invalid_token"}
     response = await client.get("/api/dashboard/stats", headers=headers)
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+@pytest.mark.anyio
+async def test_login_fails_fast_when_password_pool_is_full(client, monkeypatch):
+    """Test that logins beyond the bcrypt pool's queue get 503 instead of waiting"""
+    executor = BoundedExecutor("password", max_workers=1, max_queue=0)
+    monkeypatch.setattr(auth, "password_executor", executor)
+    release = threading.Event()
+    blocker = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    
+    response = await client.post("/api/auth/login", json={
+        "email": "admin@heartpredict.com",
+        "password": "admin123"
+    })
+    
+    release.set()
+    await blocker
+    executor.shutdown()
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+@pytest.mark.anyio
+async def test_health_responds_during_logins(client):
+    """Test that bcrypt runs off the event loop while logins are in flight"""
+    logins = [
+        asyncio.ensure_future(client.post("/api/auth/login", json={
+            "email": "dr.smith@heartpredict.com",
+            "password": "doctor123"
+        }))
+        for _ in range(4)
+    ]
+    await asyncio.sleep(0.05)
+    
+    start = time.perf_counter()
+    health = await client.get("/api/health")
+    elapsed = time.perf_counter() - start
+    responses = await asyncio.gather(*logins)
+    
+    assert health.status_code == 200
+    # One bcrypt verification alone takes a few hundred milliseconds
+    assert elapsed < 0.2
+    assert all(response.status_code == 200 for response in responses)
@@ -0,0 +1,119 @@
+import pytest
+from datetime import timedelta
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from jose import jwt
+from backend import auth
+from backend.prediction_cache import PredictionCache
+from backend.storage import open_storage
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth, "token_cache", PredictionCache(100, 300, clock=clock))
+    monkeypatch.setattr(auth, "doctor_cache", PredictionCache(100, 60, clock=clock))
+    monkeypatch.setattr(auth, "_doctor_generations", {})
+    return clock
+
+@pytest.fixture
+async def doctors(monkeypatch):
+    """In-memory doctors collection wired up as the auth store, counting lookups"""
+    doctors = open_storage("memory", data_dir="").doctors
+    await doctors.insert({"email": "dr.smith@heartpredict.com", "role": "doctor"})
+    doctors.queries = 0
+    find_by = doctors.find_by
+    
+    async def counting_find_by(field, value):
+        doctors.queries += 1
+        return await find_by(field, value)
+    
+    doctors.find_by = counting_find_by
+    monkeypatch.setattr(auth, "doctor_store", None)
+    auth.use_doctor_store(doctors)
+    return doctors
+
+@pytest.fixture
+async def client(doctors):
+    app = FastAPI()
+    
+    @app.get("/me")
+    async def me(user=Depends(auth.get_current_user)):
+        return user
+    
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+def bearer(expires_delta=timedelta(minutes=30), email="dr.smith@heartpredict.com"):
+    token = auth.create_access_token({"sub": email, "role": "doctor"}, expires_delta)
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.mark.anyio
+async def test_repeated_requests_hit_the_caches(client, doctors, clock, monkeypatch):
+    """Test that a token is decoded and its doctor fetched once across requests"""
+    decodes = []
+    decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decodes.append(1) or decode(*args, **kwargs))
+    headers = bearer()
+    
+    for _ in range(5):
+        response = await client.get("/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"email": "dr.smith@heartpredict.com", "role": "doctor", "doctor_id": "1"}
+    
+    assert len(decodes) == 1
+    assert doctors.queries == 1
+
+@pytest.mark.anyio
+async def test_token_entry_never_outlives_exp(client, clock, monkeypatch):
+    """Test that a cached token is verified again once its exp has passed"""
+    decodes = []
+    decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decodes.append(1) or decode(*args, **kwargs))
+    headers = bearer(timedelta(seconds=5))
+    assert (await client.get("/me", headers=headers)).status_code == 200
+    clock.now += 4
+    assert (await client.get("/me", headers=headers)).status_code == 200
+    assert len(decodes) == 1
+    
+    clock.now += 2
+    await client.get("/me", headers=headers)
+    assert len(decodes) == 2
+
+@pytest.mark.anyio
+async def test_store_writes_invalidate_role_change_and_deactivation(client, doctors, clock):
+    """Test that updating a doctor through the store drops the cached principal and token"""
+    headers = bearer()
+    assert (await client.get("/me", headers=headers)).json()["role"] == "doctor"
+    
+    await doctors.update("1", {"role": "admin"})
+    assert (await client.get("/me", headers=headers)).json()["role"] == "admin"
+    
+    await doctors.update("1", {"is_active": False})
+    assert (await client.get("/me", headers=headers)).status_code == 401
+    
+    await doctors.update("1", {"is_active": True})
+    assert (await client.get("/me", headers=headers)).status_code == 200
+    await doctors.delete("1")
+    assert (await client.get("/me", headers=headers)).status_code == 401
+
+@pytest.mark.anyio
+async def test_invalid_tokens_are_not_cached(client, clock):
+    """Test that rejected tokens and unknown doctors leave the caches empty"""
+    response = await client.get("/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    response = await client.get("/me", headers=bearer(email="unknown@heartpredict.com"))
+    assert response.status_code == 401
+    
+    assert len(auth.doctor_cache) == 0
+    assert [email for _, (email, _, _) in auth.token_cache._entries.values()] == ["unknown@heartpredict.com"]
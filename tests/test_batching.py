@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.batching import MicroBatcher
+from backend.main import app
+from backend.ml_model import FEATURE_NAMES
+
+RECORD = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.mark.anyio
+async def test_concurrent_submits_are_batched():
+    """Test that concurrent callers share one handler call and get their own result"""
+    calls = []
+    
+    def handler(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+    
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait_ms=50)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    await batcher.stop()
+    
+    assert results == [i * 2 for i in range(10)]
+    assert len(calls) == 1
+    assert batcher.metrics()["avg_batch_size"] == 10
+
+@pytest.mark.anyio
+async def test_max_batch_size_is_respected():
+    """Test that batches never exceed the configured size"""
+    sizes = []
+    
+    def handler(items):
+        sizes.append(len(items))
+        return items
+    
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=50)
+    await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    await batcher.stop()
+    
+    assert sizes == [4, 4, 2]
+    assert batcher.metrics()["max_observed_batch"] == 4
+
+@pytest.mark.anyio
+async def test_full_batch_flushes_before_the_deadline():
+    """Test that items arriving while a batch is being collected trigger the early flush"""
+    batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=5000)
+    first = [asyncio.ensure_future(batcher.submit(i)) for i in range(2)]
+    await asyncio.sleep(0.01)
+    
+    results = await asyncio.wait_for(asyncio.gather(*first, batcher.submit(2), batcher.submit(3)), 1)
+    await batcher.stop()
+    
+    assert results == [0, 1, 2, 3]
+    assert batcher.metrics()["total_batches"] == 1
+
+@pytest.mark.anyio
+async def test_batches_run_concurrently_up_to_max_concurrency():
+    """Test that up to max_concurrency handler calls are in flight at once"""
+    running = []
+    peak = []
+    
+    async def handler(items):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.pop()
+        return items
+    
+    batcher = MicroBatcher(handler, max_batch_size=1, max_wait_ms=0, max_concurrency=2)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+    await batcher.stop()
+    
+    assert results == list(range(6))
+    assert max(peak) == 2
+
+@pytest.mark.anyio
+async def test_handler_errors_reach_every_caller():
+    """Test that a failing batch rejects all of its callers"""
+    def handler(items):
+        raise RuntimeError("model unavailable")
+    
+    batcher = MicroBatcher(handler, max_batch_size=8, max_wait_ms=10)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    await batcher.stop()
+    
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.anyio
+async def test_score_prediction_matches_predictor():
+    """Test that micro-batched scores equal direct predictor scores"""
+    results = await asyncio.gather(*(main.score_prediction({**RECORD, "age": age}) for age in range(40, 60)))
+    
+    for age, (probability, risk_level, version) in zip(range(40, 60), results):
+        expected = main.get_predictor().predict([{**RECORD, "age": age}[name] for name in FEATURE_NAMES])
+        assert probability == pytest.approx(expected[0])
+        assert risk_level == expected[1]
+        assert version == main.get_predictor().version
+    
+    with pytest.raises(ValueError):
+        await main.score_prediction({"age": 54})
+
+@pytest.mark.anyio
+async def test_inference_metrics_endpoint():
+    """Test the batching metrics endpoint"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/metrics/inference")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "queue_depth" in data
+    assert "avg_batch_size" in data
@@ -0,0 +1,77 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from httpx import AsyncClient
+from backend import dataset
+from backend.main import app
+from backend.ml_model import FEATURE_NAMES
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Private copy of the dataset so each test builds its own cache"""
+    path = tmp_path / "heart.csv"
+    shutil.copy(dataset.DATA_PATH, path)
+    return str(path)
+
+def test_cache_matches_csv(csv_path):
+    """Test that the cached columns equal the parsed CSV, BOM header included"""
+    frame = pd.read_csv(csv_path)
+    X, y = dataset.load_arrays(csv_path)
+    columns = dataset.load_columns(csv_path)
+    
+    assert dataset.cache_is_fresh(csv_path)
+    assert isinstance(columns["age"], np.memmap)
+    assert columns["age"].dtype == np.int16
+    np.testing.assert_array_equal(X, frame[FEATURE_NAMES].to_numpy(dtype=np.float64))
+    np.testing.assert_array_equal(y, frame["target"].to_numpy())
+
+def test_cache_rebuilt_when_csv_changes(csv_path):
+    """Test that editing the CSV invalidates the cache"""
+    dataset.build_cache(csv_path)
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("50,1,0,130,250,0,1,150,0,1.0,1,0,2,1\n\n")
+    
+    assert not dataset.cache_is_fresh(csv_path)
+    X, y = dataset.load_arrays(csv_path)
+    
+    assert len(y) == 304
+    assert X[-1, 0] == 50
+    assert dataset.cache_is_fresh(csv_path)
+
+def test_cache_usable_without_csv(csv_path):
+    """Test that a shipped cache loads even when the CSV is absent"""
+    dataset.build_cache(csv_path)
+    os.remove(csv_path)
+    
+    assert len(dataset.load_columns(csv_path)["target"]) == 303
+    with pytest.raises(FileNotFoundError):
+        dataset.load_columns(csv_path + ".missing")
+
+def test_iter_chunks_reads_cache(csv_path):
+    """Test that chunks sliced from the cache equal chunks parsed from the CSV"""
+    parsed = list(dataset.iter_chunks(csv_path, chunksize=100))
+    dataset.build_cache(csv_path)
+    cached = list(dataset.iter_chunks(csv_path, chunksize=100))
+    
+    assert len(cached) == len(parsed) == 4
+    for (parsed_X, parsed_y), (cached_X, cached_y) in zip(parsed, cached):
+        np.testing.assert_array_equal(parsed_X, cached_X)
+        np.testing.assert_array_equal(parsed_y, cached_y)
+
+@pytest.mark.anyio
+async def test_dataset_summary_endpoint():
+    """Test the dataset summary analytics"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/analytics/dataset-summary")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rows"] == 303
+    assert [feature["feature"] for feature in data["features"]] == FEATURE_NAMES
+    assert data["features"][0]["min"] == 29
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.executor import BoundedExecutor, ExecutorSaturated
+from backend.main import app
+from backend.ml_model import FEATURE_NAMES
+from backend.model_registry import ModelRegistry
+
+RECORD = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+@pytest.mark.anyio
+async def test_executor_rejects_when_saturated():
+    """Test that jobs beyond workers + queue fail fast"""
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    
+    running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    
+    with pytest.raises(ExecutorSaturated):
+        await executor.run(sum, [1, 2])
+    
+    release.set()
+    await asyncio.gather(*running)
+    assert await executor.run(sum, [1, 2]) == 3
+    assert executor.metrics()["rejected"] == 1
+    executor.shutdown()
+
+@pytest.mark.anyio
+async def test_saturated_inference_returns_503(client, monkeypatch):
+    """Test that a full inference pool surfaces as 503 with Retry-After"""
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    monkeypatch.setattr(main, "inference_executor", executor)
+    release = threading.Event()
+    blocker = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    
+    response = await client.post("/api/predictions/batch", json={"records": [RECORD]})
+    health = await client.get("/api/health")
+    
+    release.set()
+    await blocker
+    executor.shutdown()
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+
+@pytest.mark.anyio
+async def test_feature_importance_endpoint(client):
+    """Test the global feature importance precomputed at model load"""
+    response = await client.get("/api/analytics/feature-importance")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(item["feature"] for item in data) == sorted(FEATURE_NAMES)
+    assert data[0]["importance"] >= data[-1]["importance"]
+
+@pytest.mark.anyio
+async def test_train_endpoint_registers_version(client, monkeypatch, tmp_path, admin_headers):
+    """Test training a new version in the worker process pool"""
+    registry = ModelRegistry(str(tmp_path / "models"))
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "predictor", None)
+    
+    response = await client.post("/api/admin/models/train", json={"promote": True}, headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert response.json() == {"version": "v0001", "promoted": True}
+    assert registry.current_version() == "v0001"
+    assert main.get_predictor().version == "v0001"
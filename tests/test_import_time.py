@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+# Cumulative `python -X importtime` budget for `import backend.main`, in ms
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+# Training, legacy-pickle and auth libraries that importing the app must not load
+DEFERRED_MODULES = ("sklearn", "pandas", "joblib", "scipy", "jose", "passlib", "motor")
+
+def run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+def import_time_ms(module):
+    """Cumulative import time of module in a fresh interpreter, from -X importtime"""
+    for line in run_python(f"import {module}", "-X", "importtime").stderr.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[1].strip() == module:
+            return int(line.split("|")[1]) / 1000
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+def test_import_defers_heavy_modules():
+    """Test that importing the app leaves training and auth libraries unloaded"""
+    code = f"import sys, backend.main; print('loaded:', [m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    assert "loaded: []" in run_python(code).stdout.splitlines()
+
+def test_import_time_budget():
+    """Test that `import backend.main` stays within IMPORT_TIME_BUDGET_MS (best of 3 runs)"""
+    best = min(import_time_ms("backend.main") for _ in range(3))
+    assert best <= IMPORT_TIME_BUDGET_MS, f"import backend.main took {best:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)"
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.ml_model import HeartDiseasePredictor, FEATURE_NAMES
+from backend import model_artifact
+
+SAMPLE_ROW = [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]
+
+@pytest.fixture(scope="module")
+def predictor():
+    return HeartDiseasePredictor()
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    """A freshly trained estimator and a predictor serving its exported artifact"""
+    trainer = HeartDiseasePredictor()
+    trainer.train_model()
+    path = tmp_path_factory.mktemp("model") / "model.bin"
+    trainer.save_artifact(path)
+    return trainer.model, HeartDiseasePredictor(model_path=str(path))
+
+def test_predict_batch_matches_single_predictions(predictor):
+    """Test that batch scoring agrees with row-by-row scoring"""
+    rows = [SAMPLE_ROW, [63, 1, 3, 145, 233, 1, 0, 150, 0, 2.3, 0, 0, 1]]
+    probabilities, risk_levels = predictor.predict_batch(np.array(rows))
+    
+    assert probabilities.shape == (2,)
+    for row, probability, risk_level in zip(rows, probabilities, risk_levels):
+        single_probability, single_risk = predictor.predict(row)
+        assert probability == pytest.approx(single_probability)
+        assert risk_level == single_risk
+
+def test_predict_batch_accepts_dicts_and_dataframe(predictor):
+    """Test the list-of-dicts and DataFrame input formats"""
+    record = dict(zip(FEATURE_NAMES, SAMPLE_ROW))
+    from_dicts, _ = predictor.predict_batch([record, record])
+    from_frame, _ = predictor.predict_batch(pd.DataFrame([{**record, "patient_id": "1"}]))
+    from_array, _ = predictor.predict_batch([SAMPLE_ROW])
+    
+    assert from_dicts[0] == pytest.approx(from_array[0])
+    assert from_dicts[1] == pytest.approx(from_array[0])
+    assert from_frame[0] == pytest.approx(from_array[0])
+
+def test_predict_batch_rejects_bad_shapes(predictor):
+    """Test that malformed batches raise ValueError"""
+    with pytest.raises(ValueError):
+        predictor.predict_batch([SAMPLE_ROW[:5]])
+    with pytest.raises(ValueError):
+        predictor.predict_batch([{"age": 54}])
+
+def test_predict_batch_empty(predictor):
+    """Test that an empty batch returns empty results"""
+    probabilities, risk_levels = predictor.predict_batch([])
+    assert len(probabilities) == 0
+    assert len(risk_levels) == 0
+
+def _clinical_rows(n, seed=0):
+    """Perturbed rows from the real dataset, covering the whole probability range"""
+    data = pd.read_csv("heart_disease_data.csv").drop(columns="target").to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    return data[rng.integers(0, len(data), n)] * rng.uniform(0.5, 1.5, (n, data.shape[1]))
+
+@pytest.mark.filterwarnings("ignore:X does not have valid feature names")
+def test_numpy_kernel_bit_parity_batch(trained):
+    """Test that the NumPy kernel reproduces sklearn's predict_proba exactly"""
+    estimator, predictor = trained
+    rows = _clinical_rows(10000)
+    expected = estimator.predict_proba(rows)[:, 1]
+    
+    np.testing.assert_array_equal(predictor.score(rows), expected)
+    np.testing.assert_array_equal(predictor.predict_batch(rows)[0], expected)
+
+@pytest.mark.filterwarnings("ignore:X does not have valid feature names")
+def test_numpy_kernel_bit_parity_single(trained):
+    """Test that single-row predictions match sklearn exactly"""
+    estimator, predictor = trained
+    for row in _clinical_rows(200, seed=1):
+        expected = estimator.predict_proba(row.reshape(1, -1))[0][1]
+        assert predictor.predict(row.tolist())[0] == expected
+
+def test_numpy_kernel_float32():
+    """Test the optional float32 kernel stays close to the float64 result"""
+    predictor64 = HeartDiseasePredictor()
+    predictor32 = HeartDiseasePredictor(dtype=np.float32)
+    rows = _clinical_rows(1000)
+    
+    assert predictor32.coef.dtype == np.float32
+    assert predictor32.coef.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(predictor32.score(rows), predictor64.score(rows), atol=1e-5)
+
+
+def test_artifact_roundtrip_is_memory_mapped(trained, tmp_path):
+    """Test that artifacts load as read-only memory maps with their metadata"""
+    estimator, predictor = trained
+    
+    assert isinstance(predictor.weights["coef"], np.memmap)
+    assert not predictor.weights["coef"].flags["WRITEABLE"]
+    np.testing.assert_array_equal(predictor.coef, estimator.coef_[0])
+    assert predictor.metadata["model_type"] == "LogisticRegression"
+
+def test_artifact_folds_scaler_stats(tmp_path):
+    """Test that scaler statistics stored in the artifact are applied when scoring"""
+    rng = np.random.default_rng(0)
+    coef, mean, scale = rng.normal(size=13), rng.normal(size=13), rng.uniform(1, 2, 13)
+    path = tmp_path / "scaled.bin"
+    model_artifact.save_artifact(path, coef, 0.25, FEATURE_NAMES, scaler_mean=mean, scaler_scale=scale)
+    
+    rows = rng.normal(size=(50, 13))
+    expected = 1 / (1 + np.exp(-(((rows - mean) / scale) @ coef + 0.25)))
+    np.testing.assert_allclose(HeartDiseasePredictor(model_path=str(path)).score(rows), expected)
+
+def test_convert_legacy_pickle(trained, tmp_path):
+    """Test converting a joblib pickle into an artifact"""
+    import joblib
+    estimator, predictor = trained
+    joblib.dump(estimator, tmp_path / "model.pkl")
+    
+    header = model_artifact.convert_pickle(tmp_path / "model.pkl", tmp_path / "model.bin", FEATURE_NAMES)
+    converted = HeartDiseasePredictor(model_path=str(tmp_path / "model.bin"))
+    
+    assert header["metadata"]["source"] == "model.pkl"
+    rows = _clinical_rows(100)
+    np.testing.assert_array_equal(converted.score(rows), predictor.score(rows))
+
+def test_load_rejects_corrupt_artifact(tmp_path):
+    """Test that a file without the artifact header is rejected"""
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a model")
+    
+    with pytest.raises(model_artifact.ArtifactError):
+        model_artifact.load_artifact(path)
+
+def test_explain_batch_decomposes_log_odds(trained):
+    """Test that contributions plus the baseline log-odds reproduce every score"""
+    _, predictor = trained
+    rows = _clinical_rows(200)
+    
+    contributions = predictor.explain_batch(rows)
+    log_odds = predictor.base_score + contributions.sum(axis=1)
+    
+    assert contributions.shape == (200, 13)
+    np.testing.assert_allclose(1 / (1 + np.exp(-log_odds)), predictor.score(rows), rtol=1e-10)
+    np.testing.assert_array_equal(predictor.explain_batch(predictor.baseline[None, :]), np.zeros((1, 13)))
+
+def test_feature_importance_precomputed(trained):
+    """Test that global importances are computed at load, sorted by magnitude"""
+    estimator, predictor = trained
+    importance = predictor.get_feature_importance()
+    
+    assert importance is predictor.get_feature_importance()
+    assert [value for _, value in importance] == sorted(np.abs(estimator.coef_[0]).tolist(), reverse=True)
+    assert len(predictor.metadata["feature_means"]) == 13
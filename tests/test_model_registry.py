@@ -0,0 +1,156 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend import model_artifact
+from backend import model_registry
+from backend.main import app
+from backend.ml_model import FEATURE_NAMES
+from backend.model_registry import ModelRegistry
+
+RECORD = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry with two versions whose weights give different scores"""
+    registry = ModelRegistry(str(tmp_path / "models"))
+    for intercept in (0.0, -3.0):
+        source = tmp_path / f"source{intercept}.bin"
+        model_artifact.save_artifact(source, np.full(13, 0.001), intercept, FEATURE_NAMES)
+        registry.register(source)
+    return registry
+
+@pytest.fixture
+async def client(registry, monkeypatch):
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "predictor", None)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+def test_register_and_promote(registry):
+    """Test that versions are numbered and promotion moves the pointer"""
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.current_version() is None
+    
+    registry.promote("v0002")
+    
+    assert registry.current_version() == "v0002"
+    assert registry.load_current().version == "v0002"
+    assert [m["current"] for m in registry.list_versions()] == [False, True]
+
+def test_concurrent_registrations_get_distinct_versions(registry, tmp_path):
+    """Test that simultaneous register() calls each claim their own version"""
+    source = tmp_path / "source0.0.bin"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = list(pool.map(lambda _: registry.register(source), range(8)))
+    
+    assert sorted(versions) == [f"v{n:04d}" for n in range(3, 11)]
+    assert [m["metadata"]["version"] for m in registry.list_versions()] == registry.versions()
+    assert sorted(os.listdir(registry.root)) == [f"v{n:04d}.bin" for n in range(1, 11)]
+
+def test_train_and_register_trains_once(tmp_path, monkeypatch):
+    """Test that train_and_register fits one model without loading the default one first"""
+    calls = []
+    train = model_registry.HeartDiseasePredictor.train_model
+    monkeypatch.setattr(model_registry.HeartDiseasePredictor, "train_model", lambda self: calls.append(1) or train(self))
+    monkeypatch.setattr(model_registry.HeartDiseasePredictor, "load_or_train_model", lambda self: calls.append("load"))
+    
+    version = model_registry.train_and_register(str(tmp_path / "models"))
+    
+    assert version == "v0001"
+    assert calls == [1]
+
+def test_promote_unknown_version(registry):
+    """Test that promoting a missing version fails without moving the pointer"""
+    registry.promote("v0001")
+    with pytest.raises(KeyError):
+        registry.promote("v0099")
+    assert registry.current_version() == "v0001"
+
+def test_promote_rejects_incomplete_artifacts(registry):
+    """Test that a reserved (still empty) or corrupt version cannot be promoted"""
+    registry.promote("v0001")
+    reserved = registry._reserve_version()
+    with open(registry.artifact_path("v0004"), "wb") as f:
+        f.write(b"not an artifact")
+    
+    with pytest.raises(KeyError):
+        registry.promote(reserved)
+    with pytest.raises(model_artifact.ArtifactError):
+        registry.promote("v0004")
+    assert registry.current_version() == "v0001"
+
+@pytest.mark.anyio
+async def test_promote_endpoint_hot_swaps_model(client, registry, admin_headers):
+    """Test that promoting through the admin API changes scores without a restart"""
+    registry.promote("v0001")
+    before = (await client.post("/api/predictions/batch", json={"records": [RECORD]})).json()
+    
+    response = await client.post("/api/admin/models/v0002/promote", headers=admin_headers)
+    after = (await client.post("/api/predictions/batch", json={"records": [RECORD]})).json()
+    
+    assert response.status_code == 200
+    assert registry.current_version() == "v0002"
+    assert before["predictions"][0]["model_version"] == "v0001"
+    assert after["predictions"][0]["model_version"] == "v0002"
+    assert after["predictions"][0]["probability"] < before["predictions"][0]["probability"]
+
+@pytest.mark.anyio
+async def test_explanation_uses_the_scoring_version(client, registry, monkeypatch):
+    """Test that a score from before a hot swap is explained by the version that produced it"""
+    import math
+    registry.promote("v0001")
+    scored = await main.score_prediction(RECORD)
+    main.swap_predictor("v0002")
+    
+    async def score_before_swap(record):
+        return scored
+    monkeypatch.setattr(main, "score_prediction", score_before_swap)
+    
+    data = (await client.post("/api/predictions?explain=true", json=RECORD)).json()
+    
+    assert data["model_version"] == "v0001"
+    contributions = sum(item["contribution"] for item in data["explanation"]["features"])
+    log_odds = math.log(data["probability"] / (1 - data["probability"]))
+    assert data["explanation"]["base_score"] + contributions == pytest.approx(log_odds)
+
+@pytest.mark.anyio
+async def test_promote_endpoint_unknown_version(client, registry, admin_headers):
+    """Test promoting a version that does not exist"""
+    response = await client.post("/api/admin/models/v0099/promote", headers=admin_headers)
+    
+    assert response.status_code == 404
+
+@pytest.mark.anyio
+async def test_promote_endpoint_rejects_corrupt_version(client, registry, admin_headers):
+    """Test that a corrupt artifact is refused without changing the served model"""
+    registry.promote("v0001")
+    with open(registry.artifact_path("v0003"), "wb") as f:
+        f.write(b"not an artifact")
+    
+    response = await client.post("/api/admin/models/v0003/promote", headers=admin_headers)
+    
+    assert response.status_code == 422
+    assert registry.current_version() == "v0001"
+    assert main.get_predictor().version == "v0001"
+
+@pytest.mark.anyio
+async def test_model_endpoints_require_an_admin(client, registry, doctor_headers):
+    """Test that listing, training and promoting models is refused to anyone but an admin"""
+    registry.promote("v0001")
+    
+    for headers in ({}, doctor_headers):
+        responses = [
+            await client.get("/api/admin/models", headers=headers),
+            await client.post("/api/admin/models/train", json={"promote": True}, headers=headers),
+            await client.post("/api/admin/models/v0002/promote", headers=headers)
+        ]
+        assert all(response.status_code in (401, 403) for response in responses)
+    assert registry.current_version() == "v0001"
+    assert len(registry.list_versions()) == 2
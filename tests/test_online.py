@@ -0,0 +1,211 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend import model_artifact
+from backend.executor import BoundedExecutor
+from backend.main import app
+from backend.ml_model import FEATURE_NAMES, HeartDiseasePredictor
+from backend.model_registry import ModelRegistry
+from backend.online import OnlineLearner, iter_minibatches
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="module")
+def dataset():
+    data = pd.read_csv("heart_disease_data.csv")
+    return data[FEATURE_NAMES].to_numpy(dtype=np.float64), data["target"].to_numpy()
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry serving a deliberately poor model: tiny weights, no scaler statistics"""
+    registry = ModelRegistry(str(tmp_path / "models"))
+    source = tmp_path / "source.bin"
+    model_artifact.save_artifact(source, np.full(13, 0.001), 0.0, FEATURE_NAMES)
+    registry.register(source, promote=True)
+    return registry
+
+def _log_loss(predictor, X, y):
+    probabilities = np.clip(predictor.score(X), 1e-12, 1 - 1e-12)
+    return float(-np.mean(y * np.log(probabilities) + (1 - y) * np.log(1 - probabilities)))
+
+def test_warm_start_keeps_scores(registry, dataset):
+    """Test that standardizing for SGD does not change predictions before the first step"""
+    X, _ = dataset
+    predictor = registry.load_current()
+    before = predictor.score(X)
+    
+    predictor.online_model = predictor.start_online_model(X[:32])
+    predictor.extract_weights()
+    
+    np.testing.assert_allclose(predictor.score(X), before, rtol=1e-12)
+
+def test_partial_fit_improves_model(registry, dataset):
+    """Test that streaming mini-batches of outcomes lowers the log loss"""
+    X, y = dataset
+    predictor = registry.load_current()
+    before = _log_loss(predictor, X, y)
+    
+    for _ in range(5):
+        for records, outcomes in iter_minibatches(zip(X, y), 32):
+            predictor.partial_fit(records, outcomes)
+    
+    assert predictor.samples_seen == 5 * len(y)
+    assert _log_loss(predictor, X, y) < before
+
+def test_partial_fit_rejects_mismatched_outcomes(registry, dataset):
+    """Test that records and outcomes must line up"""
+    X, y = dataset
+    with pytest.raises(ValueError):
+        registry.load_current().partial_fit(X[:4], y[:3])
+
+def test_learner_checkpoints_into_registry(registry, dataset, tmp_path):
+    """Test that every checkpoint_every mini-batches a new version is promoted"""
+    X, y = dataset
+    learner = OnlineLearner(registry, batch_size=10, checkpoint_every=2, promote=True)
+    records = [dict(zip(FEATURE_NAMES, row)) for row in X[:40]]
+    
+    versions = [learner.add(record, outcome) for record, outcome in zip(records, y[:40])]
+    
+    assert [version for version in versions if version] == ["v0002", "v0003"]
+    assert registry.current_version() == "v0003"
+    metadata = registry.list_versions()[-1]["metadata"]
+    assert metadata["source"] == "online"
+    assert metadata["base_version"] == "v0002"
+    assert metadata["samples_seen"] == 40
+    
+    served = registry.load_current()
+    np.testing.assert_allclose(served.score(X), learner.predictor.score(X))
+    
+    # The checkpoint round-trips through a fresh predictor instance
+    path = tmp_path / "roundtrip.bin"
+    learner.predictor.save_artifact(path)
+    np.testing.assert_allclose(HeartDiseasePredictor(model_path=str(path)).score(X), served.score(X))
+
+def test_checkpoints_wait_for_promotion(registry, dataset):
+    """Test that without auto-promotion checkpoints are only registered and updates build on them"""
+    X, y = dataset
+    learner = OnlineLearner(registry, batch_size=10, checkpoint_every=1)
+    records = [dict(zip(FEATURE_NAMES, row)) for row in X[:30]]
+    
+    versions = [learner.add(record, outcome) for record, outcome in zip(records[:20], y[:20])]
+    
+    assert [version for version in versions if version] == ["v0002", "v0003"]
+    assert registry.current_version() == "v0001"
+    assert registry.list_versions()[-1]["metadata"]["base_version"] == "v0002"
+    
+    # Promoting the learner's own checkpoint keeps its state
+    registry.promote("v0003")
+    for record, outcome in zip(records[20:], y[20:30]):
+        learner.add(record, outcome)
+    assert learner.metrics()["samples_seen"] == 30
+    assert learner.metrics()["base_version"] == "v0004"
+
+def test_learner_follows_promoted_version(registry, dataset, tmp_path):
+    """Test that a version promoted elsewhere becomes the new base for updates"""
+    X, y = dataset
+    learner = OnlineLearner(registry, batch_size=10, checkpoint_every=0)
+    learner.consume(zip(X[:10], y[:10]))
+    
+    source = tmp_path / "retrained.bin"
+    model_artifact.save_artifact(source, np.full(13, 0.002), 0.0, FEATURE_NAMES)
+    registry.register(source, promote=True)
+    learner.consume(zip(X[10:20], y[10:20]))
+    
+    assert learner.metrics()["base_version"] == "v0004"
+    assert registry.list_versions()[-1]["metadata"]["base_version"] == "v0003"
+
+@pytest.mark.anyio
+async def test_confirm_outcome_endpoint(registry, monkeypatch, doctor_headers):
+    """Test that confirming outcomes updates and, with auto-promotion, hot swaps the served model"""
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "predictor", None)
+    monkeypatch.setattr(main, "online_learner", OnlineLearner(registry, batch_size=2, checkpoint_every=1, promote=True))
+    record = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        ids = [(await client.post("/api/predictions", json=record)).json()["id"] for _ in range(2)]
+        first = await client.put(f"/api/predictions/{ids[0]}/outcome", json={"outcome": 1}, headers=doctor_headers)
+        second = await client.put(f"/api/predictions/{ids[1]}/outcome", json={"outcome": 1}, headers=doctor_headers)
+        invalid = await client.put(f"/api/predictions/{ids[1]}/outcome", json={"outcome": 2}, headers=doctor_headers)
+        missing = await client.put("/api/predictions/999999/outcome", json={"outcome": 0}, headers=doctor_headers)
+    
+    assert first.status_code == 200
+    assert first.json()["outcome"] == 1
+    assert second.status_code == 200
+    assert invalid.status_code == 422
+    assert missing.status_code == 404
+    assert main.predictor.version == "v0002"
+    assert registry.current_version() == "v0002"
+
+@pytest.mark.anyio
+async def test_confirm_outcome_requires_login(registry, monkeypatch):
+    """Test that outcomes are only accepted from an authenticated doctor or admin"""
+    monkeypatch.setattr(main, "online_learner", OnlineLearner(registry, batch_size=10, checkpoint_every=0))
+    stored = await main.predictions_db.insert({"patient_id": "1", "probability": 0.5})
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        anonymous = await client.put(f"/api/predictions/{stored['id']}/outcome", json={"outcome": 1})
+        invalid = await client.put(
+            f"/api/predictions/{stored['id']}/outcome", json={"outcome": 1}, headers={"Authorization": "Bearer invalid"}
+        )
+    
+    assert anonymous.status_code in (401, 403)
+    assert invalid.status_code == 401
+    assert "outcome" not in await main.predictions_db.get(stored["id"])
+
+@pytest.mark.anyio
+async def test_repeated_confirmation_trains_once(registry, monkeypatch, doctor_headers):
+    """Test that confirming the same outcome again adds no training sample"""
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "predictor", None)
+    learner = OnlineLearner(registry, batch_size=10, checkpoint_every=0)
+    monkeypatch.setattr(main, "online_learner", learner)
+    record = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+    prediction_id = (await main.predictions_db.insert({**record, "probability": 0.5, "risk_level": "High Risk"}))["id"]
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        responses = [await client.put(f"/api/predictions/{prediction_id}/outcome", json={"outcome": 1}, headers=doctor_headers) for _ in range(3)]
+        assert learner.metrics()["pending"] == 1
+        changed = await client.put(f"/api/predictions/{prediction_id}/outcome", json={"outcome": 0}, headers=doctor_headers)
+    
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert changed.json()["outcome"] == 0
+    assert learner.metrics()["pending"] == 2
+
+@pytest.mark.anyio
+async def test_confirm_outcome_with_process_executor(registry, monkeypatch, doctor_headers):
+    """Test that online updates stay in this process when inference runs in a process pool"""
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "predictor", None)
+    learner = OnlineLearner(registry, batch_size=10, checkpoint_every=0)
+    monkeypatch.setattr(main, "online_learner", learner)
+    pool = BoundedExecutor("inference", kind="process", max_workers=1, max_queue=4)
+    monkeypatch.setattr(main, "inference_executor", pool)
+    record = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+    stored = await main.predictions_db.insert({**record, "probability": 0.5, "risk_level": "High Risk"})
+    
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.put(f"/api/predictions/{stored['id']}/outcome", json={"outcome": 1}, headers=doctor_headers)
+    finally:
+        await asyncio.to_thread(pool.shutdown)
+    
+    assert response.status_code == 200
+    assert learner.metrics()["pending"] == 1
+
+@pytest.mark.anyio
+async def test_untrainable_prediction_is_rejected_before_saving(registry, monkeypatch, doctor_headers):
+    """Test that a record without usable clinical parameters gets 422 and keeps no outcome"""
+    monkeypatch.setattr(main, "online_learner", OnlineLearner(registry, batch_size=10, checkpoint_every=0))
+    stored = await main.predictions_db.insert({"patient_id": "1", "age": "nan", "probability": 0.5})
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.put(f"/api/predictions/{stored['id']}/outcome", json={"outcome": 1}, headers=doctor_headers)
+    
+    assert response.status_code == 422
+    assert "outcome" not in await main.predictions_db.get(stored["id"])
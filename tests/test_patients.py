@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
+from backend import main
 from backend.main import app
+from backend.storage import open_storage
 
 @pytest.fixture
 def anyio_backend():
@@ -99,4 +101,55 @@ async def test_delete_patient_not_found(client, auth_headers):
     fake_id = "507f1f77bcf86cd799439011"  # Valid ObjectId format
     response = await client.delete(f"/api/patients/{fake_id}", headers=auth_headers)
     
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+@pytest.mark.anyio
+async def test_get_patients_pages_with_cursor(client, monkeypatch):
+    """Test keyset pages, sort order, projection and the X-Next-Cursor header"""
+    monkeypatch.setattr(main, "patients_db", open_storage("memory", data_dir="").patients)
+    for name in ["Dan", "Ava", "Cal", "Bea", "Eve"]:
+        await client.post("/api/patients", json={"name": name, "email": f"{name.lower()}@example.com"})
+    
+    names, cursor = [], None
+    while True:
+        params = {"sort": "name", "order": "desc", "limit": 2, "fields": "name"}
+        if cursor:
+            params["after"] = cursor
+        response = await client.get("/api/patients", params=params)
+        assert all(set(patient) == {"id", "name"} for patient in response.json())
+        names += [patient["name"] for patient in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    
+    assert names == ["Eve", "Dan", "Cal", "Bea", "Ava"]
+    assert [p["name"] for p in (await client.get("/api/patients")).json()] == ["Dan", "Ava", "Cal", "Bea", "Eve"]
+
+@pytest.mark.anyio
+async def test_get_patients_rejects_bad_parameters(client, monkeypatch):
+    """Test validation of sort, order, limit and cursors"""
+    monkeypatch.setattr(main, "patients_db", open_storage("memory", data_dir="").patients)
+    for name in ["Ava", "Bea"]:
+        await client.post("/api/patients", json={"name": name})
+    first = await client.get("/api/patients", params={"sort": "name", "limit": 1})
+    
+    assert (await client.get("/api/patients", params={"sort": "phone"})).status_code == 422
+    assert (await client.get("/api/patients", params={"order": "sideways"})).status_code == 422
+    assert (await client.get("/api/patients", params={"limit": 0})).status_code == 422
+    assert (await client.get("/api/patients", params={"after": "not-a-cursor"})).status_code == 422
+    # A cursor only makes sense for the order it was issued for
+    cursor = first.headers["X-Next-Cursor"]
+    assert (await client.get("/api/patients", params={"sort": "id", "after": cursor})).status_code == 422
+    assert (await client.get("/api/patients", params={"sort": "name", "after": cursor})).json()[0]["name"] == "Bea"
+
+def test_cursor_round_trips_datetimes():
+    """Test that datetime sort values (Mongo records seeded by init_db.py) survive a cursor"""
+    from datetime import datetime
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    cursor = main.encode_cursor("created_at", "desc", (created_at, "6630f1c2a1b2c3d4e5f60718"))
+    
+    assert main.decode_cursor(cursor, "created_at", "desc") == (created_at, "6630f1c2a1b2c3d4e5f60718")
+    assert main.decode_cursor(main.encode_cursor("name", "asc", ("Ava", "3")), "name", "asc") == ("Ava", "3")
+    forged = main.base64.urlsafe_b64encode(b'["created_at", "asc", {"datetime": "soon"}, "1"]').decode()
+    with pytest.raises(main.HTTPException):
+        main.decode_cursor(forged, "created_at", "asc")
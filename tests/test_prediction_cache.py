@@ -0,0 +1,79 @@
+import pytest
+from backend import main
+from backend.ml_model import FEATURE_NAMES
+from backend.prediction_cache import PredictionCache, make_key
+
+ROW = [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]
+RECORD = dict(zip(FEATURE_NAMES, ROW))
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+def test_key_is_canonical():
+    """Test that equal values hash equally and the model version is part of the key"""
+    assert make_key(ROW, "v0001") == make_key([float(v) for v in ROW], "v0001")
+    assert make_key([0.0], "v0001") == make_key([-0.0], "v0001")
+    assert make_key(ROW, "v0001") != make_key(ROW, "v0002")
+    assert make_key(ROW, "v0001") != make_key(ROW[:-1] + [3], "v0001")
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = PredictionCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.metrics()["evictions"] == 1
+
+def test_ttl_expiry_and_counters():
+    """Test that entries expire after the TTL and hits/misses are counted"""
+    clock = FakeClock()
+    cache = PredictionCache(max_size=10, ttl_seconds=60, clock=clock)
+    cache.put("a", 1)
+    
+    assert cache.get("a") == 1
+    clock.now = 61
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.metrics()["hits"] == 1
+    assert cache.metrics()["misses"] == 1
+
+@pytest.mark.anyio
+async def test_score_prediction_uses_cache(monkeypatch):
+    """Test that a repeated feature vector is served from the cache"""
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache())
+    
+    first = await main.score_prediction(RECORD)
+    batches_before = main.inference_batcher.total_batches
+    second = await main.score_prediction({**RECORD, "age": 54.0})
+    
+    assert second == first
+    assert main.inference_batcher.total_batches == batches_before
+    assert main.prediction_cache.metrics()["hits"] == 1
+    assert type(second[0]) is float and type(second[1]) is str
+
+def test_model_swap_invalidates_cache(monkeypatch, tmp_path):
+    """Test that hot swapping the model clears cached scores"""
+    from backend.model_registry import ModelRegistry
+    registry = ModelRegistry(str(tmp_path / "models"))
+    registry.load_current()
+    monkeypatch.setattr(main, "model_registry", registry)
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache())
+    monkeypatch.setattr(main, "predictor", None)
+    main.prediction_cache.put(make_key(ROW, "v0001"), (0.5, "High Risk", "v0001"))
+    
+    main.swap_predictor("v0001")
+    
+    assert len(main.prediction_cache) == 0
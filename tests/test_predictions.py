@@ -189,4 +189,156 @@ async def test_prediction_model_consistency(client, auth_headers, sample_patient
     
     # Results should be identical (same model, same input)
     assert data1["probability"] == data2["probability"]
-    assert data1["risk_level"] == data2["risk_level"]
\ No newline at end of file
+    assert data1["risk_level"] == data2["risk_level"]
+
+@pytest.mark.anyio
+async def test_create_batch_prediction(client, auth_headers):
+    """Test scoring several records in one batch request"""
+    record = {
+        "patient_id": "1",
+        "age": 54,
+        "sex": 1,
+        "cp": 0,
+        "trestbps": 140,
+        "chol": 239,
+        "fbs": 0,
+        "restecg": 1,
+        "thalach": 160,
+        "exang": 0,
+        "oldpeak": 1.2,
+        "slope": 2,
+        "ca": 0,
+        "thal": 2
+    }
+    
+    response = await client.post(
+        "/api/predictions/batch",
+        json={"records": [record, {**record, "patient_id": "2", "age": 70}]},
+        headers=auth_headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert [p["patient_id"] for p in data["predictions"]] == ["1", "2"]
+    for prediction in data["predictions"]:
+        assert 0 <= prediction["probability"] <= 1
+        assert prediction["risk_level"] in ["Low Risk", "High Risk"]
+
+@pytest.mark.anyio
+async def test_create_batch_prediction_missing_feature(client, auth_headers):
+    """Test that a batch with an incomplete record is rejected"""
+    response = await client.post(
+        "/api/predictions/batch",
+        json={"records": [{"age": 54}]},
+        headers=auth_headers
+    )
+    
+    assert response.status_code == 422
+
+@pytest.mark.anyio
+async def test_create_prediction_uses_trained_model(client, auth_headers):
+    """Test that /api/predictions returns the served model's score"""
+    from backend import main
+    from backend.ml_model import FEATURE_NAMES
+    prediction_data = {
+        "patient_id": "1",
+        "age": 63,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 145,
+        "chol": 233,
+        "fbs": 1,
+        "restecg": 0,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 2.3,
+        "slope": 0,
+        "ca": 0,
+        "thal": 1
+    }
+    
+    response = await client.post("/api/predictions", json=prediction_data, headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.json()
+    model = main.get_predictor()
+    probability, risk_level = model.predict([prediction_data[name] for name in FEATURE_NAMES])
+    assert data["probability"] == pytest.approx(probability)
+    assert data["risk_level"] == risk_level
+    assert data["model_version"] == model.version
+
+@pytest.mark.anyio
+async def test_create_prediction_missing_feature(client, auth_headers):
+    """Test that the model path rejects incomplete clinical data"""
+    response = await client.post("/api/predictions", json={"patient_id": "1", "age": 54}, headers=auth_headers)
+    
+    assert response.status_code == 422
+
+@pytest.mark.anyio
+async def test_non_finite_values_are_rejected(client, auth_headers):
+    """Test that "nan" and "inf" are rejected with 422 before anything is stored"""
+    from backend import main
+    from backend.ml_model import FEATURE_NAMES
+    record = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+    stored = await main.predictions_db.count()
+    
+    for value in ("nan", "inf", "-Infinity"):
+        response = await client.post("/api/predictions", json={**record, "chol": value}, headers=auth_headers)
+        assert response.status_code == 422
+        response = await client.post("/api/predictions/batch", json={"records": [{**record, "age": value}]}, headers=auth_headers)
+        assert response.status_code == 422
+    
+    assert await main.predictions_db.count() == stored
+
+@pytest.mark.anyio
+async def test_create_prediction_heuristic_mode(client, auth_headers, monkeypatch):
+    """Test the explicit heuristic fallback mode"""
+    from backend import main
+    monkeypatch.setattr(main, "PREDICTION_MODE", "heuristic")
+    
+    response = await client.post("/api/predictions", json={"patient_id": "1", "age": 70, "chol": 250}, headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["probability"] == pytest.approx(0.6)
+    assert data["model_version"] == "heuristic"
+
+@pytest.mark.anyio
+async def test_create_prediction_with_explanation(client, auth_headers):
+    """Test that explain=true returns contributions that add up to the model's log-odds"""
+    import math
+    from backend.ml_model import FEATURE_NAMES
+    prediction_data = dict(zip(FEATURE_NAMES, [63, 1, 3, 145, 233, 1, 0, 150, 0, 2.3, 0, 0, 1]))
+    
+    plain = await client.post("/api/predictions", json=prediction_data, headers=auth_headers)
+    response = await client.post("/api/predictions?explain=true", json=prediction_data, headers=auth_headers)
+    
+    assert "explanation" not in plain.json()
+    assert response.status_code == 200
+    data = response.json()
+    explanation = data["explanation"]
+    contributions = [item["contribution"] for item in explanation["features"]]
+    assert sorted(item["feature"] for item in explanation["features"]) == sorted(FEATURE_NAMES)
+    assert contributions == sorted(contributions, key=abs, reverse=True)
+    log_odds = math.log(data["probability"] / (1 - data["probability"]))
+    assert explanation["base_score"] + sum(contributions) == pytest.approx(log_odds)
+
+@pytest.mark.anyio
+async def test_create_batch_prediction_with_explanation(client, auth_headers):
+    """Test per-record explanations in a batch request"""
+    from backend.ml_model import FEATURE_NAMES
+    record = dict(zip(FEATURE_NAMES, [54, 1, 0, 140, 239, 0, 1, 160, 0, 1.2, 2, 0, 2]))
+    
+    response = await client.post(
+        "/api/predictions/batch",
+        json={"records": [record, {**record, "age": 70}], "explain": True},
+        headers=auth_headers
+    )
+    
+    assert response.status_code == 200
+    first, second = [p["explanation"] for p in response.json()["predictions"]]
+    first_age = next(item for item in first["features"] if item["feature"] == "age")
+    second_age = next(item for item in second["features"] if item["feature"] == "age")
+    assert second_age["value"] == 70
+    assert second_age["contribution"] != first_age["contribution"]
@@ -0,0 +1,191 @@
+import threading
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.main import app
+from backend.rate_limit import LoginLimiter, MemoryWindowStore, RateLimited, SQLiteWindowStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 6000.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        yield MemoryWindowStore(clock=clock)
+    else:
+        store = SQLiteWindowStore(str(tmp_path / "limits.db"), clock=clock)
+        yield store
+        store.close()
+
+def test_sliding_window(store):
+    """Test that the previous window's attempts fade out as the window slides"""
+    for _ in range(4):
+        assert store.acquire(b"key", 4, 60) == 0
+    wait = store.acquire(b"key", 4, 60)
+    assert 0 < wait <= 120
+    
+    # Half of the previous window still overlaps: 4 * 0.5 = 2 attempts left in it
+    store.clock.now += 90
+    assert store.acquire(b"key", 4, 60) == 0
+    assert store.acquire(b"key", 4, 60) == 0
+    assert store.acquire(b"key", 4, 60) > 0
+    
+    store.clock.now += 120
+    assert store.acquire(b"key", 4, 60) == 0
+
+def test_retry_after_is_exact(store):
+    """Test that an attempt fits right after the advertised wait and not before"""
+    for _ in range(3):
+        store.acquire(b"key", 3, 60)
+    store.clock.now += 30
+    wait = store.acquire(b"key", 3, 60)
+    
+    store.clock.now += wait - 1
+    assert store.acquire(b"key", 3, 60) > 0
+    store.clock.now += 1.01
+    assert store.acquire(b"key", 3, 60) == 0
+
+def test_release_and_reset(store):
+    """Test that released and reset attempts no longer count"""
+    assert store.acquire(b"key", 1, 60) == 0
+    assert store.acquire(b"key", 1, 60) > 0
+    store.release(b"key", 60)
+    assert store.acquire(b"key", 1, 60) == 0
+    store.reset(b"key")
+    assert store.acquire(b"key", 1, 60) == 0
+
+def test_memory_store_is_bounded():
+    """Test that expired keys are dropped and live keys are capped at max_keys"""
+    clock = FakeClock()
+    store = MemoryWindowStore(max_keys=10, clock=clock)
+    for index in range(10):
+        store.acquire(b"old%d" % index, 5, 60)
+    clock.now += 180
+    store.acquire(b"new", 5, 60)
+    assert len(store) == 1
+    
+    for index in range(50):
+        store.acquire(b"key%d" % index, 5, 60)
+    assert len(store) == 10
+    assert store.metrics()["evictions"] == 41
+
+def test_sqlite_store_is_shared(tmp_path):
+    """Test that connections to one file, used from many threads, never lose a count"""
+    path = str(tmp_path / "limits.db")
+    stores = [SQLiteWindowStore(path) for _ in range(4)]
+    allowed = []
+    
+    def hammer(store):
+        allowed.extend(1 for _ in range(50) if store.acquire(b"key", 100, 60) == 0)
+    
+    threads = [threading.Thread(target=hammer, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(allowed) == 100
+    assert all(store.acquire(b"key", 100, 60) > 0 for store in stores)
+    for store in stores:
+        store.close()
+
+@pytest.mark.anyio
+async def test_sqlite_limiter_runs_off_the_event_loop(tmp_path):
+    """Test that the async limiter calls run the SQLite transactions on the store's thread"""
+    store = SQLiteWindowStore(str(tmp_path / "limits.db"))
+    limiter = LoginLimiter(store, ip_limit=100, account_limit=1)
+    threads = set()
+    store.connection.set_trace_callback(lambda statement: threads.add(threading.current_thread().name))
+    
+    await limiter.acquire_async("10.0.0.1", "dr.smith@heartpredict.com")
+    with pytest.raises(RateLimited):
+        await limiter.acquire_async("10.0.0.1", "dr.smith@heartpredict.com")
+    await limiter.succeeded_async("10.0.0.1", "dr.smith@heartpredict.com")
+    await limiter.acquire_async("10.0.0.1", "dr.smith@heartpredict.com")
+    
+    assert threads and all(name.startswith("login-limits") for name in threads)
+    store.close()
+
+@pytest.mark.anyio
+async def test_account_lockout_rejects_before_hashing(client, monkeypatch):
+    """Test that an account over its failure limit gets 429 without a bcrypt call"""
+    monkeypatch.setattr(main, "login_limiter", LoginLimiter(MemoryWindowStore(), ip_limit=100, account_limit=2))
+    verified = []
+    verify = main.verify_password_async
+    
+    async def counting_verify(*args):
+        verified.append(1)
+        return await verify(*args)
+    
+    monkeypatch.setattr(main, "verify_password_async", counting_verify)
+    bad = {"email": "dr.smith@heartpredict.com", "password": "wrong"}
+    assert (await client.post("/api/auth/login", json=bad)).status_code == 401
+    assert (await client.post("/api/auth/login", json=bad)).status_code == 401
+    
+    response = await client.post("/api/auth/login", json={**bad, "password": "doctor123"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert len(verified) == 2
+
+@pytest.mark.anyio
+async def test_unknown_email_is_hashed_like_a_known_one(client, monkeypatch):
+    """Test that a login for a missing account still runs bcrypt, so timing does not reveal accounts"""
+    monkeypatch.setattr(main, "login_limiter", LoginLimiter(MemoryWindowStore(), ip_limit=100, account_limit=100))
+    hashes = []
+    verify = main.verify_password_async
+    
+    async def recording_verify(password, hashed_password):
+        hashes.append(hashed_password)
+        return await verify(password, hashed_password)
+    
+    monkeypatch.setattr(main, "verify_password_async", recording_verify)
+    known = await client.post("/api/auth/login", json={"email": "dr.smith@heartpredict.com", "password": "wrong"})
+    unknown = await client.post("/api/auth/login", json={"email": "nobody@heartpredict.com", "password": "wrong"})
+    
+    assert known.status_code == unknown.status_code == 401
+    assert known.json() == unknown.json()
+    assert hashes == [main.users_db["dr.smith@heartpredict.com"]["password_hash"], main.DUMMY_PASSWORD_HASH]
+    assert hashes[1][:7] == hashes[0][:7]
+
+@pytest.mark.anyio
+async def test_ip_limit_counts_failures_only(client, monkeypatch):
+    """Test that successful logins give back their attempt while failures use up the IP's"""
+    monkeypatch.setattr(main, "login_limiter", LoginLimiter(MemoryWindowStore(), ip_limit=2, account_limit=100))
+    good = {"email": "admin@heartpredict.com", "password": "admin123"}
+    for _ in range(3):
+        assert (await client.post("/api/auth/login", json=good)).status_code == 200
+    
+    for email in ("a@example.com", "b@example.com"):
+        assert (await client.post("/api/auth/login", json={"email": email, "password": "x"})).status_code == 401
+    assert (await client.post("/api/auth/login", json=good)).status_code == 429
+
+def test_account_key_accepts_any_email_value():
+    """Test that non-string emails are keyed instead of raising, and case is ignored"""
+    limiter = LoginLimiter(MemoryWindowStore(), ip_limit=10, account_limit=1)
+    limiter.acquire("10.0.0.1", 12345)
+    limiter.release("10.0.0.1", 12345)
+    limiter.acquire("10.0.0.1", "Dr.Smith@HeartPredict.com")
+    with pytest.raises(RateLimited):
+        limiter.acquire("10.0.0.1", "dr.smith@heartpredict.com")
+
+@pytest.mark.anyio
+async def test_login_rejects_non_string_credentials(client, monkeypatch):
+    """Test that a non-string email or password is a 400, not a 500"""
+    monkeypatch.setattr(main, "login_limiter", LoginLimiter(MemoryWindowStore()))
+    for credentials in ({"email": 5, "password": "x"}, {"email": ["a@example.com"], "password": "x"},
+                        {"email": "admin@heartpredict.com", "password": {"p": 1}}):
+        assert (await client.post("/api/auth/login", json=credentials)).status_code == 400
@@ -0,0 +1,117 @@
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.main import app
+from backend.repository import Repository
+from backend.storage import open_storage
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def predictions():
+    repository = Repository(indexes=("patient_id",))
+    for patient_id in ["1", "2", "1", "3", "1"]:
+        repository.insert({"patient_id": patient_id})
+    return repository
+
+def test_ids_are_monotonic_across_deletes(predictions):
+    """Test that deleted ids are never handed out again"""
+    predictions.delete("5")
+    predictions.delete("4")
+    
+    assert predictions.insert({"patient_id": "4"})["id"] == "6"
+    assert len(predictions) == 4
+
+def test_find_by_uses_secondary_index(predictions):
+    """Test lookups by patient in insertion order, kept in sync on delete and update"""
+    assert [p["id"] for p in predictions.find_by("patient_id", "1")] == ["1", "3", "5"]
+    
+    predictions.delete("3")
+    predictions.update("2", {"patient_id": "1"})
+    
+    assert [p["id"] for p in predictions.find_by("patient_id", "1")] == ["1", "5", "2"]
+    assert predictions.find_by("patient_id", "2") == []
+    assert predictions.count_by("patient_id", "1") == 3
+
+def test_insert_with_existing_id_advances_allocator(predictions):
+    """Test that restored records keep their ids and duplicates are rejected"""
+    predictions.insert({"id": 42, "patient_id": "9"})
+    
+    assert predictions.get("42")["id"] == "42"
+    assert predictions.insert({"patient_id": "9"})["id"] == "43"
+    with pytest.raises(KeyError):
+        predictions.insert({"id": "42"})
+
+@pytest.mark.anyio
+async def test_patient_ids_survive_deletes(monkeypatch):
+    """Test that creating a patient after a delete does not reuse an id"""
+    monkeypatch.setattr(main, "patients_db", open_storage("memory").patients)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = (await client.post("/api/patients", json={"name": "A"})).json()
+        second = (await client.post("/api/patients", json={"name": "B"})).json()
+        deleted = await client.delete(f"/api/patients/{first['id']}")
+        third = (await client.post("/api/patients", json={"name": "C"})).json()
+        missing = await client.get(f"/api/patients/{first['id']}")
+        listed = (await client.get("/api/patients")).json()
+    
+    assert deleted.status_code == 200
+    assert missing.status_code == 404
+    assert third["id"] not in (first["id"], second["id"])
+    assert [p["name"] for p in listed] == ["B", "C"]
+
+def test_page_walks_sorted_index():
+    """Test keyset pages by id and by a field, both directions, ties broken by id"""
+    patients = Repository(sorted_fields=("id", "name"))
+    for name in ["Cy", "Al", "Bo", "Al", "Di", "Bo", "Al", "Ed", "Fa", "Al", "Gu"]:
+        patients.insert({"name": name})
+    patients.delete("5")
+    patients.update("8", {"name": "Aa"})
+    
+    def walk(field, descending, size=3):
+        pages, after = [], None
+        while True:
+            page = patients.page(field, size, after, descending)
+            pages.extend(page)
+            if len(page) < size:
+                return pages
+            after = (page[-1].get(field), page[-1]["id"])
+    
+    by_name = sorted(patients.all(), key=lambda p: (p["name"], int(p["id"])))
+    assert [p["id"] for p in walk("id", False)] == ["1", "2", "3", "4", "6", "7", "8", "9", "10", "11"]
+    assert [p["id"] for p in walk("id", True)] == ["11", "10", "9", "8", "7", "6", "4", "3", "2", "1"]
+    assert walk("name", False) == by_name
+    assert walk("name", True) == by_name[::-1]
+    assert [p["id"] for p in patients.page("name", 2, ("Al", "4"))] == ["7", "10"]
+
+def test_mixed_sort_values_are_compared_as_text():
+    """Test that numbers and strings in one sorted field neither raise nor leave a record half-inserted"""
+    patients = Repository(indexes=("email",), sorted_fields=("id", "name"))
+    patients.insert({"name": "Bo"})
+    patients.insert({"name": 5})
+    patients.insert({"name": None})
+    patients.update("1", {"name": 7})
+    
+    assert [p["id"] for p in patients.page("name", 10)] == ["3", "2", "1"]
+    assert [p["id"] for p in patients.page("name", 10, (5, "2"))] == ["1"]
+    
+    with pytest.raises(TypeError):
+        patients.insert({"name": "Cy", "email": ["a@example.com"]})
+    with pytest.raises(TypeError):
+        patients.update("1", {"email": {"a": 1}})
+    assert len(patients) == len(patients.page("id", 10)) == len(patients.page("name", 10)) == 3
+    assert patients.get("1")["name"] == 7
+
+@pytest.mark.anyio
+async def test_patient_with_numeric_name_is_listed():
+    """Test that a non-string name is stored and paged like any other"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.post("/api/patients", json={"name": "Bo"})
+        before = await client.get("/api/patients", params={"sort": "name", "limit": 1000})
+        created = await client.post("/api/patients", json={"name": 5})
+        after = await client.get("/api/patients", params={"sort": "name", "limit": 1000})
+    
+    assert created.status_code == 200
+    assert after.status_code == 200
+    assert len(after.json()) == len(before.json()) + 1
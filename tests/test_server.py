@@ -0,0 +1,63 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import pytest
+from backend import server
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"),
+                                reason="preload-and-fork needs fork() and /proc")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_process_memory():
+    """Test that RSS, PSS and USS are read for a live process"""
+    memory = server.process_memory(os.getpid())
+    assert memory["rss"] >= memory["pss"] >= memory["uss"] > 0
+    assert server.process_memory(2 ** 22 + 1) is None
+
+def test_refuses_shared_write_ahead_log(monkeypatch):
+    """Test that several workers are refused on a durable memory store"""
+    monkeypatch.setattr("backend.storage.STORAGE_BACKEND", "memory")
+    monkeypatch.setattr("backend.wal.MEMORY_DATA_DIR", "data")
+    server.check_worker_safety(1)
+    with pytest.raises(SystemExit):
+        server.check_worker_safety(2)
+
+def test_warns_about_per_worker_state(monkeypatch):
+    """Test that shared stores still get warnings for the state each worker keeps"""
+    monkeypatch.setattr("backend.storage.STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr("backend.rate_limit.LOGIN_LIMIT_STORE", "sqlite")
+    assert server.check_worker_safety(1) == []
+    
+    warnings = server.check_worker_safety(4)
+    assert any(warning.startswith("Dashboard counters") for warning in warnings)
+    assert any(warning.startswith("Auth caches") for warning in warnings)
+    assert any(warning.startswith("Online learning") for warning in warnings)
+    assert not any(warning.startswith("Login limits") for warning in warnings)
+
+def test_forked_workers_serve_and_stop():
+    """Test that the master boots two workers that answer requests and stop on SIGTERM"""
+    port = free_port()
+    env = {**os.environ, "MEMORY_DATA_DIR": "", "MODEL_WATCH_INTERVAL": "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.server", "--host", "127.0.0.1", "--port", str(port), "--workers", "2"],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    try:
+        for line in process.stdout:
+            if b"workers ready" in line:
+                break
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as connection:
+            connection.sendall(b"GET /api/health HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+            response = connection.makefile("rb").read()
+        assert response.startswith(b"HTTP/1.1 200")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=30)
+    assert process.returncode == 0
+    assert b"Server stopped" in output
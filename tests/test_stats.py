@@ -0,0 +1,137 @@
+from datetime import date, datetime, timedelta
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.main import app
+from backend.repository import Repository
+from backend.stats import PredictionStats
+from backend.storage import open_storage
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def tracked():
+    predictions = Repository(indexes=("patient_id",))
+    stats = PredictionStats()
+    predictions.observe(stats)
+    return predictions, stats
+
+def test_counters_follow_inserts_updates_and_deletes(tracked):
+    """Test that totals, risk counts and day buckets stay in sync with the repository"""
+    predictions, stats = tracked
+    for risk_level, created_at in [("High Risk", "2025-01-01T10:00:00"), ("Low Risk", "2025-01-01T23:59:59"),
+                                   ("High Risk", datetime(2025, 1, 3, 8))]:
+        predictions.insert({"patient_id": "1", "risk_level": risk_level, "created_at": created_at})
+    
+    predictions.update("2", {"risk_level": "High Risk"})
+    predictions.delete("1")
+    
+    assert stats.total == 2
+    assert stats.risk_count("High Risk") == 2
+    assert stats.risk_count("Low Risk") == 0
+    assert stats.daily == {date(2025, 1, 1).toordinal(): 1, date(2025, 1, 3).toordinal(): 1}
+
+def test_recent_window_uses_day_buckets(tracked):
+    """Test the rolling window boundaries"""
+    predictions, stats = tracked
+    today = date(2025, 3, 10)
+    for days_ago in (0, 3, 6, 7, 30):
+        predictions.insert({"created_at": datetime.combine(today - timedelta(days=days_ago), datetime.min.time()).isoformat()})
+    
+    assert stats.recent(today=today) == 3
+    assert stats.recent(days=8, today=today) == 4
+    assert stats.recent(days=1, today=today) == 1
+
+@pytest.mark.anyio
+async def test_dashboard_stats_endpoint(tracked, monkeypatch):
+    """Test that the endpoint reports the maintained counters"""
+    predictions, stats = tracked
+    monkeypatch.setattr(main, "prediction_stats", stats)
+    monkeypatch.setattr(main, "patients_db", open_storage("memory").patients)
+    await main.patients_db.insert({"name": "A"})
+    now = datetime.utcnow()
+    for days_ago, risk_level in [(0, "High Risk"), (2, "Low Risk"), (40, "High Risk")]:
+        predictions.insert({"risk_level": risk_level, "created_at": (now - timedelta(days=days_ago)).isoformat()})
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/dashboard/stats")
+    
+    assert response.json() == {
+        "total_patients": 1,
+        "high_risk_patients": 2,
+        "recent_predictions": 2,
+        "total_predictions": 3
+    }
+
+def naive_timeline(records, start, end, granularity):
+    """Reference implementation: scan every record"""
+    from backend.stats import bucket_start, parse_timestamp
+    counts = {}
+    for record in records:
+        moment = parse_timestamp(record["created_at"]).replace(minute=0, second=0, microsecond=0)
+        if start.replace(minute=0, second=0, microsecond=0) <= moment < end.replace(minute=0, second=0, microsecond=0):
+            key = bucket_start(moment, granularity)
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+@pytest.mark.parametrize("granularity", ["hour", "day", "week", "month"])
+def test_timeline_matches_a_full_scan(tracked, granularity):
+    """Test rollup-based buckets, including partial first and last buckets"""
+    import random
+    predictions, stats = tracked
+    rng = random.Random(granularity)
+    origin = datetime(2024, 12, 20)
+    for _ in range(2000):
+        predictions.insert({"created_at": (origin + timedelta(seconds=rng.uniform(0, 90 * 86400))).isoformat()})
+    
+    start, end = datetime(2025, 1, 3, 17, 45), datetime(2025, 2, 27, 6, 10)
+    if granularity == "hour":
+        end = datetime(2025, 1, 6, 2)
+    timeline = stats.timeline(start, end, granularity)
+    expected = naive_timeline(predictions, start, end, granularity)
+    
+    assert sum(bucket["count"] for bucket in timeline) == sum(expected.values())
+    assert {bucket["date"]: bucket["count"] for bucket in timeline if bucket["count"]} == {
+        (key.isoformat() if granularity == "hour" else key.date().isoformat()): count for key, count in expected.items()
+    }
+    dates = [bucket["date"] for bucket in timeline]
+    assert dates == sorted(dates) and len(dates) == len(set(dates))
+
+def test_timeline_bucket_alignment(tracked):
+    """Test that weeks start on Monday and months on the 1st, empty buckets included"""
+    _, stats = tracked
+    weeks = stats.timeline(datetime(2025, 1, 1), datetime(2025, 1, 20), "week")
+    months = stats.timeline(datetime(2024, 11, 15), datetime(2025, 2, 1), "month")
+    
+    assert [bucket["date"] for bucket in weeks] == ["2024-12-30", "2025-01-06", "2025-01-13"]
+    assert [bucket["date"] for bucket in months] == ["2024-11-01", "2024-12-01", "2025-01-01"]
+    assert all(bucket["count"] == 0 for bucket in weeks + months)
+
+@pytest.mark.anyio
+async def test_predictions_timeline_endpoint(tracked, monkeypatch):
+    """Test query parameters, the inclusive date-only `to` and validation"""
+    predictions, stats = tracked
+    monkeypatch.setattr(main, "prediction_stats", stats)
+    for created_at in ("2025-03-01T09:30:00", "2025-03-01T23:00:00", "2025-03-03T00:00:00+02:00", "2025-03-04T12:00:00"):
+        predictions.insert({"created_at": created_at})
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        daily = await client.get("/api/analytics/predictions-timeline", params={"from": "2025-03-01", "to": "2025-03-03"})
+        hourly = await client.get("/api/analytics/predictions-timeline",
+                                  params={"from": "2025-03-01T09:00:00", "to": "2025-03-01T12:00:00", "granularity": "hour"})
+        bad_granularity = await client.get("/api/analytics/predictions-timeline", params={"granularity": "year"})
+        reversed_range = await client.get("/api/analytics/predictions-timeline", params={"from": "2025-03-05", "to": "2025-03-01"})
+        bad_date = await client.get("/api/analytics/predictions-timeline", params={"from": "yesterday"})
+    
+    # 2025-03-03T00:00+02:00 is 2025-03-02 22:00 UTC
+    assert daily.json() == [
+        {"date": "2025-03-01", "count": 2},
+        {"date": "2025-03-02", "count": 1},
+        {"date": "2025-03-03", "count": 0}
+    ]
+    assert [bucket["count"] for bucket in hourly.json()] == [1, 0, 0]
+    assert bad_granularity.status_code == 422
+    assert reversed_range.status_code == 422
+    assert bad_date.status_code == 422
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import threading
+import pytest
+from httpx import AsyncClient
+from backend import main
+from backend.main import app
+from backend.stats import PredictionStats
+from backend.storage import COLLECTIONS, open_storage
+
+ENGINES = [
+    "memory",
+    "sqlite",
+    pytest.param("mongo", marks=pytest.mark.skipif(not os.getenv("TEST_MONGODB"), reason="set TEST_MONGODB=1 with a running MongoDB"))
+]
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(params=ENGINES)
+async def storage(request, tmp_path):
+    storage = open_storage(request.param, sqlite_path=str(tmp_path / "test.db"), data_dir=str(tmp_path / "data"))
+    await storage.connect()
+    if storage.backend == "mongo":
+        for collection in storage.collections.values():
+            for record in await collection.all():
+                await collection.delete(record["id"])
+    yield storage
+    await storage.close()
+
+@pytest.mark.anyio
+async def test_collection_contract(storage):
+    """Test insert/get/update/delete/find_by/count with the same results on every engine"""
+    predictions = storage.predictions
+    first = await predictions.insert({"patient_id": "7", "probability": 0.25, "risk_level": "Low Risk"})
+    second, third = await predictions.insert_many([{"patient_id": "7"}, {"patient_id": "8", "nested": {"a": [1, 2]}}])
+    
+    assert len({first["id"], second["id"], third["id"]}) == 3
+    assert await predictions.get(first["id"]) == first
+    assert (await predictions.get(third["id"]))["nested"] == {"a": [1, 2]}
+    assert await predictions.get("not-an-id") is None
+    assert [p["id"] for p in await predictions.find_by("patient_id", "7")] == [first["id"], second["id"]]
+    
+    updated = await predictions.update(second["id"], {"patient_id": "8", "outcome": 1})
+    assert updated["outcome"] == 1
+    assert {p["id"] for p in await predictions.find_by("patient_id", "8")} == {second["id"], third["id"]}
+    assert [p["id"] for p in await predictions.find_by("patient_id", "7")] == [first["id"]]
+    assert await predictions.update("999999", {"outcome": 0}) is None
+    
+    assert (await predictions.delete(first["id"]))["id"] == first["id"]
+    assert await predictions.delete(first["id"]) is None
+    assert await predictions.count() == 2
+    assert {p["id"] for p in await predictions.all()} == {second["id"], third["id"]}
+    
+    fourth = await predictions.insert({"patient_id": "9"})
+    assert fourth["id"] != first["id"]
+
+@pytest.mark.anyio
+async def test_observers_see_every_change(storage):
+    """Test that the dashboard counters stay correct on every engine"""
+    stats = PredictionStats()
+    storage.predictions.observe(stats)
+    high = await storage.predictions.insert({"risk_level": "High Risk", "created_at": "2025-01-01T10:00:00"})
+    await storage.predictions.insert_many([{"risk_level": "Low Risk", "created_at": "2025-01-02T10:00:00"}])
+    await storage.predictions.update(high["id"], {"risk_level": "Low Risk"})
+    await storage.predictions.delete(high["id"])
+    
+    assert stats.total == 1
+    assert stats.risk_count("High Risk") == 0
+    assert stats.risk_count("Low Risk") == 1
+
+@pytest.mark.anyio
+async def test_every_collection_is_available(storage):
+    """Test that doctors, patients, predictions, files and audit logs share the interface"""
+    for name, indexes in COLLECTIONS.items():
+        collection = getattr(storage, name)
+        record = await collection.insert({field: "x" for field in indexes})
+        for field in indexes:
+            assert [r["id"] for r in await collection.find_by(field, "x")] == [record["id"]]
+
+@pytest.mark.anyio
+async def test_pages_match_a_full_sort(storage):
+    """Test keyset pagination and projection with the same results on every engine"""
+    patients = storage.patients
+    names = ["Cy", "Al", "Bo", "Al", None, "Bo", "Al", "Ed", "Fa", "Al", "Gu", "Di"]
+    created = await patients.insert_many([
+        {"name": name, "email": f"p{i}@example.com", "created_at": f"2025-01-{i % 4 + 1:02d}T00:00:00"} if name else {"email": "anon@example.com", "created_at": "2025-01-09T00:00:00"}
+        for i, name in enumerate(names)
+    ])
+    await patients.delete(created[3]["id"])
+    await patients.update(created[6]["id"], {"name": "Aa"})
+    records = await patients.all()
+    position = {record["id"]: index for index, record in enumerate(created)}
+    
+    for sort in ("id", "name", "created_at"):
+        for descending in (False, True):
+            expected = sorted(records, key=lambda r: ((r.get(sort) or "") if sort != "id" else "", position[r["id"]]), reverse=descending)
+            seen, after = [], None
+            while True:
+                page, after = await patients.page(5, after, sort, descending, fields=["name"])
+                seen.extend(page)
+                if after is None:
+                    break
+            assert [r["id"] for r in seen] == [r["id"] for r in expected], (sort, descending)
+            assert all(set(r) <= {"id", "name"} for r in seen)
+    
+    first, after = await patients.page(100)
+    assert after is None and len(first) == len(records)
+    with pytest.raises(ValueError):
+        await patients.page(5, sort="email")
+
+@pytest.mark.anyio
+async def test_sqlite_is_durable_and_uses_wal(tmp_path):
+    """Test that records and the id sequence survive reopening the file"""
+    path = str(tmp_path / "durable.db")
+    storage = open_storage("sqlite", sqlite_path=path)
+    kept = await storage.patients.insert({"name": "Kept", "email": "kept@example.com"})
+    dropped = await storage.patients.insert({"name": "Dropped"})
+    await storage.patients.delete(dropped["id"])
+    journal_mode = storage.patients.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    await storage.close()
+    
+    reopened = open_storage("sqlite", sqlite_path=path)
+    assert journal_mode == "wal"
+    assert await reopened.patients.all() == [kept]
+    assert (await reopened.patients.find_by("email", "kept@example.com"))[0]["name"] == "Kept"
+    assert int((await reopened.patients.insert({"name": "New"}))["id"]) > int(dropped["id"])
+    await reopened.close()
+
+@pytest.mark.anyio
+async def test_sqlite_statements_run_off_the_event_loop(tmp_path):
+    """Test that every SQLite statement runs on the engine's own thread"""
+    storage = open_storage("sqlite", sqlite_path=str(tmp_path / "threads.db"))
+    threads = set()
+    storage.patients.connection.set_trace_callback(lambda statement: threads.add(threading.current_thread().name))
+    
+    record = await storage.patients.insert({"name": "Ada", "email": "ada@example.com"})
+    await storage.patients.update(record["id"], {"name": "Ada L."})
+    await storage.patients.find_by("email", "ada@example.com")
+    await storage.patients.page(10, sort="name")
+    await storage.patients.delete(record["id"])
+    
+    assert threads and all(name.startswith("sqlite") for name in threads)
+    assert await storage.patients.count() == 0
+    await storage.close()
+
+@pytest.mark.anyio
+async def test_sqlite_concurrent_updates_keep_every_change(tmp_path):
+    """Test that concurrent read-modify-write updates of one record are not lost"""
+    storage = open_storage("sqlite", sqlite_path=str(tmp_path / "updates.db"))
+    stats = PredictionStats()
+    storage.predictions.observe(stats)
+    record = await storage.predictions.insert({"risk_level": "Low Risk"})
+    
+    await asyncio.gather(*(storage.predictions.update(record["id"], {f"field{i}": i}) for i in range(20)))
+    
+    stored = await storage.predictions.get(record["id"])
+    assert all(stored[f"field{i}"] == i for i in range(20))
+    assert stats.total == 1
+    await storage.close()
+
+@pytest.mark.anyio
+async def test_sqlite_adds_sort_columns_to_existing_tables(tmp_path):
+    """Test that a database created before pagination gains the sortable columns"""
+    import sqlite3
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE patients (id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT, data TEXT NOT NULL)")
+    connection.executemany("INSERT INTO patients (email, data) VALUES (?, ?)",
+                           [(None, '{"name": "Zoe"}'), (None, '{"name": "Ann"}'), (None, '{}')])
+    connection.commit()
+    connection.close()
+    
+    storage = open_storage("sqlite", sqlite_path=path)
+    page, _ = await storage.patients.page(10, sort="name")
+    assert [p.get("name") for p in page] == [None, "Ann", "Zoe"]
+    await storage.close()
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        open_storage("cassandra")
+
+@pytest.mark.anyio
+async def test_api_on_sqlite(tmp_path, monkeypatch, doctor_headers):
+    """Test the patient and prediction endpoints end to end on the SQLite engine"""
+    storage = open_storage("sqlite", sqlite_path=str(tmp_path / "api.db"))
+    stats = PredictionStats()
+    storage.predictions.observe(stats)
+    monkeypatch.setattr(main, "patients_db", storage.patients)
+    monkeypatch.setattr(main, "predictions_db", storage.predictions)
+    monkeypatch.setattr(main, "prediction_stats", stats)
+    features = {"age": 63, "sex": 1, "cp": 3, "trestbps": 145, "chol": 233, "fbs": 1, "restecg": 0,
+                "thalach": 150, "exang": 0, "oldpeak": 2.3, "slope": 0, "ca": 0, "thal": 1}
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        patient = (await client.post("/api/patients", json={"name": "Ada", "email": "ada@example.com"})).json()
+        prediction = (await client.post("/api/predictions", json={"patient_id": patient["id"], **features})).json()
+        confirmed = await client.put(f"/api/predictions/{prediction['id']}/outcome", json={"outcome": 1}, headers=doctor_headers)
+        history = (await client.get(f"/api/predictions/{patient['id']}")).json()
+        dashboard = (await client.get("/api/dashboard/stats")).json()
+    
+    assert confirmed.status_code == 200
+    assert [p["id"] for p in history] == [prediction["id"]]
+    assert history[0]["outcome"] == 1
+    assert dashboard["total_patients"] == 1
+    assert dashboard["total_predictions"] == 1
+    await storage.close()
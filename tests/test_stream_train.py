@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.dataset import DATA_PATH, iter_chunks
+from backend.ml_model import FEATURE_NAMES, HeartDiseasePredictor
+from backend.stream_train import scaler_stats, train_streaming
+
+@pytest.fixture(scope="module")
+def dataset():
+    data = pd.read_csv(DATA_PATH)
+    return data[FEATURE_NAMES].to_numpy(dtype=np.float64), data["target"].to_numpy()
+
+def test_chunks_cover_file_with_bom_header(dataset):
+    """Test that chunks reassemble the file and the BOM does not leak into the age column"""
+    X, y = dataset
+    chunks = list(iter_chunks(DATA_PATH, chunksize=50))
+    
+    assert [len(chunk_y) for _, chunk_y in chunks] == [50] * 6 + [3]
+    np.testing.assert_array_equal(np.vstack([chunk_X for chunk_X, _ in chunks]), X)
+    np.testing.assert_array_equal(np.concatenate([chunk_y for _, chunk_y in chunks]), y)
+
+def test_scaler_stats_match_full_pass(dataset):
+    """Test that the one-pass chunked statistics equal StandardScaler's"""
+    X, y = dataset
+    stats = scaler_stats(DATA_PATH, chunksize=64)
+    
+    assert stats["rows"] == len(y)
+    assert stats["positives"] == int(y.sum())
+    np.testing.assert_allclose(stats["mean"], X.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(stats["scale"], X.std(axis=0), rtol=1e-12)
+
+def test_train_streaming_writes_servable_artifact(dataset, tmp_path):
+    """Test that the out-of-core model loads into the predictor and separates the classes"""
+    X, y = dataset
+    path = tmp_path / "stream.bin"
+    metadata = train_streaming(DATA_PATH, str(path), chunksize=32, epochs=5)
+    
+    predictor = HeartDiseasePredictor(model_path=str(path))
+    accuracy = np.mean((predictor.score(X) >= 0.5) == y)
+    
+    assert predictor.metadata["source"] == "backend.stream_train"
+    assert metadata["training_rows"] == len(y)
+    assert accuracy > 0.75
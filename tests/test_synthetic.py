@@ -0,0 +1,133 @@
+import itertools
+import json
+from datetime import datetime
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from backend import synthetic
+from backend.dataset import COLUMNS, DATA_PATH
+from backend.ml_model import FEATURE_NAMES, HeartDiseasePredictor
+from backend.repository import Repository
+
+END = datetime(2025, 1, 1)
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="module")
+def cohort():
+    return synthetic.CohortModel.fit()
+
+def test_sample_is_reproducible(cohort):
+    """Test that the same seed gives the same rows regardless of chunk size"""
+    first = list(synthetic.iter_samples(cohort, 1000, seed=7, chunksize=1000))[0][1]
+    again = list(synthetic.iter_samples(cohort, 1000, seed=7, chunksize=1000))[0][1]
+    other = list(synthetic.iter_samples(cohort, 1000, seed=8, chunksize=1000))[0][1]
+    
+    for name in COLUMNS:
+        np.testing.assert_array_equal(first[name], again[name])
+    assert any(not np.array_equal(first[name], other[name]) for name in COLUMNS)
+
+def test_sample_matches_marginals_and_correlations(cohort):
+    """Test that synthetic rows keep the real categories, ranges, means and rank correlations"""
+    real = pd.read_csv(DATA_PATH)
+    sample = pd.DataFrame(list(synthetic.iter_samples(cohort, 50_000, seed=1, chunksize=50_000))[0][1])
+    
+    for name in COLUMNS:
+        assert sample[name].min() >= real[name].min()
+        assert sample[name].max() <= real[name].max()
+        if name not in synthetic.CONTINUOUS:
+            assert set(sample[name].unique()) <= set(real[name].unique())
+        assert sample[name].mean() == pytest.approx(real[name].mean(), rel=0.05, abs=0.02)
+    
+    real_corr = real.corr(method="spearman")["target"]
+    sample_corr = sample.corr(method="spearman")["target"]
+    assert np.abs(real_corr - sample_corr).max() < 0.1
+
+def test_write_csv_trains_like_real_data(cohort, tmp_path):
+    """Test that a model trained on synthetic rows still predicts the real labels"""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    path = synthetic.write_csv(tmp_path / "synthetic.csv", 20_000, seed=3, model=cohort, chunksize=7_000)
+    data = pd.read_csv(path)
+    real = pd.read_csv(DATA_PATH)
+    
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(data[FEATURE_NAMES], data["target"])
+    
+    assert len(data) == 20_000
+    assert list(data.columns) == COLUMNS
+    assert model.score(real[FEATURE_NAMES], real["target"]) > 0.75
+
+def test_ndjson_patients_and_predictions(cohort, tmp_path):
+    """Test the NDJSON record shapes and monotonic timestamps"""
+    patients_path = tmp_path / "patients.ndjson"
+    predictions_path = tmp_path / "predictions.ndjson"
+    
+    synthetic.write_ndjson(patients_path, synthetic.iter_patients(cohort, 250, end=END, chunksize=100))
+    synthetic.write_ndjson(predictions_path, synthetic.iter_predictions(cohort, 500, patients=250, end=END, chunksize=100))
+    patients = [json.loads(line) for line in patients_path.read_text().splitlines()]
+    predictions = [json.loads(line) for line in predictions_path.read_text().splitlines()]
+    
+    assert [p["id"] for p in patients] == [str(i) for i in range(1, 251)]
+    assert len({p["email"] for p in patients}) == 250
+    assert all(p["gender"] in ("male", "female") for p in patients)
+    assert len(predictions) == 500
+    assert all(1 <= int(p["patient_id"]) <= 250 for p in predictions)
+    created = [p["created_at"] for p in predictions]
+    assert created == sorted(created)
+    assert created[-1] < END.isoformat()
+
+def test_seed_memory_continues_ids(cohort):
+    """Test seeding the in-memory stores with scored predictions"""
+    predictor = HeartDiseasePredictor()
+    patients_db = Repository()
+    patients_db.insert({"name": "Existing Patient"})
+    predictions_db = Repository(indexes=("patient_id",))
+    
+    added = synthetic.seed_memory(patients_db, predictions_db, 20, 3, predictor=predictor, model=cohort, end=END)
+    
+    assert added == (20, 60)
+    assert [p["id"] for p in patients_db][:2] == ["1", "2"]
+    assert [p["id"] for p in predictions_db] == [str(i) for i in range(1, 61)]
+    assert sum(predictions_db.count_by("patient_id", str(i)) for i in range(2, 22)) == 60
+    record = predictions_db.get("1")
+    assert "target" not in record
+    probability, risk_level = predictor.predict([record[name] for name in FEATURE_NAMES])
+    assert record["probability"] == pytest.approx(probability)
+    assert record["risk_level"] == risk_level
+
+class RecordingCollection:
+    """Collects insert_many batches the way a Motor collection receives them"""
+    def __init__(self):
+        self.batches = []
+        self.ids = itertools.count()
+    
+    async def insert_many(self, documents, ordered=True):
+        self.batches.append(list(documents))
+        # Motor assigns an _id (an ObjectId) to every document before sending the batch
+        for document in documents:
+            document["_id"] = f"oid{next(self.ids)}"
+        return SimpleNamespace(inserted_ids=[document["_id"] for document in documents])
+
+class RecordingDatabase:
+    def __init__(self):
+        self.patients = RecordingCollection()
+        self.predictions = RecordingCollection()
+
+@pytest.mark.anyio
+async def test_seed_mongo_inserts_in_batches(cohort):
+    """Test that MongoDB seeding uses bounded insert_many batches with datetime fields"""
+    database = RecordingDatabase()
+    
+    added = await synthetic.seed_mongo(database, 120, 2, model=cohort, end=END, batch_size=50)
+    
+    assert added == (120, 240)
+    assert [len(batch) for batch in database.patients.batches] == [50, 50, 20]
+    assert [len(batch) for batch in database.predictions.batches] == [50, 50, 50, 50, 40]
+    assert isinstance(database.patients.batches[0][0]["date_of_birth"], datetime)
+    assert isinstance(database.predictions.batches[0][0]["created_at"], datetime)
+    patient_ids = {str(patient["_id"]) for batch in database.patients.batches for patient in batch}
+    assert all(prediction["patient_id"] in patient_ids for batch in database.predictions.batches for prediction in batch)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from backend import train
+from backend.ml_model import HeartDiseasePredictor
+
+SMALL_SPACE = {
+    "C": [0.1, 1.0],
+    "penalty": ["l1", "l2"],
+    "solver": ["lbfgs", "liblinear"],
+    "class_weight": [None],
+}
+
+def test_candidate_params_skips_unsupported_combinations():
+    """Test that lbfgs is never paired with the l1 penalty"""
+    grid = train.candidate_params(space=SMALL_SPACE)
+    
+    assert len(grid) == 6
+    assert all(not (p["solver"] == "lbfgs" and p["penalty"] == "l1") for p in grid)
+    assert train.candidate_params("random", n_iter=3, space=SMALL_SPACE) == \
+        train.candidate_params("random", n_iter=3, space=SMALL_SPACE)
+
+def test_search_writes_best_artifact(tmp_path):
+    """Test a small parallel search end to end"""
+    output = tmp_path / "best.bin"
+    leaderboard = train.main([
+        "--folds", "3", "--jobs", "2", "--output", str(output), "--no-register",
+        "--search", "random", "--n-iter", "3",
+    ])
+    
+    scores = [result["mean_score"] for result in leaderboard]
+    assert scores == sorted(scores, reverse=True)
+    
+    predictor = HeartDiseasePredictor(model_path=str(output))
+    assert predictor.metadata["cv_mean_score"] == leaderboard[0]["mean_score"]
+    assert predictor.metadata["params"] == leaderboard[0]["params"]
+    probability, risk_level = predictor.predict([63, 1, 3, 145, 233, 1, 0, 150, 0, 2.3, 0, 0, 1])
+    assert 0 <= probability <= 1
+
+def test_saved_scaler_matches_pipeline(tmp_path):
+    """Test that the folded scaler reproduces the sklearn pipeline's probabilities"""
+    X, y = train.load_training_data()
+    best = {"params": {"C": 1.0, "penalty": "l2", "solver": "lbfgs", "class_weight": None},
+            "mean_score": 0.0, "std_score": 0.0}
+    train.save_best(X, y, best, tmp_path / "model.bin")
+    
+    pipeline = train.build_model(best["params"]).fit(X, y)
+    predictor = HeartDiseasePredictor(model_path=str(tmp_path / "model.bin"))
+    np.testing.assert_allclose(predictor.score(X), pipeline.predict_proba(X)[:, 1], rtol=1e-12)
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import pytest
+from backend.stats import PredictionStats
+from backend.storage import open_storage
+from backend.wal import SNAPSHOT_NAME, read_frames
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+async def reopen(data_dir, snapshot_every=100000):
+    """A fresh memory engine recovered from data_dir, as after a restart"""
+    storage = open_storage("memory", data_dir=str(data_dir))
+    storage.log.snapshot_every = snapshot_every
+    stats = PredictionStats()
+    storage.predictions.observe(stats)
+    await storage.connect()
+    return storage, stats
+
+def crash(storage):
+    """Abandon an engine without flushing or snapshotting, releasing its lock as a dying process would"""
+    os.close(storage.log._lock_fd)
+
+def log_files(data_dir):
+    return sorted(name for name in os.listdir(data_dir) if name.endswith(".log"))
+
+@pytest.mark.anyio
+async def test_changes_survive_a_crash(tmp_path):
+    """Test replay of the log alone, without a clean shutdown"""
+    storage, _ = await reopen(tmp_path)
+    patient = await storage.patients.insert({"name": "Ada", "email": "ada@example.com"})
+    high, low = await storage.predictions.insert_many([
+        {"patient_id": patient["id"], "risk_level": "High Risk", "created_at": "2025-01-01T10:00:00"},
+        {"patient_id": patient["id"], "risk_level": "Low Risk", "created_at": "2025-01-02T10:00:00"}
+    ])
+    await storage.predictions.update(low["id"], {"outcome": 1})
+    await storage.predictions.delete(high["id"])
+    # No close(): the process dies here
+    crash(storage)
+    
+    restored, stats = await reopen(tmp_path)
+    assert await restored.patients.all() == [patient]
+    assert await restored.predictions.find_by("patient_id", patient["id"]) == [{**low, "outcome": 1}]
+    assert stats.total == 1 and stats.risk_count("Low Risk") == 1
+    assert (await restored.predictions.insert({}))["id"] == "3"
+    await restored.close()
+
+@pytest.mark.anyio
+async def test_clean_shutdown_leaves_a_snapshot(tmp_path):
+    """Test that close() snapshots, drops covered logs and keeps deleted ids retired"""
+    storage, _ = await reopen(tmp_path)
+    records = await storage.patients.insert_many([{"name": f"P{i}"} for i in range(10)])
+    await storage.patients.delete(records[-1]["id"])
+    await storage.close()
+    
+    assert SNAPSHOT_NAME in os.listdir(tmp_path)
+    assert len(log_files(tmp_path)) == 1
+    restored, _ = await reopen(tmp_path)
+    assert [p["name"] for p in await restored.patients.all()] == [f"P{i}" for i in range(9)]
+    assert (await restored.patients.insert({"name": "New"}))["id"] == "11"
+    await restored.close()
+
+@pytest.mark.anyio
+async def test_torn_tail_is_ignored(tmp_path):
+    """Test that a partially written last frame does not stop recovery"""
+    storage, _ = await reopen(tmp_path)
+    for i in range(3):
+        await storage.patients.insert({"name": f"P{i}"})
+    log_path = os.path.join(tmp_path, log_files(tmp_path)[-1])
+    with open(log_path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x00\x00\x00\x00\x80\x05half")
+    crash(storage)
+    
+    restored, _ = await reopen(tmp_path)
+    assert len(await restored.patients.all()) == 3
+    await restored.patients.insert({"name": "After"})
+    await restored.close()
+    
+    again, _ = await reopen(tmp_path)
+    assert [p["name"] for p in await again.patients.all()] == ["P0", "P1", "P2", "After"]
+    await again.close()
+
+@pytest.mark.anyio
+async def test_concurrent_writers_share_fsyncs(tmp_path):
+    """Test group commit: many acknowledged writes, far fewer fsyncs"""
+    storage, _ = await reopen(tmp_path)
+    await asyncio.gather(*(storage.predictions.insert({"n": i}) for i in range(200)))
+    
+    assert storage.log.durable == 200
+    assert storage.log.fsyncs < 50
+    await storage.close()
+
+@pytest.mark.anyio
+async def test_snapshots_taken_while_writing(tmp_path):
+    """Test background snapshots with writes, updates and deletes racing them"""
+    storage, _ = await reopen(tmp_path, snapshot_every=40)
+    
+    async def writer(worker):
+        for i in range(50):
+            record = await storage.predictions.insert({"worker": worker, "i": i})
+            if i % 5 == 0:
+                await storage.predictions.update(record["id"], {"updated": True})
+            if i % 7 == 0:
+                await storage.predictions.delete(record["id"])
+    
+    await asyncio.gather(*(writer(worker) for worker in range(8)))
+    expected = await storage.predictions.all()
+    while storage.log._snapshot_task is not None:
+        await asyncio.sleep(0.01)
+    
+    header = next(read_frames(os.path.join(tmp_path, SNAPSHOT_NAME)))
+    assert b'"generation"' in header
+    assert len(log_files(tmp_path)) <= 2
+    crash(storage)
+    
+    restored, stats = await reopen(tmp_path)
+    assert sorted(await restored.predictions.all(), key=lambda r: int(r["id"])) == sorted(expected, key=lambda r: int(r["id"]))
+    assert stats.total == len(expected)
+    await restored.close()
+
+@pytest.mark.anyio
+async def test_seeded_cohort_survives_a_crash(tmp_path, monkeypatch):
+    """Test that the synthetic cohort seeded at startup is durable before any clean shutdown"""
+    from backend import main
+    storage = open_storage("memory", data_dir=str(tmp_path))
+    monkeypatch.setattr(main, "storage", storage)
+    monkeypatch.setattr(main, "patients_db", storage.patients)
+    monkeypatch.setattr(main, "predictions_db", storage.predictions)
+    monkeypatch.setattr(main, "SYNTHETIC_PATIENTS", 5)
+    monkeypatch.setattr(main, "SYNTHETIC_PREDICTIONS_PER_PATIENT", 2)
+    monkeypatch.setattr(main, "MODEL_WATCH_INTERVAL", 0)
+    
+    await main.startup_event()
+    # No close(): the process dies here
+    crash(storage)
+    
+    restored, stats = await reopen(tmp_path)
+    assert await restored.patients.count() == 5
+    assert stats.total == 10
+    assert len(await restored.doctors.all()) == len(main.users_db)
+    await restored.close()
+
+@pytest.mark.anyio
+async def test_directory_is_locked_while_open(tmp_path):
+    """Test that a second engine cannot open a data directory that is in use"""
+    storage, _ = await reopen(tmp_path)
+    
+    with pytest.raises(RuntimeError):
+        await reopen(tmp_path)
+    await storage.close()
+    
+    restored, _ = await reopen(tmp_path)
+    await restored.close()